@@ -41,12 +41,37 @@ deep_researcher_tool_config  = dict(
 auto_browser_use_tool_config  = dict(
     type="auto_browser_use_tool",
     model_id=BROWSER_MODEL_ID,
+    # None launches a browser per task. With a pool, warm headless browsers are shared by all tasks and each task
+    # gets a fresh context, e.g. dict(size=2, max_contexts_per_browser=4, max_tasks_per_browser=50,
+    # memory_limit_mb=None), where memory_limit_mb is the total browser memory that triggers recycling, needs psutil
+    browser_pool_config = None,
+    # None loads pages in full. A profile intercepts the requests of every page, e.g.
+    # dict(blocked_resource_types=["media", "font"], blocked_domains=None, max_page_bytes=20 * 1024 * 1024,
+    # cache_subresources=True) blocks media and fonts (add "image" when the agent does not need screenshots) and
+    # common ad and tracker domains, aborts the subresources of a page past 20 MB and serves repeated scripts,
+    # stylesheets, fonts and images from memory
+    browsing_profile_config = None,
+    # Record browser actions per task and replay read-only ones on reruns, e.g.
+    # dict(store_dir="workdir/browser_actions", replay=True). None disables recording
+    action_replay_config = None,
 )
 
 deep_analyzer_tool_config  = dict(
     type="deep_analyzer_tool",
     analyzer_model_ids = [ANALYZER_MODEL_ID],
     summarizer_model_id = SUMMARIZER_MODEL_ID,
+    concurrent = True, # run the analyzer models in parallel
+    analyzer_timeout = 600, # seconds before an analyzer model is given up, None to wait
+    quorum = None, # summarize once this many analyses succeeded and cancel the rest, None waits for all
+    max_content_tokens = None, # e.g. 100000 map-reduces longer files into notes on the task, lossy. None sends them whole
+    map_reduce_model_id = None, # the model writing the notes, None uses the summarizer model
+)
+
+python_interpreter_tool_config = dict(
+    type="python_interpreter_tool",
+    # None evaluates code inline. With a pool, code runs in pre-warmed sandbox processes, e.g.
+    # dict(size=4, warm_imports=["numpy", "pandas"], timeout=120, cpu_time_limit=60, memory_limit_mb=4096)
+    worker_pool_config = None,
 )
 
 mcp_tools_config = {
@@ -64,6 +89,17 @@ mcp_tools_config = {
         # }
     }
 }
+mcp_session_pool_size = 1 # persistent sessions kept to the MCP servers, each session serves concurrent calls
+
+mcp_tools_cache_config = dict(
+    cache_dir = "workdir/mcp_cache", # snapshots of the listed MCP tools, keyed by mcp_tools_config
+    ttl = 24 * 3600, # seconds before the tools are listed again, None to only refresh on server notification
+)
+
+markdown_cache_config = dict(
+    cache_dir = "workdir/markdown_cache", # converted attachments, keyed by file content and converter options
+    max_bytes = 2 * 1024 * 1024 * 1024, # least recently used conversions are evicted past this size
+)
 
 image_generator_tool_config = dict(
     type="image_generator_tool",
@@ -78,8 +114,24 @@ video_generator_tool_config = dict(
     fetch_model_id = "veo3-fetch",
 )
 
+retrieve_passages_tool_config = dict(
+    type="retrieve_passages_tool",
+    top_k = 5, # passages returned when the query does not say
+    max_top_k = 20,
+)
+
+# Index of the documents read in every task, searched by the retrieve_passages_tool. None disables indexing
+retrieval_config = dict(
+    index_dir = None, # one index per task under this directory, None uses <exp_path>/retrieval
+    chunk_chars = 1500, # size of the passages
+    embedding_weight = 0.0, # weight of hashed word and trigram embeddings mixed into the BM25 score, 0 disables
+    max_documents = 200, # the oldest documents of an index are dropped past this many, None keeps them all
+)
+
 file_reader_tool_config = dict(
-    type="file_reader_tool"
+    type="file_reader_tool",
+    text_limit = None, # e.g. 50000 caps the tokens of the returned content. None returns the whole content
+    summarizer_model_id = None, # map-reduce content over text_limit into notes with this model, None truncates it
 )
 
 oai_deep_research_tool_config = dict(
@@ -8,6 +8,7 @@ _base_ = './base.py'
 # General Config
 tag = "gaia"
 concurrency = 1
+agent_pool_size = 0 # agents pre-built in the background, 0 to build one per task on demand
 workdir = "workdir"
 log_path = "log.txt"
 save_path = "dra.jsonl"
@@ -41,7 +42,7 @@ deep_analyzer_agent_config = dict(
     max_steps = 3,
     template_path = "src/agent/deep_analyzer_agent/prompts/deep_analyzer_agent.yaml",
     provide_run_summary = True,
-    tools = ["deep_analyzer_tool", "python_interpreter_tool"],
+    tools = ["deep_analyzer_tool", "retrieve_passages_tool", "python_interpreter_tool"],
 )
 
 browser_use_agent_config = dict(
@@ -34,7 +34,7 @@ deep_analyzer_agent_config = dict(
     max_steps = 3,
     template_path = "src/agent/deep_analyzer_agent/prompts/deep_analyzer_agent.yaml",
     provide_run_summary = True,
-    tools = ["deep_analyzer_tool", "python_interpreter_tool"],
+    tools = ["deep_analyzer_tool", "retrieve_passages_tool", "python_interpreter_tool"],
 )
 
 browser_use_agent_config = dict(
@@ -8,6 +8,7 @@ _base_ = './base.py'
 # General Config
 tag = "oai_deep_research-o3"
 concurrency = 4
+agent_pool_size = 0 # agents pre-built in the background, 0 to build one per task on demand
 workdir = "workdir"
 log_path = "log.txt"
 save_path = "dra.jsonl"
@@ -4,12 +4,9 @@ warnings.simplefilter("ignore", DeprecationWarning)
 import os
 import sys
 from pathlib import Path
-import pandas as pd
 from typing import List
-import json
 from datetime import datetime
 import asyncio
-import threading
 import argparse
 from mmengine import DictAction
 
@@ -19,42 +16,37 @@ sys.path.append(root)
 from src.logger import logger
 from src.config import config
 from src.models import model_manager
-from src.agent import create_agent, prepare_response
-from src.dataset import HLEDataset
-from src.utils import assemble_project_path
+from src.agent import AgentFactory, prepare_response, get_used_model_ids
+from src.tools.executor.worker_pool import python_session_id
+from src.tools.retrieval import retrieval_session_id
+from src.registry import DATASET
+from src.utils import (ResultsStore,
+                       shard_tasks,
+                       get_shard_path,
+                       merge_shards,
+                       run_shards,
+                       format_throughput)
 
-append_answer_lock = threading.Lock()
+def append_answer(entry: dict, store: ResultsStore) -> None:
+    store.append(entry)
+    print("Answer exported to file:", Path(store.path).resolve())
 
-def append_answer(entry: dict, jsonl_file: str) -> None:
-    jsonl_file = Path(jsonl_file)
-    jsonl_file.parent.mkdir(parents=True, exist_ok=True)
-    with append_answer_lock, open(jsonl_file, "a", encoding="utf-8") as fp:
-        fp.write(json.dumps(entry) + "\n")
-    assert os.path.exists(jsonl_file), "File not found!"
-    print("Answer exported to file:", jsonl_file.resolve())
+def get_tasks_to_run(store: ResultsStore, dataset) -> List[dict]:
 
-def get_tasks_to_run(answers_file, dataset) -> List[dict]:
+    done_questions = store.task_ids()
+    logger.info(f"Found {len(done_questions)} previous results in {store.path}!")
 
-    data = dataset.data
+    # Rows are prepared as they are read when the dataset is not cached yet
+    return [line for line in dataset.iter_records() if line["task_id"] not in done_questions]
 
-    logger.info(f"Loading answers from {answers_file}...")
-    try:
-        if os.path.exists(answers_file):
-            
-            done_questions = pd.read_json(answers_file, lines=True)["task_id"].tolist()
-            logger.info(f"Found {len(done_questions)} previous results!")
-            
-        else:
-            done_questions = []
-    except Exception as e:
-        logger.warning("Error when loading records: ", e)
-        logger.warning("No usable records! ▶️ Starting new.")
-        done_questions = []
-    return [line for line in data.to_dict(orient="records") if line["task_id"] not in done_questions]
+async def answer_single_question(config, example, store, agent_factory):
 
-async def answer_single_question(config, example):
+    # Python interpreter calls of this task share their variables
+    python_session_id.set(example["task_id"])
+    # Documents read in this task are indexed for retrieval in its own index
+    retrieval_session_id.set(example["task_id"])
 
-    agent = await create_agent(config)
+    agent = await agent_factory.acquire()
     logger.visualize_agent_tree()
 
     logger.info(f"Task Id: {example['task_id']}, Final Answer: {example['true_answer']}")
@@ -82,6 +74,7 @@ async def answer_single_question(config, example):
         for memory_step in agent.memory.steps:
             memory_step.model_input_messages = None
         intermediate_steps = [str(step) for step in agent.memory.steps]
+        token_usage = agent.monitor.get_total_token_counts().dict()
 
         # Check for parsing errors which indicate the LLM failed to follow the required format
         parsing_error = True if any(["AgentParsingError" in step for step in intermediate_steps]) else False
@@ -94,6 +87,7 @@ async def answer_single_question(config, example):
         logger.info("Error on ", augmented_question, e)
         output = None
         intermediate_steps = []
+        token_usage = None
         parsing_error = False
         iteration_limit_exceeded = False
         exception = e
@@ -105,6 +99,7 @@ async def answer_single_question(config, example):
         "augmented_question": augmented_question,
         "prediction": output,
         "intermediate_steps": intermediate_steps,
+        "token_usage": token_usage,
         "parsing_error": parsing_error,
         "iteration_limit_exceeded": iteration_limit_exceeded,
         "agent_error": str(exception) if raised_exception else None,
@@ -114,7 +109,7 @@ async def answer_single_question(config, example):
         "task_id": example["task_id"],
         "true_answer": example["true_answer"],
     }
-    append_answer(annotated_example, config.save_path)
+    append_answer(annotated_example, store)
 
 
 def parse_args():
@@ -131,14 +126,22 @@ def parse_args():
              'It also allows nested list/tuple values, e.g. key="[(a,b),(c,d)]" '
              'Note that the quotation marks are necessary and that no white space '
              'is allowed.')
+    parser.add_argument("--num_shards", type=int, default=None,
+                        help="split the tasks by task_id hash into this many shards, one worker process per shard")
+    parser.add_argument("--shard_index", type=int, default=None,
+                        help="run only this shard, e.g. one shard per machine sharing the workdir")
+    parser.add_argument("--merge_shards", action="store_true", default=None,
+                        help="merge the shard result files into the save path and exit")
     args = parser.parse_args()
+    if args.shard_index is not None:
+        if args.num_shards is None:
+            parser.error("--shard_index requires --num_shards")
+        if not 0 <= args.shard_index < args.num_shards:
+            parser.error(f"--shard_index must be in [0, {args.num_shards})")
     return args
 
 
-async def main():
-    # Parse command line arguments
-    args = parse_args()
-
+def init_process(args):
     # Initialize the configuration
     config.init_config(args.config, args)
 
@@ -148,24 +151,89 @@ async def main():
     logger.info(f"| Config:\n{config.pretty_text}")
 
     # Registed models
-    model_manager.init_models(use_local_proxy=True)
+    model_manager.init_models(use_local_proxy=True, model_ids=get_used_model_ids(config))
     logger.info("| Registed models: %s", ", ".join(model_manager.registed_models.keys()))
 
+
+async def run_tasks(tasks_to_run, store):
+    # Tools and MCP tools are built once, each task gets a fresh agent
+    agent_factory = AgentFactory(config, pool_size=config.get("agent_pool_size", 0))
+
+    batch_size = getattr(config, "concurrency", 4)
+    try:
+        for i in range(0, len(tasks_to_run), batch_size):
+            batch = tasks_to_run[i:min(i + batch_size, len(tasks_to_run))]
+            await asyncio.gather(*[answer_single_question(config, task, store, agent_factory) for task in batch])
+            logger.info(f"| Batch {i // batch_size + 1} done.")
+    finally:
+        # Also on errors and interruptions, so the MCP stdio servers do not outlive the run
+        await agent_factory.close()
+
+
+async def run_shard(shard_index, num_shards):
+    # Load dataset
+    dataset = DATASET.build(config.dataset)
+    logger.info(f"| Loaded dataset: {len(dataset)} examples.")
+
+    # Resume from the shard file, and skip the tasks already merged into the save path
+    shard_store = ResultsStore(get_shard_path(config.save_path, shard_index, num_shards))
+    tasks_to_run = get_tasks_to_run(shard_store, dataset)
+    merged_questions = ResultsStore(config.save_path).task_ids()
+    tasks_to_run = [task for task in shard_tasks(tasks_to_run, shard_index, num_shards)
+                    if task["task_id"] not in merged_questions]
+    logger.info(f"| Shard {shard_index}/{num_shards}: loaded {len(tasks_to_run)} tasks to run.")
+
+    await run_tasks(tasks_to_run, shard_store)
+    return len(tasks_to_run)
+
+
+def shard_worker(args, shard_index, num_shards):
+    init_process(args)
+    return asyncio.run(run_shard(shard_index, num_shards))
+
+
+async def main():
+    # Parse command line arguments
+    args = parse_args()
+
+    init_process(args)
+
+    num_shards = config.get("num_shards", None) or 1
+    shard_index = config.get("shard_index", None)
+
+    if config.get("merge_shards", None):
+        stats = merge_shards(config.save_path)
+        logger.info(f"| Merged shards: {stats}")
+        return
+
+    if num_shards > 1:
+        if shard_index is not None:
+            # Run a single shard, the other shards run on other machines sharing the workdir
+            await run_shard(shard_index, num_shards)
+            return
+
+        # Fold results left by an interrupted run
+        merge_shards(config.save_path)
+
+        logger.info(f"| Running {num_shards} shards in worker processes.")
+        shard_stats = await asyncio.to_thread(run_shards, shard_worker, num_shards, args)
+        stats = merge_shards(config.save_path)
+        logger.info(f"| Merged shards: {stats}")
+        logger.info(f"| Throughput: {format_throughput(stats['new_records'], shard_stats['elapsed'])}")
+        return
+
     # Load dataset
     dataset = DATASET.build(config.dataset)
     logger.info(f"| Loaded dataset: {len(dataset)} examples.")
 
     # Load answers
-    tasks_to_run = get_tasks_to_run(config.save_path, dataset)
+    store = ResultsStore(config.save_path)
+    tasks_to_run = get_tasks_to_run(store, dataset)
     tasks_to_run = [task for task in tasks_to_run]
     logger.info(f"| Loaded {len(tasks_to_run)} tasks to run.")
 
     # Run tasks
-    batch_size = getattr(config, "concurrency", 4)
-    for i in range(0, len(tasks_to_run), batch_size):
-        batch = tasks_to_run[i:min(i + batch_size, len(tasks_to_run))]
-        await asyncio.gather(*[answer_single_question(config, task) for task in batch])
-        logger.info(f"| Batch {i // batch_size + 1} done.")
+    await run_tasks(tasks_to_run, store)
 
 if __name__ == '__main__':
     asyncio.run(main())
\ No newline at end of file
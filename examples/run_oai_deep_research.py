@@ -4,12 +4,9 @@ warnings.simplefilter("ignore", DeprecationWarning)
 import os
 import sys
 from pathlib import Path
-import pandas as pd
 from typing import List
-import json
 from datetime import datetime
 import asyncio
-import threading
 import argparse
 from mmengine import DictAction
 
@@ -20,80 +17,35 @@ from src.logger import logger
 from src.config import config
 from src.models import model_manager
 from src.metric import question_scorer
-from src.agent import create_agent, prepare_response
+from src.agent import AgentFactory, prepare_response, get_used_model_ids
+from src.tools.executor.worker_pool import python_session_id
+from src.tools.retrieval import retrieval_session_id
 from src.registry import DATASET
 from src.tools import FileReaderTool
+from src.utils import ResultsStore, DONE_STATUSES
 
-append_answer_lock = threading.Lock()
+def append_answer(entry: dict, store: ResultsStore) -> None:
+    store.append(entry)
+    print("Answer exported to file:", Path(store.path).resolve())
 
-def append_answer(entry: dict, jsonl_file: str) -> None:
-    jsonl_file = Path(jsonl_file)
-    jsonl_file.parent.mkdir(parents=True, exist_ok=True)
-    with append_answer_lock, open(jsonl_file, "a", encoding="utf-8") as fp:
-        fp.write(json.dumps(entry) + "\n")
-    assert os.path.exists(jsonl_file), "File not found!"
-    print("Answer exported to file:", jsonl_file.resolve())
+def get_tasks_to_run(store: ResultsStore, dataset) -> List[dict]:
 
-def filter_answers(answers_file):
-    answer_df = pd.read_json(answers_file, lines=True)
+    # Wrong and failed answers are not done, they will be run again
+    done_questions = store.task_ids(statuses=DONE_STATUSES)
+    logger.info(f"Found {len(done_questions)} previous results in {store.path}!")
 
-    filttered_df = []
-    for row in answer_df.iterrows():
-        row = row[1]
+    # Rows are prepared as they are read when the dataset is not cached yet
+    return [line for line in dataset.iter_records() if line["task_id"] not in done_questions]
 
-        prediction = row['prediction']
-        truth = row['true_answer']
+async def answer_single_question(config, example, store, agent_factory):
 
-        # If the prediction is "Unable to determine", we set it to None
-        if str(prediction) == "Unable to determine":
-            prediction = None
+    # Python interpreter calls of this task share their variables
+    python_session_id.set(example["task_id"])
+    # Documents read in this task are indexed for retrieval in its own index
+    retrieval_session_id.set(example["task_id"])
 
-        # Processing the test dataset that not contains the true answer
-        if truth == "?":
-            if prediction is not None:
-                filttered_df.append(row)
-        # Processing the validation dataset that contains the true answer
-        else:
-            if prediction is not None:
-                prediction = str(prediction)
-                score = question_scorer(prediction, truth)
-                if score:
-                    filttered_df.append(row)
-
-    filttered_df = pd.DataFrame(filttered_df)
-    filttered_df.to_json(answers_file, lines=True, orient='records')
-
-    logger.info(f"Previous answers filtered! {len(answer_df)} -> {len(filttered_df)}")
-
-def get_tasks_to_run(answers_file, dataset) -> List[dict]:
-    
-    data = dataset.data
-
-    logger.info(f"Loading answers from {answers_file}...")
     try:
-        if os.path.exists(answers_file):
-            logger.info("Filtering answers starting.")
-            filter_answers(answers_file)
-            logger.info("Filtering answers ending.")
-
-            df = pd.read_json(answers_file, lines=True)
-            if "task_id" not in df.columns:
-                logger.warning(f"Answers file {answers_file} does not contain 'task_id' column. Please check the file format.")
-                return []
-            done_questions = df["task_id"].tolist()
-            logger.info(f"Found {len(done_questions)} previous results!")
-        else:
-            done_questions = []
-    except Exception as e:
-        logger.warning("Error when loading records: ", e)
-        logger.warning("No usable records! ▶️ Starting new.")
-        done_questions = []
-    return [line for line in data.to_dict(orient="records") if line["task_id"] not in done_questions]
-
-async def answer_single_question(config, example):
-
-    try:
-        agent = await create_agent(config)
+        agent = await agent_factory.acquire()
         logger.visualize_agent_tree(agent)
 
         logger.info(f"Task Id: {example['task_id']}, Final Answer: {example['true_answer']}")
@@ -129,6 +81,7 @@ async def answer_single_question(config, example):
         for memory_step in agent.memory.steps:
             memory_step.model_input_messages = None
         intermediate_steps = [str(step) for step in agent.memory.steps]
+        token_usage = agent.monitor.get_total_token_counts().dict()
 
         # Check for parsing errors which indicate the LLM failed to follow the required format
         parsing_error = True if any(["AgentParsingError" in step for step in intermediate_steps]) else False
@@ -141,6 +94,7 @@ async def answer_single_question(config, example):
         logger.info("Error on ", augmented_question, e)
         output = None
         intermediate_steps = []
+        token_usage = None
         parsing_error = False
         iteration_limit_exceeded = False
         exception = e
@@ -152,6 +106,7 @@ async def answer_single_question(config, example):
         "augmented_question": augmented_question,
         "prediction": output,
         "intermediate_steps": intermediate_steps,
+        "token_usage": token_usage,
         "parsing_error": parsing_error,
         "iteration_limit_exceeded": iteration_limit_exceeded,
         "agent_error": str(exception) if raised_exception else None,
@@ -161,7 +116,7 @@ async def answer_single_question(config, example):
         "task_id": example["task_id"],
         "true_answer": example["true_answer"],
     }
-    append_answer(annotated_example, config.save_path)
+    append_answer(annotated_example, store)
 
 def parse_args():
     parser = argparse.ArgumentParser(description='main')
@@ -193,7 +148,7 @@ async def main():
     logger.info(f"| Config:\n{config.pretty_text}")
 
     # Registed models
-    model_manager.init_models(use_local_proxy=True)
+    model_manager.init_models(use_local_proxy=True, model_ids=get_used_model_ids(config))
     logger.info("| Registed models: %s", ", ".join(model_manager.registed_models.keys()))
     
     # Load dataset
@@ -201,18 +156,22 @@ async def main():
     logger.info(f"| Loaded dataset: {len(dataset)} examples.")
 
     # Load answers
-    tasks_to_run = get_tasks_to_run(config.save_path, dataset)
+    store = ResultsStore(config.save_path, scorer=question_scorer)
+    tasks_to_run = get_tasks_to_run(store, dataset)
     tasks_to_run = [task for task in tasks_to_run[:-1]] # Remove the last task which is a test example
     logger.info(f"| Loaded {len(tasks_to_run)} tasks to run.")
 
-    await answer_single_question(config, [task for task in tasks_to_run if task["task_id"] == "16cf70d8-9263-4eb0-a8a9-5eb91a23b462"][0])  # Run test example first
+    # Tools and MCP tools are built once, each task gets a fresh agent
+    agent_factory = AgentFactory(config, pool_size=config.get("agent_pool_size", 0))
+
+    await answer_single_question(config, [task for task in tasks_to_run if task["task_id"] == "16cf70d8-9263-4eb0-a8a9-5eb91a23b462"][0], store, agent_factory)  # Run test example first
     exit()
 
     # Run tasks
     batch_size = getattr(config, "concurrency", 4)
     for i in range(0, len(tasks_to_run), batch_size):
         batch = tasks_to_run[i:min(i + batch_size, len(tasks_to_run))]
-        await asyncio.gather(*[answer_single_question(config, task) for task in batch])
+        await asyncio.gather(*[answer_single_question(config, task, store, agent_factory) for task in batch])
         logger.info(f"| Batch {i // batch_size + 1} done.")
 
 if __name__ == '__main__':
@@ -11,7 +11,7 @@ sys.path.append(root)
 from src.logger import logger
 from src.config import config
 from src.models import model_manager
-from src.agent import create_agent
+from src.agent import create_agent, get_used_model_ids
 
 def parse_args():
     parser = argparse.ArgumentParser(description='main')
@@ -44,17 +44,17 @@ async def main():
     logger.info(f"| Config:\n{config.pretty_text}")
 
     # Registed models
-    model_manager.init_models(use_local_proxy=True)
+    model_manager.init_models(use_local_proxy=True, model_ids=get_used_model_ids(config))
     logger.info("| Registed models: %s", ", ".join(model_manager.registed_models.keys()))
 
     # Create agent
-    agent = await create_agent(config)
-    logger.visualize_agent_tree(agent)
+    async with create_agent(config) as agent:
+        logger.visualize_agent_tree(agent)
 
-    # Run example
-    task = "Use deep_researcher_agent to search the latest papers on the topic of 'AI Agent' and then summarize it."
-    res = await agent.run(task)
-    logger.info(f"| Result: {res}")
+        # Run example
+        task = "Use deep_researcher_agent to search the latest papers on the topic of 'AI Agent' and then summarize it."
+        res = await agent.run(task)
+        logger.info(f"| Result: {res}")
 
 if __name__ == '__main__':
     asyncio.run(main())
\ No newline at end of file
@@ -1,11 +1,22 @@
-from .tools import (
-    Tool,
-    ToolResult,
-    AsyncTool,
-    DeepAnalyzerTool,
-    DeepResearcherTool,
-    PythonInterpreterTool,
-    AutoBrowserUseTool,
-    PlanningTool,
-    make_tool_instance,
-)
\ No newline at end of file
+# The environment is loaded once, before any module of the package reads it
+from src.utils.env_utils import load_env
+load_env()
+
+from src.utils.lazy_utils import lazy_exports
+
+# Tools are imported on first use, see src.tools
+_EXPORTS = {
+    "Tool": "src.tools",
+    "ToolResult": "src.tools",
+    "AsyncTool": "src.tools",
+    "DeepAnalyzerTool": "src.tools",
+    "DeepResearcherTool": "src.tools",
+    "PythonInterpreterTool": "src.tools",
+    "AutoBrowserUseTool": "src.tools",
+    "PlanningTool": "src.tools",
+    "make_tool_instance": "src.tools",
+}
+
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
+
+__all__ = list(_EXPORTS)
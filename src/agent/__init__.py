@@ -1,10 +1,19 @@
-from src.agent.planning_agent import PlanningAgent
-from src.agent.browser_use_agent import BrowserUseAgent
-from src.agent.deep_analyzer_agent import DeepAnalyzerAgent
-from src.agent.deep_researcher_agent import DeepResearcherAgent
-from src.agent.general_agent import GeneralAgent
-from src.agent.agent import create_agent
-from src.agent.reformulator import prepare_response
+from src.utils.lazy_utils import lazy_exports
+
+# Agent modules are imported on first use, agents are registered when `AGENT.build` imports them (see src.registry)
+_EXPORTS = {
+    "PlanningAgent": "src.agent.planning_agent",
+    "BrowserUseAgent": "src.agent.browser_use_agent",
+    "DeepAnalyzerAgent": "src.agent.deep_analyzer_agent",
+    "DeepResearcherAgent": "src.agent.deep_researcher_agent",
+    "GeneralAgent": "src.agent.general_agent",
+    "create_agent": "src.agent.agent",
+    "AgentFactory": "src.agent.agent",
+    "get_used_model_ids": "src.agent.agent",
+    "prepare_response": "src.agent.reformulator",
+}
+
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
 
 __all__ = [
     "PlanningAgent",
@@ -13,5 +22,7 @@ __all__ = [
     "DeepResearcherAgent",
     "GeneralAgent",
     "create_agent",
+    "AgentFactory",
+    "get_used_model_ids",
     "prepare_response",
-]
\ No newline at end of file
+]
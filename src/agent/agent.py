@@ -1,10 +1,15 @@
-from typing import List, Dict, Any
+import asyncio
+import inspect
+from contextlib import asynccontextmanager
+from typing import List, Dict, Any, Optional
 
 from src.registry import AGENT, TOOL
 from src.models import model_manager
 from src.tools import make_tool_instance
 from src.mcp.mcpadapt import MCPAdapt, AsyncToolAdapter
+from src.mcp.cache import MCPToolsCache
 from src.logger import logger
+from src.utils import assemble_project_path
 
 AUTHORIZED_IMPORTS = [
     "pandas",
@@ -12,17 +17,35 @@ AUTHORIZED_IMPORTS = [
     "numpy"
 ]
 
+# Tools that keep per-task state, they are never shared between agents
+PER_TASK_TOOLS = [
+    "planning_tool",
+]
+
+def build_tool(config, tool_name):
+    config_name = f"{tool_name}_config"  # e.g., "python_interpreter_tool" -> "python_interpreter_tool_config"
+    if config_name in config:
+        # If the tool has a specific config, use it
+        tool_config = config[config_name]
+    else:
+        # Otherwise, use the default tool instance
+        tool_config = dict(type=tool_name)
+    return TOOL.build(tool_config)
+
 async def build_agent(config,
                       agent_config,
                       default_tools = None,
                       default_mcp_tools=None,
-                      default_managed_agents=None):
+                      default_managed_agents=None,
+                      tool_cache=None):
     """
     Build an agent based on the provided configuration.
 
     Args:
         config (dict): Configuration dictionary containing tool and model settings.
         agent_config (dict): Configuration dictionary containing agent settings.
+        tool_cache (dict, optional): Tool instances shared across agents, keyed by tool name.
+            Tools missing from the cache are built.
 
     Returns:
         Agent instance.
@@ -39,14 +62,10 @@ async def build_agent(config,
         for tool_name in used_tools:
             if tool_name not in default_tools:
                 logger.warning(f"Tool '{tool_name}' is not registered. Skipping.")
-            config_name = f"{tool_name}_config"  # e.g., "python_interpreter_tool" -> "python_interpreter_tool_config"
-            if config_name in config:
-                # If the tool has a specific config, use it
-                tool_config = config[config_name]
+            if tool_cache is not None and tool_name in tool_cache:
+                tool = tool_cache[tool_name]
             else:
-                # Otherwise, use the default tool instance
-                tool_config = dict(type=tool_name)
-            tool = TOOL.build(tool_config)
+                tool = build_tool(config, tool_name)
             tools.append(tool)
         logger.info(f"| Tools initialized: {', '.join([tool.name for tool in tools])}")
 
@@ -96,12 +115,39 @@ async def build_agent(config,
     return agent
 
 
-async def create_agent(config):
+def get_used_agent_configs(config) -> List[Dict[str, Any]]:
+    """The configs of the main agent and, for a hierarchical agent, of its registered managed agents."""
+    agent_configs = [config.agent_config]
+    if config.use_hierarchical_agent:
+        for agent_name in config.agent_config.get("managed_agents", []):
+            managed_agent_config = config.get(f"{agent_name}_config", None)
+            if agent_name in AGENT and managed_agent_config is not None:
+                agent_configs.append(managed_agent_config)
+    return agent_configs
+
+
+def get_used_model_ids(config) -> List[str]:
+    """The models named by the used agents and their tools, in their `model_id`, `*_model_id` and `*_model_ids` options."""
+    model_ids = []
+    for agent_config in get_used_agent_configs(config):
+        option_configs = [agent_config] + [config.get(f"{tool_name}_config", None) or {}
+                                           for tool_name in agent_config.get("tools", [])]
+        for option_config in option_configs:
+            for key, value in option_config.items():
+                if key == "model_id" or key.endswith("_model_id"):
+                    values = [value]
+                elif key.endswith("_model_ids"):
+                    values = list(value or [])
+                else:
+                    continue
+                for model_id in values:
+                    if isinstance(model_id, str) and model_id not in model_ids:
+                        model_ids.append(model_id)
+    return model_ids
+
+
+async def _create_agent(config, mcpadapt_tools, tool_cache=None):
 
-    # Load MCP tools
-    mcpadapt = MCPAdapt(config.mcp_tools_config, AsyncToolAdapter())
-    mcpadapt_tools = await mcpadapt.tools()
-    
     if config.use_hierarchical_agent:
 
         logger.info("| Creating a hierarchical agent.")
@@ -120,6 +166,7 @@ async def create_agent(config):
                     managed_agent_config,
                     default_tools=TOOL,
                     default_mcp_tools=mcpadapt_tools,
+                    tool_cache=tool_cache,
                 )
                 managed_agents.append(managed_agent)
         logger.info(f"| Managed agents initialized: {', '.join([agent.name for agent in managed_agents])}")
@@ -130,7 +177,8 @@ async def create_agent(config):
             agent_config,
             default_tools=TOOL,
             default_mcp_tools=mcpadapt_tools,
-            default_managed_agents=managed_agents
+            default_managed_agents=managed_agents,
+            tool_cache=tool_cache,
         )
 
         return agent
@@ -145,7 +193,134 @@ async def create_agent(config):
         agent = await build_agent(config,
             agent_config,
             default_tools=TOOL,
-            default_mcp_tools=mcpadapt_tools
+            default_mcp_tools=mcpadapt_tools,
+            tool_cache=tool_cache,
         )
 
-        return agent
\ No newline at end of file
+        return agent
+
+
+def build_mcp_tools_cache(config) -> Optional[MCPToolsCache]:
+    cache_config = config.get("mcp_tools_cache_config", None)
+    if not cache_config:
+        return None
+    return MCPToolsCache(cache_dir=assemble_project_path(cache_config["cache_dir"]),
+                         ttl=cache_config.get("ttl", None))
+
+
+@asynccontextmanager
+async def create_agent(config):
+    """
+    Create one agent, its MCP sessions and tools are closed on exit:
+
+        async with create_agent(config) as agent:
+            await agent.run(task)
+    """
+    factory = AgentFactory(config)
+    try:
+        yield await factory.create()
+    finally:
+        await factory.close()
+
+
+class AgentFactory():
+    """
+    Create agents for many tasks from components built once.
+
+    The MCP tools are discovered once and every tool, except the `per_task_tools` which keep
+    per-task state, is built once and shared by all the agents. Each created agent (and each of
+    its managed agents) is a new instance with fresh memory. With `pool_size > 0`, agents are
+    pre-built in the background so that :meth:`acquire` returns immediately.
+    """
+
+    def __init__(self,
+                 config,
+                 pool_size: int = 0,
+                 per_task_tools: Optional[List[str]] = None):
+        self.config = config
+        self.pool_size = pool_size
+        self.per_task_tools = set(PER_TASK_TOOLS if per_task_tools is None else per_task_tools)
+
+        self.mcpadapt = None
+        self.mcpadapt_tools = None
+        self.tool_cache = None
+
+        self._setup_lock = asyncio.Lock()
+        self._pool = None
+        self._pending = set()
+
+    async def setup(self):
+        """Discover the MCP tools and build the shared tools."""
+        async with self._setup_lock:
+            if self.tool_cache is not None:
+                return
+
+            # The MCP sessions stay open until close(), the tools of every agent share them
+            self.mcpadapt = MCPAdapt(self.config.mcp_tools_config,
+                                     AsyncToolAdapter(),
+                                     pool_size=self.config.get("mcp_session_pool_size", 1),
+                                     cache=build_mcp_tools_cache(self.config))
+            self.mcpadapt_tools = await self.mcpadapt.tools()
+
+            tool_cache = {}
+            for agent_config in get_used_agent_configs(self.config):
+                for tool_name in agent_config.get("tools", []):
+                    if tool_name in tool_cache or tool_name in self.per_task_tools or tool_name not in TOOL:
+                        continue
+                    tool_cache[tool_name] = build_tool(self.config, tool_name)
+            self.tool_cache = tool_cache
+            logger.info(f"| Shared tools initialized: {', '.join(tool_cache.keys())}")
+
+    async def create(self):
+        """Create a new agent."""
+        await self.setup()
+        return await _create_agent(self.config, self.mcpadapt_tools, tool_cache=self.tool_cache)
+
+    async def acquire(self):
+        """Take an agent from the warm pool, or create one when there is no pool."""
+        if self.pool_size <= 0:
+            return await self.create()
+
+        await self.setup()
+        if self._pool is None:
+            self._pool = asyncio.Queue()
+
+        if self._pool.empty():
+            # Cold pool, build this one directly rather than waiting for a pre-built agent
+            agent = await self.create()
+        else:
+            agent = self._pool.get_nowait()
+        self._refill()
+        return agent
+
+    def _refill(self):
+        while self._pool.qsize() + len(self._pending) < self.pool_size:
+            task = asyncio.create_task(self._build_into_pool())
+            self._pending.add(task)
+            task.add_done_callback(self._pending.discard)
+
+    async def _build_into_pool(self):
+        try:
+            agent = await self.create()
+        except Exception as e:
+            logger.warning(f"| Failed to pre-build an agent: {e}")
+            return
+        await self._pool.put(agent)
+
+    async def close(self):
+        """Stop pre-building agents, drop the pooled ones, close the shared tools and the MCP sessions."""
+        for task in list(self._pending):
+            task.cancel()
+        if self._pending:
+            await asyncio.gather(*self._pending, return_exceptions=True)
+        self._pending.clear()
+        self._pool = None
+
+        for tool in (self.tool_cache or {}).values():
+            if hasattr(tool, "close"):
+                result = tool.close()
+                if inspect.isawaitable(result):
+                    await result
+
+        if self.mcpadapt is not None:
+            await self.mcpadapt.close()
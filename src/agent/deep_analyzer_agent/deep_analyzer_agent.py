@@ -1,10 +1,9 @@
 from typing import (
     Any,
 )
-import yaml
 
 from src.agent.general_agent import GeneralAgent
-from src.base.async_multistep_agent import PromptTemplates
+from src.base.async_multistep_agent import PromptTemplates, load_prompt_templates
 
 from src.memory import AgentMemory
 from src.models import Model
@@ -36,8 +35,7 @@ class DeepAnalyzerAgent(GeneralAgent):
         )
 
         template_path = assemble_project_path(self.config.template_path)
-        with open(template_path, "r") as f:
-            self.prompt_templates = yaml.safe_load(f)
+        self.prompt_templates = load_prompt_templates(template_path)
 
         self.system_prompt = self.initialize_system_prompt()
         self.user_prompt = self.initialize_user_prompt()
@@ -5,7 +5,6 @@ from typing import (
     Optional
 )
 import json
-import yaml
 from rich.panel import Panel
 from rich.text import Text
 from rich.live import Live
@@ -22,6 +21,7 @@ from src.exception import (
 from src.base.async_multistep_agent import (PromptTemplates,
                                             populate_template,
                                             AsyncMultiStepAgent,
+                                            load_prompt_templates,
                                             )
 from src.base import (ToolOutput,
                       ActionOutput,
@@ -70,8 +70,7 @@ class GeneralAgent(AsyncMultiStepAgent):
         )
 
         template_path = assemble_project_path(self.config.template_path)
-        with open(template_path, "r") as f:
-            self.prompt_templates = yaml.safe_load(f)
+        self.prompt_templates = load_prompt_templates(template_path)
 
         self.system_prompt = self.initialize_system_prompt()
         self.user_prompt = self.initialize_user_prompt()
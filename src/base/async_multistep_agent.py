@@ -14,6 +14,7 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+import copy
 import importlib
 import inspect
 import json
@@ -27,6 +28,7 @@ from abc import ABC, abstractmethod
 import warnings
 from pathlib import Path
 from dataclasses import dataclass
+from functools import lru_cache
 from collections.abc import AsyncGenerator
 from typing import TYPE_CHECKING, Any, Callable, TypedDict, Union, Literal, TypeAlias, List
 
@@ -93,13 +95,29 @@ from src.base.multistep_agent import (ActionOutput,
                                       StreamEvent)
 
 
+@lru_cache(maxsize=32)
+def _load_prompt_templates(template_path: str) -> dict:
+    with open(template_path, "r") as f:
+        return yaml.safe_load(f)
+
+
+def load_prompt_templates(template_path: str) -> dict:
+    """Load the prompt templates of a yaml file, parsing each file only once per process."""
+    return copy.deepcopy(_load_prompt_templates(template_path))
+
+
 def get_variable_names(self, template: str) -> set[str]:
     pattern = re.compile(r"\{\{([^{}]+)\}\}")
     return {match.group(1).strip() for match in pattern.finditer(template)}
 
 
+@lru_cache(maxsize=256)
+def _compile_template(template: str) -> Template:
+    return Template(template, undefined=StrictUndefined)
+
+
 def populate_template(template: str, variables: dict[str, Any]) -> str:
-    compiled_template = Template(template, undefined=StrictUndefined)
+    compiled_template = _compile_template(template)
     try:
         return compiled_template.render(**variables)
     except Exception as e:
@@ -2,9 +2,6 @@ import os
 from mmengine import Config as MMConfig
 from argparse import Namespace
 
-from dotenv import load_dotenv
-load_dotenv(verbose=True)
-
 from src.utils import assemble_project_path, Singleton
 from src.logger import logger
 
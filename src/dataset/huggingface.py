@@ -1,80 +1,226 @@
+"""Benchmark datasets loaded from local HuggingFace dataset directories.
+
+Preparing a dataset, i.e. loading it with `datasets`, renaming its columns and extracting its attachments, is done
+once: the prepared rows are saved as Parquet next to the dataset, under a fingerprint of the source files and of the
+preparation, and later runs read them back directly. Rows are prepared lazily, so a cold start streams them to the
+caller as they are ready, and attachments already extracted are not written again.
+"""
+import io
 import os
-import pandas as pd
-import datasets
+import json
 import base64
+import hashlib
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Iterator, List, Optional
+
+import pandas as pd
 
 from src.utils import assemble_project_path
 from src.logger import logger
 from src.registry import DATASET
 
-@DATASET.register_module(name="gaia_dataset", force=True)
-class GAIADataset():
-    def __init__(self, path, name, split):
+# Part of the fingerprint of the prepared datasets, bump it when the preparation of the rows changes
+PREPARE_VERSION = "2"
+
+# Files of a dataset directory that hold its rows, attachments and images are not part of the fingerprint
+SOURCE_EXTENSIONS = (".py", ".json", ".jsonl", ".parquet", ".arrow", ".csv")
+
+
+class PreparedDataset(ABC):
+    """Base of the datasets whose prepared rows are cached on disk. Subclasses load the source and prepare a row."""
+
+    # Source columns not kept in the prepared rows, e.g. decoded images
+    drop_columns: List[str] = []
+
+    def __init__(self, path: str, name: Optional[str], split: str, prepared_dir: Optional[str] = None):
+        """
+        Args:
+            path (str): The dataset directory.
+            name (str, optional): The dataset configuration.
+            split (str): The split to load.
+            prepared_dir (str, optional): Directory of the prepared rows, `<path>/.prepared` if None.
+        """
         self.path = path
         self.name = name
         self.split = split
 
-        path = assemble_project_path(path)
-        ds = datasets.load_dataset(path, name, trust_remote_code=True)[split]
-        ds = ds.rename_columns({"Question": "question", "Final answer": "true_answer", "Level": "task"})
-        ds = ds.map(self.preprocess_file_paths, load_from_cache_file=False, fn_kwargs={"split": split, "path": path})
-        
-        data = pd.DataFrame(ds)
-        
-        self.data = data
-        
-    def preprocess_file_paths(self, row, path, split):
-        save_path = assemble_project_path(os.path.join(path, "2023", split))
-        os.makedirs(save_path, exist_ok=True)
-        if len(row["file_name"]) > 0:
-            row["file_name"] = os.path.join(save_path, row["file_name"])
-        return row
-    
+        self.root = assemble_project_path(path)
+        self.prepared_dir = assemble_project_path(prepared_dir) if prepared_dir else os.path.join(self.root, ".prepared")
+        self.prepared_path = os.path.join(self.prepared_dir,
+                                          f"{type(self).__name__}-{name}-{split}-{self.fingerprint()}.parquet")
+
+        self._data: Optional[pd.DataFrame] = None
+        self._source = None
+
+    def fingerprint(self) -> str:
+        """Hash of the source files of the dataset, the configuration and the preparation."""
+        files = []
+        for directory, dirnames, filenames in os.walk(self.root):
+            dirnames[:] = sorted(dirname for dirname in dirnames if not dirname.startswith("."))
+            for filename in sorted(filenames):
+                if filename.lower().endswith(SOURCE_EXTENSIONS):
+                    stat = os.stat(os.path.join(directory, filename))
+                    files.append((os.path.relpath(os.path.join(directory, filename), self.root),
+                                  stat.st_size, stat.st_mtime_ns))
+        return hashlib.sha256(json.dumps({
+            "files": files,
+            "root": self.root,  # the prepared rows hold absolute attachment paths
+            "name": self.name,
+            "split": self.split,
+            "version": PREPARE_VERSION,
+        }, sort_keys=True).encode("utf-8")).hexdigest()[:16]
+
+    @abstractmethod
+    def load_source(self):
+        """The source rows, as a `datasets.Dataset`."""
+
+    @abstractmethod
+    def prepare_record(self, record: Dict[str, Any]) -> Dict[str, Any]:
+        """Rename the columns of a source row and extract its attachments."""
+
+    def _get_source(self):
+        if self._source is None:
+            self._source = self.load_source()
+        return self._source
+
+    def _save_prepared(self, data: pd.DataFrame) -> None:
+        tmp_path = f"{self.prepared_path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(self.prepared_dir, exist_ok=True)
+            data.to_parquet(tmp_path, index=False)
+            os.replace(tmp_path, self.prepared_path)
+            logger.info(f"| Saved the prepared dataset to {self.prepared_path}")
+        except Exception as e:
+            logger.warning(f"| Cannot save the prepared dataset to {self.prepared_path}: {e}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def iter_records(self) -> Iterator[Dict[str, Any]]:
+        """
+        Yield the prepared rows as dicts. Without a prepared cache, every row is prepared as it is yielded and the
+        cache is saved once all rows were prepared.
+        """
+        if self._data is None and os.path.exists(self.prepared_path):
+            try:
+                self._data = pd.read_parquet(self.prepared_path)
+                logger.info(f"| Loaded the prepared dataset from {self.prepared_path}")
+            except Exception as e:
+                logger.warning(f"| Ignoring unreadable prepared dataset {self.prepared_path}: {e}")
+
+        if self._data is not None:
+            yield from self._data.to_dict(orient="records")
+            return
+
+        records = []
+        for record in self._get_source():
+            record = self.prepare_record(record)
+            for column in self.drop_columns:
+                record.pop(column, None)
+            records.append(record)
+            yield record
+
+        self._data = pd.DataFrame(records)
+        self._source = None
+        self._save_prepared(self._data)
+
+    @property
+    def data(self) -> pd.DataFrame:
+        """All prepared rows, prepared on first access if they are not cached."""
+        if self._data is None:
+            for _ in self.iter_records():
+                pass
+        return self._data
+
     def __len__(self):
-        return len(self.data)
-    
+        if self._data is not None:
+            return len(self._data)
+        if os.path.exists(self.prepared_path):
+            import pyarrow.parquet as pq
+
+            try:
+                return pq.ParquetFile(self.prepared_path).metadata.num_rows
+            except Exception:
+                pass
+        return self._get_source().num_rows
+
     def __getitem__(self, index):
         return self.data.iloc[index]
 
+
+@DATASET.register_module(name="gaia_dataset", force=True)
+class GAIADataset(PreparedDataset):
+    def __init__(self, path, name, split, prepared_dir=None):
+        super(GAIADataset, self).__init__(path, name, split, prepared_dir=prepared_dir)
+        self.files_dir = os.path.join(self.root, "2023", split)
+
+    def load_source(self):
+        import datasets
+
+        ds = datasets.load_dataset(self.root, self.name, trust_remote_code=True)[self.split]
+        return ds.rename_columns({"Question": "question", "Final answer": "true_answer", "Level": "task"})
+
+    def prepare_record(self, record: Dict[str, Any]) -> Dict[str, Any]:
+        if len(record["file_name"]) > 0:
+            record["file_name"] = os.path.join(self.files_dir, record["file_name"])
+        return record
+
+
 @DATASET.register_module(name="hle_dataset", force=True)
-class HLEDataset():
-    def __init__(self, path, name, split):
-        self.path = path
-        self.name = name
-        self.split = split
+class HLEDataset(PreparedDataset):
+    # Image columns kept undecoded, as {"bytes", "path"} dicts, so that the prepared rows can be saved as Parquet
+    image_columns = ["image_preview", "rationale_image"]
 
-        path = assemble_project_path(path)
-        ds = datasets.load_dataset(path, trust_remote_code=True)[split]
-        ds = ds.rename_columns({"answer": "true_answer", "id": "task_id"})
-        ds = ds.map(self.preprocess_file_paths, load_from_cache_file=False, fn_kwargs={"split": split, "path": path})
-
-        data = pd.DataFrame(ds)
-        self.data = data
-        
-    def preprocess_file_paths(self, row, path, split):
-        save_path = assemble_project_path(os.path.join(path, "images", split))
-        os.makedirs(save_path, exist_ok=True)
-
-        image_path = ""
-        if len(row["image"]) > 0:
-            image_string = row["image"]
-            task_id = row["task_id"]
-            if image_string.startswith('data:image'):
-                image_type = image_string.split(';')[0].split('/')[1]
-                image_base64 = image_string.split(',')[1]
-
-                image_path = os.path.join(save_path, f"{task_id}.{image_type}")
-                with open(image_path, "wb") as f:
-                    f.write(base64.b64decode(image_base64))
-                logger.info(f"Save image {task_id} to {image_path}")
-            else:
-                image_path = ""
-
-        row["file_name"] = image_path
-        return row
-        
-    def __len__(self):
-        return len(self.data)
-    
-    def __getitem__(self, index):
-        return self.data.iloc[index]
\ No newline at end of file
+    def __init__(self, path, name, split, prepared_dir=None):
+        super(HLEDataset, self).__init__(path, name, split, prepared_dir=prepared_dir)
+        self.images_dir = os.path.join(self.root, "images", split)
+
+    def load_source(self):
+        import datasets
+
+        ds = datasets.load_dataset(self.root, trust_remote_code=True)[self.split]
+        for column in self.image_columns:
+            if column in ds.column_names:
+                ds = ds.cast_column(column, datasets.Image(decode=False))
+        return ds.rename_columns({"answer": "true_answer", "id": "task_id"})
+
+    def prepare_record(self, record: Dict[str, Any]) -> Dict[str, Any]:
+        """Extract the base64 image of the row to a file, the row keeps the image too."""
+        record["file_name"] = extract_image(record.get("image", ""), record["task_id"], self.images_dir)
+        for column in self.image_columns:
+            if column in record:
+                record[column] = encode_image_cell(record[column])
+        return record
+
+
+def encode_image_cell(image: Any) -> Optional[Dict[str, Any]]:
+    """An image column value as an undecoded {"bytes", "path"} dict, PIL images are encoded as PNG."""
+    if image is None or isinstance(image, dict):
+        return image
+    buffer = io.BytesIO()
+    image.save(buffer, format="PNG")
+    return {"bytes": buffer.getvalue(), "path": None}
+
+
+def extract_image(image_string: Optional[str], task_id: str, save_dir: str) -> str:
+    """
+    Write a `data:image/...;base64,` image to `save_dir` once, named after the task.
+
+    Returns:
+        str: The image file, empty without an image.
+    """
+    if not image_string or not image_string.startswith("data:image"):
+        return ""
+
+    header, _, image_base64 = image_string.partition(",")
+    image_type = header.split(";")[0].split("/")[1]
+    image_path = os.path.join(save_dir, f"{task_id}.{image_type}")
+    if os.path.exists(image_path):
+        return image_path
+
+    os.makedirs(save_dir, exist_ok=True)
+    tmp_path = f"{image_path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(base64.b64decode(image_base64))
+    os.replace(tmp_path, image_path)
+    logger.info(f"Save image {task_id} to {image_path}")
+    return image_path
@@ -1,8 +1,12 @@
 from .mcpadapt import MCPAdapt
 from .adapter import AsyncToolAdapter, ToolAdapter
+from .session import MCPSession
+from .cache import MCPToolsCache
 
 __all__ = [
     "MCPAdapt",
     "AsyncToolAdapter",
-    "ToolAdapter"
+    "ToolAdapter",
+    "MCPSession",
+    "MCPToolsCache",
 ]
\ No newline at end of file
@@ -77,17 +77,16 @@ class AsyncToolAdapter(ToolAdapter):
                 super(MCPAdaptTool, self).__init__()
 
             async def forward(self, *args, **kwargs) -> str:
+                # `client` is a persistent MCPSession, no per-call connection is opened
                 if len(args) > 0:
                     if len(args) == 1 and isinstance(args[0], dict) and not kwargs:
-                        async with client:
-                            mcp_output = await client.call_tool(self.name, arguments=args[0])
+                        mcp_output = await client.call_tool(self.name, arguments=args[0])
                     else:
                         raise ValueError(
                             f"tool {self.name} does not support multiple positional arguments or combined positional and keyword arguments"
                         )
                 else:
-                    async with client:
-                        mcp_output = await client.call_tool(name = self.name, arguments=kwargs)
+                    mcp_output = await client.call_tool(name = self.name, arguments=kwargs)
 
                 return json5.loads(mcp_output[0].text)
 
@@ -0,0 +1,105 @@
+"""Cache of MCP tool discovery results.
+
+Listing the tools of a stdio MCP server means spawning it, so the tool definitions are snapshotted
+on disk, keyed by the server definitions. A snapshot is used until its TTL expires or a server
+notifies that its tool list changed; it is then refreshed from the servers.
+"""
+import os
+import json
+import time
+import hashlib
+from typing import Any, Dict, List, Optional
+
+from src.logger import logger
+
+
+def _hash(obj: Any) -> str:
+    return hashlib.sha256(json.dumps(obj, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+def fingerprint_tools(tools: List[Dict[str, Any]]) -> str:
+    """Fingerprint of the tool names, descriptions and input schemas, independent of their order."""
+    signatures = sorted(
+        (tool.get("name"), tool.get("description"), _hash(tool.get("inputSchema")))
+        for tool in tools
+    )
+    return _hash(signatures)
+
+
+class MCPToolsCache():
+    def __init__(self, cache_dir: str, ttl: Optional[float] = None):
+        """
+        Args:
+            cache_dir (str): Directory of the on-disk snapshots.
+            ttl (float, optional): Seconds after which a snapshot is refreshed. Never expires if None.
+        """
+        self.cache_dir = cache_dir
+        self.ttl = ttl
+        self._memory: Dict[str, Dict[str, Any]] = {}
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def key(self, config: Dict[str, Any]) -> str:
+        """Key of the server definitions in `config`."""
+        return _hash(config)[:32]
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def _is_fresh(self, snapshot: Dict[str, Any]) -> bool:
+        return self.ttl is None or time.time() - snapshot["created_at"] < self.ttl
+
+    def load(self, config: Dict[str, Any]) -> Optional[List[Dict[str, Any]]]:
+        """The cached tool definitions of `config`, or None if missing, expired or invalidated."""
+        key = self.key(config)
+
+        snapshot = self._memory.get(key)
+        if snapshot is None:
+            path = self._path(key)
+            if not os.path.exists(path):
+                return None
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    snapshot = json.load(f)
+            except (OSError, json.JSONDecodeError) as e:
+                logger.warning(f"| Ignoring unreadable MCP tools snapshot {path}: {e}")
+                return None
+            if snapshot.get("fingerprint") != fingerprint_tools(snapshot.get("tools", [])):
+                logger.warning(f"| Ignoring corrupted MCP tools snapshot {path}.")
+                return None
+
+        if not self._is_fresh(snapshot):
+            return None
+
+        self._memory[key] = snapshot
+        return snapshot["tools"]
+
+    def save(self, config: Dict[str, Any], tools: List[Dict[str, Any]]) -> str:
+        """Snapshot the tool definitions of `config` and return their fingerprint."""
+        key = self.key(config)
+        fingerprint = fingerprint_tools(tools)
+
+        previous = self._memory.get(key)
+        if previous is not None and previous["fingerprint"] != fingerprint:
+            logger.info(f"| MCP tool schemas changed for {key}, snapshot updated.")
+
+        snapshot = {
+            "created_at": time.time(),
+            "fingerprint": fingerprint,
+            "tools": tools,
+        }
+        path = self._path(key)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(snapshot, f)
+        os.replace(tmp_path, path)
+
+        self._memory[key] = snapshot
+        return fingerprint
+
+    def invalidate(self, config: Dict[str, Any]) -> None:
+        """Drop the snapshot of `config`, e.g. when a server notifies that its tool list changed."""
+        key = self.key(config)
+        self._memory.pop(key, None)
+        path = self._path(key)
+        if os.path.exists(path):
+            os.remove(path)
@@ -5,15 +5,20 @@ basic interfaces and classes for adapting tools from MCP to the desired Agent fr
 """
 import asyncio
 from typing import Any, Dict, Optional
-from fastmcp import Client
+from mcp import types as mcp_types
 
 from src.mcp.adapter import AsyncToolAdapter, ToolAdapter
+from src.mcp.session import MCPSession
+from src.mcp.cache import MCPToolsCache
+from src.logger import logger
 
 class MCPAdapt():
     def __init__(
         self,
         config: Dict[str, Any],
         adapter: Optional[ToolAdapter] = None,
+        pool_size: int = 1,
+        cache: Optional[MCPToolsCache] = None,
     ):
         """
         Manage the MCP server / client lifecycle and expose tools adapted with the adapter.
@@ -22,6 +27,9 @@ class MCPAdapt():
             serverparams (StdioServerParameters | dict[str, Any] | list[StdioServerParameters | dict[str, Any]]):
                 MCP server parameters (stdio or sse). Can be a list if you want to connect multiple MCPs at once.
             adapter (ToolAdapter): Adapter to use to convert MCP tools call into agentic framework tools.
+            pool_size (int): Number of persistent sessions kept to the MCP servers.
+            cache (MCPToolsCache, optional): Cache of the tool definitions. When it holds a fresh
+                snapshot, no server is contacted until a tool is called.
             connect_timeout (int): Connection timeout in seconds to the mcp server (default is 30s).
             client_session_timeout_seconds: Timeout for MCP ClientSession calls
 
@@ -35,7 +43,8 @@ class MCPAdapt():
         self.config = config
         self.adapter = adapter
 
-        self.client = Client(config)
+        self.cache = cache
+        self.session = MCPSession(config, pool_size=pool_size, message_handler=self._handle_message)
 
     async def tools(self):
         """Returns the tools from the MCP server adapted to the desired Agent framework.
@@ -49,11 +58,18 @@ class MCPAdapt():
         see :meth:`atools`.
 
         """
-        async with self.client as client:
-            mcp_tools = await client.list_tools()
+        tool_definitions = self.cache.load(self.config) if self.cache is not None else None
+        if tool_definitions is None:
+            mcp_tools = await self.session.list_tools()
+            tool_definitions = [tool.model_dump(mode="json", exclude_none=True) for tool in mcp_tools]
+            if self.cache is not None:
+                self.cache.save(self.config, tool_definitions)
+
+        # Fresh objects, the adapter sanitizes the input schemas in place
+        mcp_tools = [mcp_types.Tool.model_validate(definition) for definition in tool_definitions]
 
         mcp_tools = await asyncio.gather(*[
-            self.adapter.adapt(client, tool)
+            self.adapter.adapt(self.session, tool)
             for tool in mcp_tools
         ])
 
@@ -64,6 +80,17 @@ class MCPAdapt():
 
         return mcp_tools
 
+    async def _handle_message(self, message):
+        # A server notified that its tools changed, the next discovery must ask the servers again
+        root = getattr(message, "root", message)
+        if isinstance(root, mcp_types.ToolListChangedNotification) and self.cache is not None:
+            logger.info("| MCP tool list changed, invalidating the cached tool definitions.")
+            self.cache.invalidate(self.config)
+
+    async def close(self):
+        """Close the MCP sessions, the adapted tools cannot be called afterwards."""
+        await self.session.close()
+
 async def main():
     config = {
         "mcpServers": {
@@ -87,6 +114,8 @@ async def main():
         print(f"Tool Description: {tool.description}")
         print("-" * 40)
 
+    await mcpadapt.close()
+
 
 if __name__ == "__main__":
     import asyncio
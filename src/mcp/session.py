@@ -0,0 +1,132 @@
+"""Long-lived MCP client sessions.
+
+`fastmcp.Client` connects in `__aenter__` and disconnects in `__aexit__`, so wrapping every call in
+`async with client:` launches (for stdio servers) and tears down a server process per call. This
+module keeps the connections open for the lifetime of the session manager instead.
+"""
+import asyncio
+import itertools
+from typing import Any, Callable, Dict, List, Optional
+
+from fastmcp import Client
+from fastmcp.exceptions import ToolError
+
+from src.logger import logger
+
+
+class _Connection():
+    """One connected client, owned by a background task.
+
+    The task enters and exits the client context itself, so the transport's cancel scopes are always
+    exited by the task that entered them, whichever task makes the calls.
+    """
+
+    def __init__(self, config: Dict[str, Any], message_handler: Optional[Callable] = None):
+        if message_handler is None:
+            self.client = Client(config)
+        else:
+            self.client = Client(config, message_handler=message_handler)
+        self._stop = asyncio.Event()
+        self._ready = asyncio.get_running_loop().create_future()
+        self._task = asyncio.create_task(self._run())
+
+    async def _run(self):
+        try:
+            async with self.client:
+                self._ready.set_result(None)
+                await self._stop.wait()
+        except Exception as e:
+            if not self._ready.done():
+                self._ready.set_exception(e)
+            else:
+                logger.warning(f"| MCP connection closed with error: {e}")
+
+    async def wait_ready(self, timeout: float):
+        await asyncio.wait_for(asyncio.shield(self._ready), timeout=timeout)
+
+    def alive(self) -> bool:
+        return not self._task.done() and self.client.is_connected()
+
+    async def close(self):
+        self._stop.set()
+        if not self._ready.done():
+            # Still connecting, e.g. after a connection timeout
+            self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+
+
+class MCPSession():
+    def __init__(self,
+                 config: Dict[str, Any],
+                 pool_size: int = 1,
+                 connect_timeout: float = 30,
+                 message_handler: Optional[Callable] = None,
+                 ):
+        """
+        Keep `pool_size` connected sessions to the MCP servers of `config` and spread calls over them.
+
+        A single session already multiplexes concurrent in-flight requests; a larger pool only helps
+        when a server handles requests serially. Broken connections are re-established on the next
+        call, and a call that failed because its connection dropped is retried once.
+
+        Args:
+            config (Dict[str, Any]): The MCP servers config, as accepted by `fastmcp.Client`.
+            pool_size (int): The number of connections to keep.
+            connect_timeout (float): Connection timeout in seconds.
+            message_handler (Callable, optional): Receives the server notifications of every connection.
+        """
+        self.config = config
+        self.pool_size = max(1, pool_size)
+        self.connect_timeout = connect_timeout
+        self.message_handler = message_handler
+
+        self._connections: List[Optional[_Connection]] = [None] * self.pool_size
+        self._locks = None
+        self._next_slot = itertools.cycle(range(self.pool_size))
+
+    async def _get_connection(self, slot: int) -> _Connection:
+        if self._locks is None:
+            self._locks = [asyncio.Lock() for _ in range(self.pool_size)]
+
+        async with self._locks[slot]:
+            connection = self._connections[slot]
+            if connection is not None and connection.alive():
+                return connection
+            if connection is not None:
+                logger.warning(f"| MCP connection {slot} lost, reconnecting.")
+                await connection.close()
+
+            connection = _Connection(self.config, message_handler=self.message_handler)
+            try:
+                await connection.wait_ready(self.connect_timeout)
+            except BaseException:
+                await connection.close()
+                raise
+            self._connections[slot] = connection
+            return connection
+
+    async def _request(self, method: str, *args, **kwargs):
+        slot = next(self._next_slot)
+        connection = await self._get_connection(slot)
+        try:
+            return await getattr(connection.client, method)(*args, **kwargs)
+        except ToolError:
+            raise
+        except Exception:
+            if connection.alive():
+                raise
+            # The connection dropped during the call, retry once on a new one
+            connection = await self._get_connection(slot)
+            return await getattr(connection.client, method)(*args, **kwargs)
+
+    async def list_tools(self):
+        return await self._request("list_tools")
+
+    async def call_tool(self, name: str, arguments: Optional[Dict[str, Any]] = None):
+        return await self._request("call_tool", name=name, arguments=arguments or {})
+
+    async def close(self):
+        """Disconnect every session, stopping the stdio server processes."""
+        connections = [connection for connection in self._connections if connection is not None]
+        self._connections = [None] * self.pool_size
+        await asyncio.gather(*[connection.close() for connection in connections], return_exceptions=True)
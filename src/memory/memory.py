@@ -100,6 +100,7 @@ class ActionStep(MemoryStep):
                         {
                             "type": "image",
                             "image": image,
+                            "observation": True,  # downscaled and deduplicated by the message manager
                         }
                         for image in self.observations_images
                     ],
@@ -1,5 +1,11 @@
-from src.metric.gaia_scorer import question_scorer
+from src.metric.gaia_scorer import question_scorer, batch_question_scorer
+from src.metric.analytics import load_results, score_results, summarize_results, compare_results
 
 __all__ = [
     "question_scorer",
-]
\ No newline at end of file
+    "batch_question_scorer",
+    "load_results",
+    "score_results",
+    "summarize_results",
+    "compare_results",
+]
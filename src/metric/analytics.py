@@ -0,0 +1,141 @@
+"""Accuracy, latency and token breakdowns of result files.
+
+The latest record of every task is read from a `ResultsStore` in one sequential pass, the answers are scored in
+batch and the breakdowns are pandas aggregations, so comparing configs over tens of thousands of results takes
+seconds. Run as a module to print the breakdowns of result files:
+
+    python -m src.metric.analytics workdir/gaia/dra.jsonl workdir/gaia_o3/dra.jsonl
+"""
+import re
+import argparse
+from typing import Dict, List, Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+from src.metric.gaia_scorer import batch_question_scorer
+from src.utils.results_store import ResultsStore
+
+# Token usage of a memory step in the `intermediate_steps` of records written before `token_usage` was recorded
+_TOKEN_USAGE_PATTERN = re.compile(r"input_tokens=(\d+), output_tokens=(\d+)")
+
+RESULT_COLUMNS = ["task_id", "level", "prediction", "true_answer", "start_time", "end_time", "agent_error",
+                  "input_tokens", "output_tokens"]
+
+TIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
+def _token_counts(record: dict):
+    token_usage = record.get("token_usage")
+    if token_usage:
+        return token_usage.get("input_tokens"), token_usage.get("output_tokens")
+    input_tokens = output_tokens = 0
+    found = False
+    for step in record.get("intermediate_steps") or []:
+        for match in _TOKEN_USAGE_PATTERN.finditer(str(step)):
+            input_tokens += int(match.group(1))
+            output_tokens += int(match.group(2))
+            found = True
+    return (input_tokens, output_tokens) if found else (None, None)
+
+
+def load_results(store: Union[str, ResultsStore]) -> pd.DataFrame:
+    """One row per task with the columns of `RESULT_COLUMNS`, from the latest records of a result file."""
+    if isinstance(store, str):
+        store = ResultsStore(store)
+    rows = []
+    for record in store.records():
+        input_tokens, output_tokens = _token_counts(record)
+        rows.append((record.get("task_id"),
+                     record.get("task"),
+                     record.get("prediction"),
+                     record.get("true_answer"),
+                     record.get("start_time"),
+                     record.get("end_time"),
+                     record.get("agent_error"),
+                     input_tokens,
+                     output_tokens))
+    results = pd.DataFrame(rows, columns=RESULT_COLUMNS)
+    results[["input_tokens", "output_tokens"]] = results[["input_tokens", "output_tokens"]].astype(float)
+    return results
+
+
+def score_results(results: pd.DataFrame, dataset: Optional[str] = None) -> pd.DataFrame:
+    """
+    Add the columns `answered`, `correct` and `latency` (seconds) to `load_results` rows.
+
+    Missing and "Unable to determine" predictions are not answered and count as wrong. `correct` is NaN for tasks
+    without a ground truth.
+    """
+    results = results.copy()
+    predictions = results["prediction"]
+    results["answered"] = predictions.notna() & (predictions.astype(str) != "Unable to determine")
+
+    truths = results["true_answer"]
+    scorable = truths.notna() & (truths.astype(str) != "?")
+    correct = np.full(len(results), np.nan)
+    correct[scorable.to_numpy()] = 0.0
+    to_score = (scorable & results["answered"]).to_numpy()
+    if to_score.any():
+        correct[to_score] = batch_question_scorer(predictions[to_score].tolist(),
+                                                  truths[to_score].tolist(),
+                                                  dataset=dataset)
+    results["correct"] = correct
+
+    start = pd.to_datetime(results["start_time"], format=TIME_FORMAT, errors="coerce")
+    end = pd.to_datetime(results["end_time"], format=TIME_FORMAT, errors="coerce")
+    results["latency"] = (end - start).dt.total_seconds()
+    return results
+
+
+def summarize_results(results: pd.DataFrame) -> pd.DataFrame:
+    """Accuracy, latency and token breakdowns of `score_results` rows, per level and over all tasks ("all")."""
+    results = results.assign(level=results["level"].astype(str),
+                             total_tokens=results["input_tokens"] + results["output_tokens"])
+
+    def aggregate(groups) -> pd.DataFrame:
+        return groups.agg(
+            tasks=("task_id", "size"),
+            answered=("answered", "sum"),
+            correct=("correct", "sum"),
+            accuracy=("correct", "mean"),
+            latency_mean=("latency", "mean"),
+            latency_p50=("latency", "median"),
+            latency_p90=("latency", lambda latency: latency.quantile(0.9)),
+            input_tokens_mean=("input_tokens", "mean"),
+            output_tokens_mean=("output_tokens", "mean"),
+            total_tokens=("total_tokens", "sum"),
+        )
+
+    per_level = aggregate(results.groupby("level", sort=True))
+    overall = aggregate(results.assign(level="all").groupby("level"))
+    return pd.concat([per_level, overall])
+
+
+def compare_results(paths: Union[Sequence[str], Dict[str, str]], dataset: Optional[str] = None) -> pd.DataFrame:
+    """
+    Breakdowns of several result files side by side, indexed by (name, level).
+
+    Args:
+        paths (Sequence[str] or Dict[str, str]): The result files, or their names and result files.
+        dataset (str, optional): Name under which the normalized ground truths are cached.
+    """
+    if not isinstance(paths, dict):
+        paths = {path: path for path in paths}
+    summaries = {name: summarize_results(score_results(load_results(path), dataset=dataset))
+                 for name, path in paths.items()}
+    return pd.concat(summaries, names=["name", "level"])
+
+
+def main(args: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Accuracy, latency and token breakdowns of result files.")
+    parser.add_argument("paths", nargs="+", help="result files (jsonl)")
+    parser.add_argument("--dataset", default=None, help="dataset name, to cache its normalized ground truths")
+    args = parser.parse_args(args)
+
+    with pd.option_context("display.max_rows", None, "display.width", 200, "display.float_format", "{:.3f}".format):
+        print(compare_results(args.paths, dataset=args.dataset))
+
+
+if __name__ == '__main__':
+    main()
@@ -1,6 +1,15 @@
 import re
 import string
 import warnings
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+_LIST_SEPARATOR_PATTERN = re.compile(r"[,;]")
+_WHITESPACE_PATTERN = re.compile(r"\s")
+_PUNCTUATION_TABLE = str.maketrans("", "", string.punctuation)
 
 
 def normalize_number_str(number_str: str) -> float:
@@ -19,6 +28,8 @@ def split_string(
     s: str,
     char_list: list[str] = [",", ";"],
 ) -> list[str]:
+    if char_list == [",", ";"]:
+        return _LIST_SEPARATOR_PATTERN.split(s)
     pattern = f"[{''.join(char_list)}]"
     return re.split(pattern, s)
 
@@ -114,11 +125,109 @@ def normalize_str(input_str, remove_punct=True) -> str:
     - str, the normalized string
     """
     # Remove all white spaces. Required e.g for seagull vs. sea gull
-    no_spaces = re.sub(r"\s", "", input_str)
+    no_spaces = _WHITESPACE_PATTERN.sub("", input_str)
 
     # Remove punctuation, if specified.
     if remove_punct:
-        translator = str.maketrans("", "", string.punctuation)
-        return no_spaces.lower().translate(translator)
+        return no_spaces.lower().translate(_PUNCTUATION_TABLE)
     else:
         return no_spaces.lower()
+
+
+def _parse_number(number_str: str) -> float:
+    """`float` of an already cleaned number string, inf if it is not a number, without printing."""
+    try:
+        return float(number_str)
+    except ValueError:
+        return float("inf")
+
+
+@dataclass
+class NormalizedTruth():
+    kind: str  # "number", "list" or "string", the branches of `question_scorer`
+    number: float = float("nan")
+    text: str = ""
+    elements: List[Tuple[bool, Union[float, str]]] = field(default_factory=list)  # (is number, value) of a list
+
+
+def normalize_ground_truth(ground_truth: str) -> NormalizedTruth:
+    if is_float(ground_truth):
+        return NormalizedTruth(kind="number", number=float(ground_truth))
+    if any(char in ground_truth for char in [",", ";"]):
+        elements = [(True, float(element)) if is_float(element) else (False, normalize_str(element, remove_punct=False))
+                    for element in split_string(ground_truth)]
+        return NormalizedTruth(kind="list", elements=elements)
+    return NormalizedTruth(kind="string", text=normalize_str(ground_truth))
+
+
+# Normalized ground truths of every dataset, by ground truth
+_NORMALIZED_TRUTHS: Dict[str, Dict[str, NormalizedTruth]] = {}
+
+
+def normalize_ground_truths(ground_truths: Sequence[str], dataset: Optional[str] = None) -> List[NormalizedTruth]:
+    """Normalize the ground truths, each distinct one once and once per process for a named `dataset`."""
+    cache = _NORMALIZED_TRUTHS.setdefault(dataset or "", {})
+    normalized = []
+    for ground_truth in ground_truths:
+        truth = cache.get(ground_truth)
+        if truth is None:
+            truth = cache[ground_truth] = normalize_ground_truth(ground_truth)
+        normalized.append(truth)
+    return normalized
+
+
+def _score_list(model_answer: str, truth: NormalizedTruth) -> bool:
+    ma_elems = split_string(model_answer)
+    if len(ma_elems) != len(truth.elements):
+        return False
+    for ma_elem, (is_number, value) in zip(ma_elems, truth.elements):
+        if is_number:
+            if _parse_number(ma_elem.replace("$", "").replace("%", "").replace(",", "")) != value:
+                return False
+        elif normalize_str(ma_elem, remove_punct=False) != value:
+            return False
+    return True
+
+
+def batch_question_scorer(
+    model_answers: Sequence[str],
+    ground_truths: Sequence[str],
+    dataset: Optional[str] = None,
+) -> np.ndarray:
+    """
+    Score many answers at once, with the same results as `question_scorer` on every pair but without its messages.
+
+    Numbers and strings are normalized in column-wise passes over all answers, only list answers are compared one
+    by one.
+
+    Args:
+        model_answers (Sequence[str]): The predictions.
+        ground_truths (Sequence[str]): The true answers, in the same order.
+        dataset (str, optional): Name under which the normalized ground truths are cached, e.g. "gaia".
+
+    Returns:
+        np.ndarray: Whether each answer is correct.
+    """
+    if len(model_answers) != len(ground_truths):
+        raise ValueError(f"Got {len(model_answers)} answers for {len(ground_truths)} ground truths.")
+    answers = pd.Series([str(answer) for answer in model_answers], dtype=object)
+    truths = normalize_ground_truths([str(truth) for truth in ground_truths], dataset=dataset)
+    kinds = np.array([truth.kind for truth in truths], dtype=object)
+    scores = np.zeros(len(truths), dtype=bool)
+
+    numbers = kinds == "number"
+    if numbers.any():
+        values = answers[numbers].str.replace(r"[$%,]", "", regex=True).map(_parse_number).to_numpy(dtype=float)
+        expected = np.array([truth.number for truth, is_number in zip(truths, numbers) if is_number], dtype=float)
+        scores[numbers] = values == expected
+
+    strings = kinds == "string"
+    if strings.any():
+        texts = answers[strings].str.replace(r"\s", "", regex=True).str.lower().str.translate(_PUNCTUATION_TABLE)
+        expected = np.array([truth.text for truth, is_string in zip(truths, strings) if is_string], dtype=object)
+        scores[strings] = texts.to_numpy(dtype=object) == expected
+
+    for index in np.flatnonzero(kinds == "list"):
+        scores[index] = _score_list(answers.iat[index], truths[index])
+
+    return scores
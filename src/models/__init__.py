@@ -1,19 +1,23 @@
-from .base import (
-                  ChatMessage,
-                  ChatMessageStreamDelta,
-                  ChatMessageToolCall,
-                  MessageRole,
-                  Model,
-                  parse_json_if_needed,
-                  agglomerate_stream_deltas,
-                  CODEAGENT_RESPONSE_FORMAT,
-                  )
-from .litellm import LiteLLMModel
-from .openaillm import OpenAIServerModel
-from .models import ModelManager
-from .message_manager import MessageManager
+from src.utils.lazy_utils import lazy_exports
 
-model_manager = ModelManager()
+# Model backends are imported on first use, e.g. `LiteLLMModel` imports litellm when it is called
+_EXPORTS = {
+    "ChatMessage": ".base",
+    "ChatMessageStreamDelta": ".base",
+    "ChatMessageToolCall": ".base",
+    "MessageRole": ".base",
+    "Model": ".base",
+    "parse_json_if_needed": ".base",
+    "agglomerate_stream_deltas": ".base",
+    "CODEAGENT_RESPONSE_FORMAT": ".base",
+    "LiteLLMModel": ".litellm",
+    "OpenAIServerModel": ".openaillm",
+    "ModelManager": ".models",
+    "model_manager": ".models",
+    "MessageManager": ".message_manager",
+}
+
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
 
 __all__ = [
     "Model",
@@ -25,4 +29,4 @@ __all__ = [
     "model_manager",
     "ModelManager",
     "MessageManager",
-]
\ No newline at end of file
+]
@@ -2,7 +2,7 @@ from typing import Dict, List, Optional, Any
 from copy import deepcopy
 
 from src.models.base import MessageRole, ChatMessage
-from src.utils import encode_image_base64, make_image_url
+from src.utils import encode_image_base64, make_image_url, ObservationImageEncoder
 
 DEFAULT_ANTHROPIC_MODELS = [
     'claude37-sonnet',
@@ -18,10 +18,54 @@ UNSUPPORTED_TOOL_CHOICE_MODELS = [
     'claude37-sonnet',
 ]
 
+UNCHANGED_IMAGE_TEXT = "[Image unchanged from the previous one, omitted]"
+
+# Shared by every model, so the encodings cached on an image are reused whichever model sees it
+DEFAULT_IMAGE_ENCODER = ObservationImageEncoder()
+
+
 class MessageManager():
-    def __init__(self, model_id: str, api_type: str = "chat/completions"):
+    def __init__(self,
+                 model_id: str,
+                 api_type: str = "chat/completions",
+                 image_encoder: Optional[ObservationImageEncoder] = None):
         self.model_id = model_id
         self.api_type = api_type
+        self.image_encoder = image_encoder or DEFAULT_IMAGE_ENCODER
+
+    def _copy_message_list(self, message_list: list[ChatMessage]) -> list[ChatMessage]:
+        """Deep copy the messages but not their images, which are never modified and carry cached encodings."""
+        memo = {}
+        for message in message_list:
+            if isinstance(message.content, list):
+                for element in message.content:
+                    if isinstance(element, dict) and element.get("type") == "image":
+                        memo[id(element["image"])] = element["image"]
+        return deepcopy(message_list, memo)
+
+    def _convert_image(self,
+            element: dict[str, Any],
+            previous_image: Any,
+            convert_images_to_image_urls: bool,
+    ) -> dict[str, Any]:
+        """
+        Encode an image element. Observation images (see `ActionStep.to_messages`) go through the image encoder and
+        are replaced by a short text when they show the same as the previous observation image, other images, e.g.
+        task and tool attachments, are sent unchanged.
+        """
+        image = element["image"]
+        if not element.get("observation"):
+            if convert_images_to_image_urls:
+                return {"type": "image_url", "image_url": {"url": make_image_url(encode_image_base64(image))}}
+            return {"type": "image", "image": encode_image_base64(image)}
+        if self.image_encoder.is_duplicate(image, previous_image):
+            return {"type": "text", "text": UNCHANGED_IMAGE_TEXT}
+        if convert_images_to_image_urls:
+            base64_image, mime_type = self.image_encoder.encode(image)
+            return {"type": "image_url", "image_url": {"url": make_image_url(base64_image, mime_type)}}
+        # Without a url the mime type is implied, keep png
+        base64_image, _ = self.image_encoder.encode(image, image_format="PNG")
+        return {"type": "image", "image": base64_image}
 
     def get_clean_message_list(self,
             message_list: list[ChatMessage],
@@ -60,7 +104,8 @@ class MessageManager():
         Creates a list of messages in chat completions format.
         """
         output_message_list: list[dict[str, Any]] = []
-        message_list = deepcopy(message_list)  # Avoid modifying the original list
+        message_list = self._copy_message_list(message_list)  # Avoid modifying the original list
+        previous_image = None
         for message in message_list:
             role = message.role
             if role not in MessageRole.roles():
@@ -70,19 +115,15 @@ class MessageManager():
                 message.role = role_conversions[role]  # type: ignore
             # encode images if needed
             if isinstance(message.content, list):
-                for element in message.content:
+                for index, element in enumerate(message.content):
                     assert isinstance(element, dict), "Error: this element should be a dict:" + str(element)
                     if element["type"] == "image":
                         assert not flatten_messages_as_text, f"Cannot use images with {flatten_messages_as_text=}"
-                        if convert_images_to_image_urls:
-                            element.update(
-                                {
-                                    "type": "image_url",
-                                    "image_url": {"url": make_image_url(encode_image_base64(element.pop("image")))},
-                                }
-                            )
-                        else:
-                            element["image"] = encode_image_base64(element["image"])
+                        message.content[index] = self._convert_image(
+                            element, previous_image, convert_images_to_image_urls
+                        )
+                        if element.get("observation"):
+                            previous_image = element["image"]
 
             if len(output_message_list) > 0 and message.role == output_message_list[-1]["role"]:
                 assert isinstance(message.content, list), "Error: wrong content:" + str(message.content)
@@ -118,8 +159,9 @@ class MessageManager():
         Creates a list of messages in responses format (OpenAI responses API).
         """
         output_message_list: list[dict[str, Any]] = []
-        message_list = deepcopy(message_list)  # Avoid modifying the original list
-        
+        message_list = self._copy_message_list(message_list)  # Avoid modifying the original list
+        previous_image = None
+
         for message in message_list:
             role = message.role
             if role not in MessageRole.roles():
@@ -137,16 +179,11 @@ class MessageManager():
                     
                     if element["type"] == "image":
                         assert not flatten_messages_as_text, f"Cannot use images with {flatten_messages_as_text=}"
-                        if convert_images_to_image_urls:
-                            processed_content.append({
-                                "type": "image_url",
-                                "image_url": {"url": make_image_url(encode_image_base64(element.pop("image")))},
-                            })
-                        else:
-                            processed_content.append({
-                                "type": "image",
-                                "image": encode_image_base64(element["image"])
-                            })
+                        processed_content.append(
+                            self._convert_image(element, previous_image, convert_images_to_image_urls)
+                        )
+                        if element.get("observation"):
+                            previous_image = element["image"]
                     elif element["type"] == "text":
                         processed_content.append(element)
                     else:
@@ -1,34 +1,76 @@
 import os
-from openai import OpenAI, AsyncOpenAI
-from typing import Dict, Any, Tuple
-
-from dotenv import load_dotenv
-load_dotenv(verbose=True)
-
-from langchain_openai import ChatOpenAI
+from functools import lru_cache
+from collections.abc import MutableMapping
+from typing import Dict, Any, Callable, Iterable, Iterator, Optional
 
 from src.logger import logger
-from src.models.litellm import LiteLLMModel
-from src.models.openaillm import OpenAIServerModel
-from src.models.hfllm import InferenceClientModel
-from src.models.restful import (RestfulModel,
-                                RestfulTranscribeModel,
-                                RestfulImagenModel,
-                                RestfulVeoPridictModel,
-                                RestfulVeoFetchModel,
-                                RestfulResponseModel)
 from src.utils import Singleton
-from src.proxy.local_proxy import HTTP_CLIENT, ASYNC_HTTP_CLIENT
 
 custom_role_conversions = {"tool-call": "assistant", "tool-response": "user"}
 PLACEHOLDER = "PLACEHOLDER"
 
 
+class ModelRegistry(MutableMapping):
+    """
+    Models by name, each built by its factory on first access.
+
+    Registering a model only records how to build it, so the clients, HTTP connection pools and backend
+    modules of the models a run never uses are never created or imported. Membership tests and `keys()`
+    cover every registered model without building any.
+    """
+
+    def __init__(self):
+        self._factories: Dict[str, Callable[[], Any]] = {}
+        self._models: Dict[str, Any] = {}
+
+    def register(self, name: str, factory: Callable[[], Any]) -> None:
+        """Register the factory of a model, replacing any model registered under the same name."""
+        self._factories[name] = factory
+        self._models.pop(name, None)
+
+    def is_built(self, name: str) -> bool:
+        return name in self._models
+
+    def __getitem__(self, name: str) -> Any:
+        if name not in self._models:
+            if name not in self._factories:
+                raise KeyError(name)
+            logger.info(f"| Building model {name}")
+            self._models[name] = self._factories[name]()
+        return self._models[name]
+
+    def __setitem__(self, name: str, model: Any) -> None:
+        self._models[name] = model
+
+    def __delitem__(self, name: str) -> None:
+        if name not in self._models and name not in self._factories:
+            raise KeyError(name)
+        self._models.pop(name, None)
+        self._factories.pop(name, None)
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._models or name in self._factories
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(dict.fromkeys([*self._factories, *self._models]))
+
+    def __len__(self) -> int:
+        return len(set(self._factories) | set(self._models))
+
+
 class ModelManager(metaclass=Singleton):
     def __init__(self):
-        self.registed_models: Dict[str, Any] = {}
-        
-    def init_models(self, use_local_proxy: bool = False):
+        self.registed_models: ModelRegistry = ModelRegistry()
+
+    def init_models(self, use_local_proxy: bool = False, model_ids: Optional[Iterable[str]] = None):
+        """
+        Register the models, they are built on first access to `registed_models`.
+
+        Args:
+            use_local_proxy (bool): Use the locally hosted endpoints.
+            model_ids (Iterable[str], optional): The models the run uses (see `src.agent.get_used_model_ids`),
+                they are built now so that a misconfigured model fails at startup rather than mid-run.
+        """
         self._register_openai_models(use_local_proxy=use_local_proxy)
         self._register_anthropic_models(use_local_proxy=use_local_proxy)
         self._register_google_models(use_local_proxy=use_local_proxy)
@@ -37,6 +79,12 @@ class ModelManager(metaclass=Singleton):
         self._register_vllm_models(use_local_proxy=use_local_proxy)
         self._register_deepseek_models(use_local_proxy=use_local_proxy)
 
+        for model_id in model_ids or []:
+            if model_id not in self.registed_models:
+                logger.warning(f"| Model '{model_id}' is used by the config but is not registered.")
+            else:
+                self.registed_models[model_id]
+
     def _check_local_api_key(
         self,
         local_api_key_name: str,
@@ -95,31 +143,48 @@ class ModelManager(metaclass=Singleton):
     def _register_openai_models(self, use_local_proxy: bool = False):
         # gpt-4o, gpt-4.1, o1, o3, gpt-4o-search-preview
         if use_local_proxy:
-            logger.info("Using locally hosted OpenAI-compatible models")
-            api_key = self._check_local_api_key(
-                local_api_key_name="LOCAL_OPENAI_API_KEY",
-                remote_api_key_name="OPENAI_API_KEY",
-                default="local-dev-key",
-            )
-            api_base = self._check_local_api_base(
-                local_api_base_name="LOCAL_OPENAI_API_BASE",
-                remote_api_base_name="OPENAI_API_BASE",
-                default="http://ripper.lan:8000/v1",
-            )
 
-            default_chat_model_id = os.getenv("LOCAL_OPENAI_CHAT_MODEL_ID", "local-openai")
-            default_reasoner_model_id = os.getenv(
-                "LOCAL_OPENAI_REASONER_MODEL_ID", default_chat_model_id
-            )
-            default_responses_model_id = os.getenv(
-                "LOCAL_OPENAI_DEEP_RESEARCH_MODEL_ID", default_reasoner_model_id
-            )
+            @lru_cache(maxsize=None)
+            def settings() -> Dict[str, Any]:
+                # Resolved once, by the first OpenAI model built
+                logger.info("Using locally hosted OpenAI-compatible models")
+                api_key = self._check_local_api_key(
+                    local_api_key_name="LOCAL_OPENAI_API_KEY",
+                    remote_api_key_name="OPENAI_API_KEY",
+                    default="local-dev-key",
+                )
+                api_base = self._check_local_api_base(
+                    local_api_base_name="LOCAL_OPENAI_API_BASE",
+                    remote_api_base_name="OPENAI_API_BASE",
+                    default="http://ripper.lan:8000/v1",
+                )
 
-            shared_async_client = AsyncOpenAI(
-                api_key=api_key,
-                base_url=api_base,
-                http_client=ASYNC_HTTP_CLIENT,
-            )
+                default_chat_model_id = os.getenv("LOCAL_OPENAI_CHAT_MODEL_ID", "local-openai")
+                default_reasoner_model_id = os.getenv(
+                    "LOCAL_OPENAI_REASONER_MODEL_ID", default_chat_model_id
+                )
+                default_responses_model_id = os.getenv(
+                    "LOCAL_OPENAI_DEEP_RESEARCH_MODEL_ID", default_reasoner_model_id
+                )
+
+                return dict(
+                    api_key=api_key,
+                    api_base=api_base,
+                    default_chat_model_id=default_chat_model_id,
+                    default_reasoner_model_id=default_reasoner_model_id,
+                    default_responses_model_id=default_responses_model_id,
+                )
+
+            @lru_cache(maxsize=None)
+            def shared_async_client():
+                from openai import AsyncOpenAI
+                from src.proxy.local_proxy import ASYNC_HTTP_CLIENT
+
+                return AsyncOpenAI(
+                    api_key=settings()["api_key"],
+                    base_url=settings()["api_base"],
+                    http_client=ASYNC_HTTP_CLIENT,
+                )
 
             chat_models = [
                 {"model_name": "gpt-4o", "env": "LOCAL_GPT_4O_MODEL_ID"},
@@ -130,55 +195,73 @@ class ModelManager(metaclass=Singleton):
             ]
 
             for chat_model in chat_models:
-                model_id = os.getenv(chat_model["env"], default_chat_model_id)
-                model = LiteLLMModel(
-                    model_id=model_id,
-                    http_client=shared_async_client,
+
+                def build_chat_model(env=chat_model["env"]):
+                    from src.models.litellm import LiteLLMModel
+
+                    return LiteLLMModel(
+                        model_id=os.getenv(env, settings()["default_chat_model_id"]),
+                        http_client=shared_async_client(),
+                        custom_role_conversions=custom_role_conversions,
+                    )
+
+                self.registed_models.register(chat_model["model_name"], build_chat_model)
+
+            def build_o3_model():
+                from src.models.restful import RestfulModel
+                from src.proxy.local_proxy import HTTP_CLIENT
+
+                return RestfulModel(
+                    api_base=settings()["api_base"],
+                    api_type="chat/completions",
+                    api_key=settings()["api_key"],
+                    model_id=os.getenv("LOCAL_O3_MODEL_ID", settings()["default_reasoner_model_id"]),
+                    http_client=HTTP_CLIENT,
                     custom_role_conversions=custom_role_conversions,
                 )
-                self.registed_models[chat_model["model_name"]] = model
-
-            reasoner_model_id = os.getenv("LOCAL_O3_MODEL_ID", default_reasoner_model_id)
-            o3_model = RestfulModel(
-                api_base=api_base,
-                api_type="chat/completions",
-                api_key=api_key,
-                model_id=reasoner_model_id,
-                http_client=HTTP_CLIENT,
-                custom_role_conversions=custom_role_conversions,
-            )
-            self.registed_models["o3"] = o3_model
-
-            whisper_model_id = os.getenv("LOCAL_WHISPER_MODEL_ID", "whisper-1")
-            whisper_model = RestfulTranscribeModel(
-                api_base=api_base,
-                api_key=api_key,
-                api_type="whisper",
-                model_id=whisper_model_id,
-                http_client=HTTP_CLIENT,
-                custom_role_conversions=custom_role_conversions,
-            )
-            self.registed_models["whisper"] = whisper_model
 
-            deep_research_model_id = os.getenv(
-                "LOCAL_O3_DEEP_RESEARCH_MODEL_ID", default_responses_model_id
-            )
-            deep_research_model = RestfulResponseModel(
-                api_base=api_base,
-                api_key=api_key,
-                api_type="responses",
-                model_id=deep_research_model_id,
-                http_client=HTTP_CLIENT,
-                custom_role_conversions=custom_role_conversions,
-            )
-            self.registed_models["o3-deep-research"] = deep_research_model
+            def build_whisper_model():
+                from src.models.restful import RestfulTranscribeModel
+                from src.proxy.local_proxy import HTTP_CLIENT
+
+                return RestfulTranscribeModel(
+                    api_base=settings()["api_base"],
+                    api_key=settings()["api_key"],
+                    api_type="whisper",
+                    model_id=os.getenv("LOCAL_WHISPER_MODEL_ID", "whisper-1"),
+                    http_client=HTTP_CLIENT,
+                    custom_role_conversions=custom_role_conversions,
+                )
+
+            def build_deep_research_model():
+                from src.models.restful import RestfulResponseModel
+                from src.proxy.local_proxy import HTTP_CLIENT
+
+                return RestfulResponseModel(
+                    api_base=settings()["api_base"],
+                    api_key=settings()["api_key"],
+                    api_type="responses",
+                    model_id=os.getenv(
+                        "LOCAL_O3_DEEP_RESEARCH_MODEL_ID", settings()["default_responses_model_id"]
+                    ),
+                    http_client=HTTP_CLIENT,
+                    custom_role_conversions=custom_role_conversions,
+                )
+
+            self.registed_models.register("o3", build_o3_model)
+            self.registed_models.register("whisper", build_whisper_model)
+            self.registed_models.register("o3-deep-research", build_deep_research_model)
             
         else:
-            logger.info("Using remote API for OpenAI models")
-            api_key = self._check_local_api_key(local_api_key_name="OPENAI_API_KEY", 
-                                                remote_api_key_name="OPENAI_API_KEY")
-            api_base = self._check_local_api_base(local_api_base_name="OPENAI_API_BASE", 
-                                                    remote_api_base_name="OPENAI_API_BASE")
+
+            @lru_cache(maxsize=None)
+            def settings() -> Dict[str, Any]:
+                logger.info("Using remote API for OpenAI models")
+                api_key = self._check_local_api_key(local_api_key_name="OPENAI_API_KEY", 
+                                                    remote_api_key_name="OPENAI_API_KEY")
+                api_base = self._check_local_api_base(local_api_base_name="OPENAI_API_BASE", 
+                                                        remote_api_base_name="OPENAI_API_BASE")
+                return dict(api_key=api_key, api_base=api_base)
             
             models = [
                 {
@@ -204,16 +287,26 @@ class ModelManager(metaclass=Singleton):
             ]
             
             for model in models:
-                model_name = model["model_name"]
-                model_id = model["model_id"]
-                model = LiteLLMModel(
-                    model_id=model_id,
-                    api_key=api_key,
-                    api_base=api_base,
-                    custom_role_conversions=custom_role_conversions,
-                )
-                self.registed_models[model_name] = model
+                self.registed_models.register(model["model_name"],
+                                              self._litellm_factory(model["model_id"], settings))
     
+    def _litellm_factory(self, model_id: str, settings: Callable[[], Dict[str, Any]],
+                         use_api_base: bool = True) -> Callable[[], Any]:
+        """Factory of a `LiteLLMModel` calling a remote API with the key (and base) resolved by `settings`."""
+
+        def build():
+            from src.models.litellm import LiteLLMModel
+
+            kwargs = dict(api_key=settings()["api_key"])
+            if use_api_base:
+                kwargs["api_base"] = settings()["api_base"]
+            return LiteLLMModel(
+                model_id=model_id,
+                custom_role_conversions=custom_role_conversions,
+                **kwargs,
+            )
+
+        return build
             
     def _register_anthropic_models(self, use_local_proxy: bool = False):
         # claude37-sonnet, claude37-sonnet-thinking
@@ -222,11 +315,15 @@ class ModelManager(metaclass=Singleton):
             return
 
         else:
-            logger.info("Using remote API for Anthropic models")
-            api_key = self._check_local_api_key(local_api_key_name="ANTHROPIC_API_KEY", 
-                                                remote_api_key_name="ANTHROPIC_API_KEY")
-            api_base = self._check_local_api_base(local_api_base_name="ANTHROPIC_API_BASE", 
-                                                    remote_api_base_name="ANTHROPIC_API_BASE")
+
+            @lru_cache(maxsize=None)
+            def settings() -> Dict[str, Any]:
+                logger.info("Using remote API for Anthropic models")
+                api_key = self._check_local_api_key(local_api_key_name="ANTHROPIC_API_KEY", 
+                                                    remote_api_key_name="ANTHROPIC_API_KEY")
+                api_base = self._check_local_api_base(local_api_base_name="ANTHROPIC_API_BASE", 
+                                                        remote_api_base_name="ANTHROPIC_API_BASE")
+                return dict(api_key=api_key, api_base=api_base)
             
             models = [
                 {
@@ -240,26 +337,23 @@ class ModelManager(metaclass=Singleton):
             ]
             
             for model in models:
-                model_name = model["model_name"]
-                model_id = model["model_id"]
-                model = LiteLLMModel(
-                    model_id=model_id,
-                    api_key=api_key,
-                    api_base=api_base,
-                    custom_role_conversions=custom_role_conversions,
-                )
-                self.registed_models[model_name] = model
+                self.registed_models.register(model["model_name"],
+                                              self._litellm_factory(model["model_id"], settings))
             
     def _register_google_models(self, use_local_proxy: bool = False):
         if use_local_proxy:
             logger.info("Local Google model endpoint not configured; skipping registration.")
             return
         else:
-            logger.info("Using remote API for Google models")
-            api_key = self._check_local_api_key(local_api_key_name="GOOGLE_API_KEY", 
-                                                remote_api_key_name="GOOGLE_API_KEY")
-            api_base = self._check_local_api_base(local_api_base_name="GOOGLE_API_BASE", 
-                                                    remote_api_base_name="GOOGLE_API_BASE")
+
+            @lru_cache(maxsize=None)
+            def settings() -> Dict[str, Any]:
+                logger.info("Using remote API for Google models")
+                api_key = self._check_local_api_key(local_api_key_name="GOOGLE_API_KEY", 
+                                                    remote_api_key_name="GOOGLE_API_KEY")
+                api_base = self._check_local_api_base(local_api_base_name="GOOGLE_API_BASE", 
+                                                        remote_api_base_name="GOOGLE_API_BASE")
+                return dict(api_key=api_key, api_base=api_base)
             
             models = [
                 {
@@ -269,15 +363,9 @@ class ModelManager(metaclass=Singleton):
             ]
             
             for model in models:
-                model_name = model["model_name"]
-                model_id = model["model_id"]
-                model = LiteLLMModel(
-                    model_id=model_id,
-                    api_key=api_key,
-                    # api_base=api_base,
-                    custom_role_conversions=custom_role_conversions,
-                )
-                self.registed_models[model_name] = model
+                self.registed_models.register(model["model_name"],
+                                              self._litellm_factory(model["model_id"], settings,
+                                                                    use_api_base=False))
                 
     def _register_qwen_models(self, use_local_proxy: bool = False):
         # qwen2.5-7b-instruct
@@ -296,14 +384,16 @@ class ModelManager(metaclass=Singleton):
             },
         ]
         for model in models:
-            model_name = model["model_name"]
-            model_id = model["model_id"]
-            
-            model = InferenceClientModel(
-                model_id=model_id,
-                custom_role_conversions=custom_role_conversions,
-            )
-            self.registed_models[model_name] = model
+
+            def build_model(model_id=model["model_id"]):
+                from src.models.hfllm import InferenceClientModel
+
+                return InferenceClientModel(
+                    model_id=model_id,
+                    custom_role_conversions=custom_role_conversions,
+                )
+
+            self.registed_models.register(model["model_name"], build_model)
 
     def _register_langchain_models(self, use_local_proxy: bool = False):
         # langchain models
@@ -323,98 +413,123 @@ class ModelManager(metaclass=Singleton):
         ]
 
         if use_local_proxy:
-            logger.info("Using locally hosted models for LangChain integrations")
-            api_key = self._check_local_api_key(local_api_key_name="LOCAL_OPENAI_API_KEY",
-                                                remote_api_key_name="OPENAI_API_KEY")
-            api_base = self._check_local_api_base(local_api_base_name="LOCAL_OPENAI_API_BASE",
-                                                    remote_api_base_name="OPENAI_API_BASE",
-                                                    default="http://ripper.lan:8000/v1")
-
-            default_chat_model_id = os.getenv("LOCAL_OPENAI_CHAT_MODEL_ID", "local-openai")
-            model_id_overrides = {
-                "langchain-gpt-4o": os.getenv("LOCAL_GPT_4O_MODEL_ID", default_chat_model_id),
-                "langchain-gpt-4.1": os.getenv("LOCAL_GPT_4_1_MODEL_ID", default_chat_model_id),
-                "langchain-o3": os.getenv("LOCAL_O3_MODEL_ID", default_chat_model_id),
+
+            @lru_cache(maxsize=None)
+            def settings() -> Dict[str, Any]:
+                logger.info("Using locally hosted models for LangChain integrations")
+                api_key = self._check_local_api_key(local_api_key_name="LOCAL_OPENAI_API_KEY",
+                                                    remote_api_key_name="OPENAI_API_KEY")
+                api_base = self._check_local_api_base(local_api_base_name="LOCAL_OPENAI_API_BASE",
+                                                        remote_api_base_name="OPENAI_API_BASE",
+                                                        default="http://ripper.lan:8000/v1")
+                return dict(api_key=api_key, api_base=api_base)
+
+            model_id_envs = {
+                "langchain-gpt-4o": "LOCAL_GPT_4O_MODEL_ID",
+                "langchain-gpt-4.1": "LOCAL_GPT_4_1_MODEL_ID",
+                "langchain-o3": "LOCAL_O3_MODEL_ID",
             }
 
             for model in models:
-                model_name = model["model_name"]
-                model_id = model_id_overrides.get(model_name, default_chat_model_id)
 
-                model = ChatOpenAI(
-                    model=model_id,
-                    api_key=api_key,
-                    base_url=api_base,
-                    http_client=HTTP_CLIENT,
-                    http_async_client=ASYNC_HTTP_CLIENT,
-                )
-                self.registed_models[model_name] = model
+                def build_model(env=model_id_envs[model["model_name"]]):
+                    from langchain_openai import ChatOpenAI
+                    from src.proxy.local_proxy import HTTP_CLIENT, ASYNC_HTTP_CLIENT
+
+                    default_chat_model_id = os.getenv("LOCAL_OPENAI_CHAT_MODEL_ID", "local-openai")
+                    return ChatOpenAI(
+                        model=os.getenv(env, default_chat_model_id),
+                        api_key=settings()["api_key"],
+                        base_url=settings()["api_base"],
+                        http_client=HTTP_CLIENT,
+                        http_async_client=ASYNC_HTTP_CLIENT,
+                    )
+
+                self.registed_models.register(model["model_name"], build_model)
 
         else:
-            logger.info("Using remote API for LangChain models")
-            api_key = self._check_local_api_key(local_api_key_name="OPENAI_API_KEY",
-                                                remote_api_key_name="OPENAI_API_KEY")
-            api_base = self._check_local_api_base(local_api_base_name="OPENAI_API_BASE",
-                                                    remote_api_base_name="OPENAI_API_BASE")
+
+            @lru_cache(maxsize=None)
+            def settings() -> Dict[str, Any]:
+                logger.info("Using remote API for LangChain models")
+                api_key = self._check_local_api_key(local_api_key_name="OPENAI_API_KEY",
+                                                    remote_api_key_name="OPENAI_API_KEY")
+                api_base = self._check_local_api_base(local_api_base_name="OPENAI_API_BASE",
+                                                        remote_api_base_name="OPENAI_API_BASE")
+                return dict(api_key=api_key, api_base=api_base)
 
             for model in models:
-                model_name = model["model_name"]
-                model_id = model["model_id"]
 
-                model = ChatOpenAI(
-                    model=model_id,
-                    api_key=api_key,
-                    base_url=api_base,
-                )
-                self.registed_models[model_name] = model
+                def build_model(model_id=model["model_id"]):
+                    from langchain_openai import ChatOpenAI
+
+                    return ChatOpenAI(
+                        model=model_id,
+                        api_key=settings()["api_key"],
+                        base_url=settings()["api_base"],
+                    )
+
+                self.registed_models.register(model["model_name"], build_model)
+
     def _register_vllm_models(self, use_local_proxy: bool = False):
         # qwen or other vLLM hosted models
-        api_key = self._check_local_api_key(
-            local_api_key_name="LOCAL_VLLM_API_KEY",
-            remote_api_key_name="QWEN_API_KEY",
-            default="local-dev-key",
-        )
-        api_base = self._check_local_api_base(
-            local_api_base_name="LOCAL_VLLM_API_BASE",
-            remote_api_base_name="QWEN_API_BASE",
-            default="http://ripper2.lan:8000/v1",
-        )
 
-        model_name = os.getenv("LOCAL_VLLM_MODEL_NAME", "local-vllm")
-        model_id = os.getenv("LOCAL_VLLM_MODEL_ID", "Qwen")
+        @lru_cache(maxsize=None)
+        def settings() -> Dict[str, Any]:
+            api_key = self._check_local_api_key(
+                local_api_key_name="LOCAL_VLLM_API_KEY",
+                remote_api_key_name="QWEN_API_KEY",
+                default="local-dev-key",
+            )
+            api_base = self._check_local_api_base(
+                local_api_base_name="LOCAL_VLLM_API_BASE",
+                remote_api_base_name="QWEN_API_BASE",
+                default="http://ripper2.lan:8000/v1",
+            )
+            return dict(api_key=api_key, api_base=api_base)
 
-        client = AsyncOpenAI(
-            api_key=api_key,
-            base_url=api_base,
-        )
-        model = OpenAIServerModel(
-            model_id=model_id,
-            http_client=client,
-            custom_role_conversions=custom_role_conversions,
-        )
-        self.registed_models[model_name] = model
+        def build_model():
+            from openai import AsyncOpenAI
+            from src.models.openaillm import OpenAIServerModel
 
-        vision_model_name = os.getenv("LOCAL_VLLM_VISION_MODEL_NAME")
-        if vision_model_name:
-            vision_model_id = os.getenv("LOCAL_VLLM_VISION_MODEL_ID", vision_model_name)
             client = AsyncOpenAI(
-                api_key=self._check_local_api_key(
-                    local_api_key_name="LOCAL_VLLM_VISION_API_KEY",
-                    remote_api_key_name="QWEN_VL_API_KEY",
-                    default=api_key,
-                ),
-                base_url=self._check_local_api_base(
-                    local_api_base_name="LOCAL_VLLM_VISION_API_BASE",
-                    remote_api_base_name="QWEN_VL_API_BASE",
-                    default=api_base,
-                ),
+                api_key=settings()["api_key"],
+                base_url=settings()["api_base"],
             )
-            model = OpenAIServerModel(
-                model_id=vision_model_id,
+            return OpenAIServerModel(
+                model_id=os.getenv("LOCAL_VLLM_MODEL_ID", "Qwen"),
                 http_client=client,
                 custom_role_conversions=custom_role_conversions,
             )
-            self.registed_models[vision_model_name] = model
+
+        self.registed_models.register(os.getenv("LOCAL_VLLM_MODEL_NAME", "local-vllm"), build_model)
+
+        vision_model_name = os.getenv("LOCAL_VLLM_VISION_MODEL_NAME")
+        if vision_model_name:
+
+            def build_vision_model():
+                from openai import AsyncOpenAI
+                from src.models.openaillm import OpenAIServerModel
+
+                client = AsyncOpenAI(
+                    api_key=self._check_local_api_key(
+                        local_api_key_name="LOCAL_VLLM_VISION_API_KEY",
+                        remote_api_key_name="QWEN_VL_API_KEY",
+                        default=settings()["api_key"],
+                    ),
+                    base_url=self._check_local_api_base(
+                        local_api_base_name="LOCAL_VLLM_VISION_API_BASE",
+                        remote_api_base_name="QWEN_VL_API_BASE",
+                        default=settings()["api_base"],
+                    ),
+                )
+                return OpenAIServerModel(
+                    model_id=os.getenv("LOCAL_VLLM_VISION_MODEL_ID", vision_model_name),
+                    http_client=client,
+                    custom_role_conversions=custom_role_conversions,
+                )
+
+            self.registed_models.register(vision_model_name, build_vision_model)
 
     def _register_deepseek_models(self, use_local_proxy: bool = False):
         # deepseek models
@@ -423,3 +538,6 @@ class ModelManager(metaclass=Singleton):
             return
         else:
             logger.warning("DeepSeek models are not supported in remote API mode.")
+
+
+model_manager = ModelManager()
@@ -1,4 +1,5 @@
 import json
+import asyncio
 from typing import Dict, List, Optional, Any
 from collections.abc import Generator
 from openai.types.chat import ChatCompletion
@@ -541,6 +542,7 @@ class RestfulTranscribeModel(ApiModel):
     def generate(
         self,
         file_stream: Any,
+        raise_on_missing: bool = False,
         **kwargs,
     ) -> str:
         """
@@ -548,6 +550,8 @@ class RestfulTranscribeModel(ApiModel):
 
         Parameters:
             file_stream (Any): The file stream to transcribe.
+            raise_on_missing (bool): Raise a ValueError when the response has no text, instead of returning
+                "No transcription available.".
             **kwargs: Additional keyword arguments for the transcription request.
 
         Returns:
@@ -559,8 +563,14 @@ class RestfulTranscribeModel(ApiModel):
             **kwargs,
         )
 
+        if raise_on_missing and "text" not in response:
+            raise ValueError(f"The transcription response has no text: {str(response)[:200]}")
         return response.get("text", "No transcription available.")
 
+    async def agenerate(self, file_stream: Any, raise_on_missing: bool = False, **kwargs) -> str:
+        """`generate` in a worker thread, the client is synchronous."""
+        return await asyncio.to_thread(self.generate, file_stream, raise_on_missing, **kwargs)
+
     def __call__(self, *args, **kwargs) -> str:
         """
         Call the model with the given arguments.
@@ -1,9 +1,6 @@
 import os
 import httpx
 import contextlib
-from dotenv import load_dotenv
-
-load_dotenv(verbose=True)
 
 PROXY_URL = os.getenv('LOCAL_PROXY_BASE', None)
 
@@ -1,5 +1,55 @@
+import importlib
+from typing import Dict, Optional
+
 from mmengine.registry import Registry
 
-DATASET = Registry('dataset', locations=['src.dataset'])
-TOOL = Registry('tool', locations=['src.tools'])
-AGENT = Registry('agent', locations=['src.agent'])
\ No newline at end of file
+
+class LazyRegistry(Registry):
+    """
+    Registry importing the module that registers a name when the name is first looked up, so that building one
+    tool or agent does not import the dependencies of all of them.
+
+    Args:
+        name (str): Registry name.
+        lazy_modules (Dict[str, str]): Registered name -> module registering it.
+        **kwargs: Forwarded to `mmengine.registry.Registry`.
+    """
+
+    def __init__(self, name: str, lazy_modules: Optional[Dict[str, str]] = None, **kwargs):
+        super().__init__(name, **kwargs)
+        self.lazy_modules = dict(lazy_modules or {})
+
+    def get(self, key: str):
+        module_name = self.lazy_modules.get(key) if isinstance(key, str) else None
+        if module_name is not None and key not in self._module_dict:
+            importlib.import_module(module_name)
+        return super().get(key)
+
+
+DATASET = LazyRegistry('dataset', locations=['src.dataset'], lazy_modules={
+    'gaia_dataset': 'src.dataset.huggingface',
+    'hle_dataset': 'src.dataset.huggingface',
+})
+TOOL = LazyRegistry('tool', locations=['src.tools'], lazy_modules={
+    'deep_analyzer_tool': 'src.tools.deep_analyzer',
+    'deep_researcher_tool': 'src.tools.deep_researcher',
+    'python_interpreter_tool': 'src.tools.python_interpreter',
+    'auto_browser_use_tool': 'src.tools.auto_browser',
+    'planning_tool': 'src.tools.planning',
+    'image_generator_tool': 'src.tools.image_generator',
+    'video_generator_tool': 'src.tools.video_generator',
+    'file_reader_tool': 'src.tools.file_reader',
+    'retrieve_passages_tool': 'src.tools.passage_retriever',
+    'oai_deep_research_tool': 'src.tools.oai_deep_research',
+    'web_fetcher_tool': 'src.tools.web_fetcher',
+    'web_searcher_tool': 'src.tools.web_searcher',
+    'archive_searcher_tool': 'src.tools.archive_searcher',
+    'final_answer_tool': 'src.tools.final_answer',
+})
+AGENT = LazyRegistry('agent', locations=['src.agent'], lazy_modules={
+    'general_agent': 'src.agent.general_agent.general_agent',
+    'deep_researcher_agent': 'src.agent.deep_researcher_agent.deep_researcher_agent',
+    'deep_analyzer_agent': 'src.agent.deep_analyzer_agent.deep_analyzer_agent',
+    'planning_agent': 'src.agent.planning_agent.planning_agent',
+    'browser_use_agent': 'src.agent.browser_use_agent.browser_use_agent',
+})
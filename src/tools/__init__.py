@@ -1,14 +1,24 @@
-from src.tools.tools import Tool, ToolResult, AsyncTool, make_tool_instance
-from src.tools.deep_analyzer import DeepAnalyzerTool
-from src.tools.deep_researcher import DeepResearcherTool
-from src.tools.python_interpreter import PythonInterpreterTool
-from src.tools.auto_browser import AutoBrowserUseTool
-from src.tools.planning import PlanningTool
-from src.tools.image_generator import ImageGeneratorTool
-from src.tools.video_generator import VideoGeneratorTool
-from src.tools.file_reader import FileReaderTool
-from src.tools.oai_deep_research import OAIDeepResearchTool
+from src.utils.lazy_utils import lazy_exports
 
+# Tool modules are imported on first use, tools are registered when `TOOL.build` imports them (see src.registry)
+_EXPORTS = {
+    "Tool": "src.tools.tools",
+    "ToolResult": "src.tools.tools",
+    "AsyncTool": "src.tools.tools",
+    "make_tool_instance": "src.tools.tools",
+    "DeepAnalyzerTool": "src.tools.deep_analyzer",
+    "DeepResearcherTool": "src.tools.deep_researcher",
+    "PythonInterpreterTool": "src.tools.python_interpreter",
+    "AutoBrowserUseTool": "src.tools.auto_browser",
+    "PlanningTool": "src.tools.planning",
+    "ImageGeneratorTool": "src.tools.image_generator",
+    "VideoGeneratorTool": "src.tools.video_generator",
+    "FileReaderTool": "src.tools.file_reader",
+    "RetrievePassagesTool": "src.tools.passage_retriever",
+    "OAIDeepResearchTool": "src.tools.oai_deep_research",
+}
+
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
 
 __all__ = [
     "Tool",
@@ -23,5 +33,6 @@ __all__ = [
     "VideoGeneratorTool",
     "make_tool_instance",
     "FileReaderTool",
-    "OAIDeepResearchTool"
-]
\ No newline at end of file
+    "RetrievePassagesTool",
+    "OAIDeepResearchTool",
+]
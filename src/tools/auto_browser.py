@@ -1,14 +1,10 @@
 import os
-import subprocess
-import atexit
-import signal
-from dotenv import load_dotenv
-load_dotenv(verbose=True)
-
-from browser_use import Agent
+from browser_use import Agent, Browser
 
 from src.tools import AsyncTool, ToolResult
-from src.tools.browser import Controller
+from src.tools.browser import (Controller, get_browser_pool, close_browser_pool, get_file_server, AsyncDownloader,
+                               build_browsing_profile, apply_browsing_profile,
+                               ActionRecordStore, ActionRecorder)
 from src.utils import assemble_project_path
 from src.registry import TOOL
 from src.models import model_manager
@@ -31,39 +27,50 @@ class AutoBrowserUseTool(AsyncTool):
 
     def __init__(self,
                  model_id: str = "gpt-4.1",
+                 browser_pool_config: dict = None,
+                 browsing_profile_config: dict = None,
+                 action_replay_config: dict = None,
                  ):
+        """
+        Args:
+            model_id (str): The model driving the browser agent.
+            browser_pool_config (dict, optional): Arguments of the process-wide `BrowserPool`. When given, tasks run
+                in a fresh context of a warm pooled browser instead of launching their own browser.
+            browsing_profile_config (dict, optional): Arguments of the `BrowsingProfile` blocking heavy resources,
+                ads and trackers in every page the agent opens.
+            action_replay_config (dict, optional): `store_dir` and `replay` of the action recordings. When given,
+                the actions of every task are recorded, and a rerun of the same task answers read-only actions
+                such as `extract_content` from the recording while the pages are unchanged.
+        """
 
         super(AutoBrowserUseTool, self).__init__()
 
         self.model_id = model_id
+        self.browser_pool_config = browser_pool_config
+        self.browsing_profile = build_browsing_profile(browsing_profile_config)
+        self.action_replay_config = action_replay_config
+        self.action_record_store = None
+        if action_replay_config is not None:
+            self.action_record_store = ActionRecordStore(assemble_project_path(action_replay_config["store_dir"]))
         self.http_server_path = assemble_project_path("src/tools/browser/http_server")
         self.http_save_path = assemble_project_path("src/tools/browser/http_server/local")
         os.makedirs(self.http_save_path, exist_ok=True)
 
-        self._init_pdf_server()
-
-    def _init_pdf_server(self):
-
-        server_proc = subprocess.Popen(
-            ["python3", "-m", "http.server", "8080"],
-            cwd=self.http_server_path,
-            stdout=subprocess.DEVNULL,
-            stderr=subprocess.DEVNULL,
-            preexec_fn=None
-        )
-
-        @atexit.register
-        def shutdown_server():
-            print("Shutting down http.server...")
-            try:
-                server_proc.send_signal(signal.SIGTERM)
-                server_proc.wait(timeout=5)
-            except Exception as e:
-                print("Force killing server...")
-                server_proc.kill()
+        # The pdf viewer is served in-process on an ephemeral port, shared by every instance
+        self.file_server = get_file_server(self.http_server_path)
+        self.downloader = AsyncDownloader(os.path.join(self.http_save_path, "cache"))
 
     async def _browser_task(self, task):
-        controller = Controller(http_save_path=self.http_save_path)
+        action_recorder = None
+        if self.action_record_store is not None:
+            action_recorder = ActionRecorder(self.action_record_store,
+                                             key=f"{self.model_id}\n{task}",
+                                             replay=self.action_replay_config.get("replay", True))
+
+        controller = Controller(http_save_path=self.http_save_path,
+                                http_server_url=self.file_server.base_url,
+                                downloader=self.downloader,
+                                action_recorder=action_recorder)
 
         assert self.model_id in ['gpt-4.1'], f"Model should be in [gpt-4.1, ], but got {self.model_id}. Please check your config file."
 
@@ -74,18 +81,57 @@ class AutoBrowserUseTool(AsyncTool):
 
         model = model_manager.registed_models[model_id]
 
-        browser_agent = Agent(
-            task=task,
-            llm=model,
-            enable_memory=False,
-            controller=controller,
-            page_extraction_llm=model,
-        )
+        if self.browser_pool_config is None and self.browsing_profile is None:
+            browser_agent = Agent(
+                task=task,
+                llm=model,
+                enable_memory=False,
+                controller=controller,
+                page_extraction_llm=model,
+            )
+            history = await browser_agent.run(max_steps=50)
+        elif self.browser_pool_config is None:
+            # The profile is installed on the context before the agent opens any page
+            browser = Browser()
+            browser_context = await browser.new_context()
+            try:
+                await apply_browsing_profile(browser_context, self.browsing_profile)
+                browser_agent = Agent(
+                    task=task,
+                    llm=model,
+                    enable_memory=False,
+                    controller=controller,
+                    page_extraction_llm=model,
+                    browser=browser,
+                    browser_context=browser_context,
+                )
+                history = await browser_agent.run(max_steps=50)
+            finally:
+                await browser_context.close()
+                await browser.close()
+        else:
+            # The agent does not close an injected context, the pool closes it on release
+            browser_pool = get_browser_pool(browsing_profile=self.browsing_profile, **self.browser_pool_config)
+            async with browser_pool.context() as browser_context:
+                browser_agent = Agent(
+                    task=task,
+                    llm=model,
+                    enable_memory=False,
+                    controller=controller,
+                    page_extraction_llm=model,
+                    browser=browser_context.browser,
+                    browser_context=browser_context,
+                )
+                history = await browser_agent.run(max_steps=50)
 
-        history = await browser_agent.run(max_steps=50)
         contents = history.extracted_content()
         return "\n".join(contents)
 
+    async def close(self):
+        """Close the process-wide browser pool, so that its browsers do not outlive the run."""
+        if self.browser_pool_config is not None:
+            await close_browser_pool()
+
     async def forward(self, task: str) -> ToolResult:
         """
         Automatically browse the web and extract information based on a given task.
@@ -1,7 +1,36 @@
-from .controller import Controller
-from .cdp import CDP
+from src.utils.lazy_utils import lazy_exports
+
+# Names are imported from their module on first use, most of them import browser_use and playwright
+_EXPORTS = {
+    'Controller': '.controller',
+    'CDP': '.cdp',
+    'BrowsingProfile': '.profile',
+    'build_browsing_profile': '.profile',
+    'apply_browsing_profile': '.profile',
+    'ActionRecordStore': '.replay',
+    'ActionRecorder': '.replay',
+    'BrowserPool': '.pool',
+    'get_browser_pool': '.pool',
+    'close_browser_pool': '.pool',
+    'StaticFileServer': '.file_server',
+    'get_file_server': '.file_server',
+    'AsyncDownloader': '.downloader',
+}
+
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
 
 __all__ = [
     'Controller',
     'CDP',
-]
\ No newline at end of file
+    'BrowsingProfile',
+    'build_browsing_profile',
+    'apply_browsing_profile',
+    'ActionRecordStore',
+    'ActionRecorder',
+    'BrowserPool',
+    'get_browser_pool',
+    'close_browser_pool',
+    'StaticFileServer',
+    'get_file_server',
+    'AsyncDownloader',
+]
@@ -1,8 +1,6 @@
 import os
 import subprocess
 import requests
-from dotenv import load_dotenv
-load_dotenv(verbose=True)
 import time
 import re
 
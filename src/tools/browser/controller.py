@@ -1,6 +1,4 @@
 import os
-from dotenv import load_dotenv
-load_dotenv(verbose=True)
 import time
 import enum
 import json
@@ -38,6 +36,10 @@ from browser_use.controller.views import (
 from browser_use.utils import time_execution_sync
 from langchain_openai import ChatOpenAI
 
+from src.tools.browser.downloader import AsyncDownloader
+from src.tools.browser.page_content import PageContentCache, select_relevant_content
+from src.tools.browser.replay import ActionRecorder
+
 from src.proxy.local_proxy import PROXY_URL, proxy_env
 from src.tools import Tool, ToolResult
 from src.logger import logger
@@ -73,8 +75,20 @@ class Controller(BrowserUseController):
             exclude_actions: list[str] = [],
             output_model: type[BaseModel] | None = None,
             http_save_path: str = None,
+            http_server_url: str | None = None,
+            downloader: AsyncDownloader = None,
+            extraction_max_chars: int = 40000,
+            action_recorder: ActionRecorder | None = None,
     ):
         self.http_save_path = http_save_path
+        # The file server serving the pdf viewer and the downloads, the download action needs it
+        self.http_server_url = http_server_url.rstrip("/") if http_server_url else None
+        if downloader is None and http_save_path is not None:
+            downloader = AsyncDownloader(os.path.join(http_save_path, "cache"))
+        self.downloader = downloader
+        self.page_content_cache = PageContentCache()
+        self.extraction_max_chars = extraction_max_chars
+        self.action_recorder = action_recorder
         self.registry = Registry[Context](exclude_actions)
 
         """Register all default browser actions"""
@@ -360,16 +374,27 @@ class Controller(BrowserUseController):
                         include_in_memory=True,
                     )
 
+                if self.downloader is None or self.http_server_url is None:
+                    return ActionResult(
+                        error="❌  Downloads are not available, the controller has no file server.",
+                        include_in_memory=True,
+                    )
+
                 pdf_url = params.pdf_url
                 save_name = params.save_name if params.save_name is not None else "downloaded_file.pdf"
+                save_name = os.path.basename(save_name)
 
                 save_path = os.path.join(self.http_save_path, save_name)
 
-                # wget command to download the PDF
-                wget_command = f"wget {pdf_url} -O {save_path}"
-                os.system(wget_command)
+                try:
+                    await self.downloader.download(pdf_url, save_path)
+                except Exception as e:
+                    return ActionResult(
+                        error=f"❌  Failed to download PDF from {pdf_url}: {e}",
+                        include_in_memory=True,
+                    )
 
-                local_pdf_server_url = f"http://localhost:8080/pdf_viewer/viewer.html?file=../local/{save_name}"
+                local_pdf_server_url = f"{self.http_server_url}/pdf_viewer/viewer.html?file=../local/{urllib.parse.quote(save_name)}"
 
                 await page.goto(local_pdf_server_url)
                 await page.wait_for_selector("#viewer")
@@ -508,19 +533,18 @@ class Controller(BrowserUseController):
                 goal: str, should_strip_link_urls: bool, browser: BrowserContext, page_extraction_llm: BaseChatModel
         ):
             page = await browser.get_current_page()
-            import markdownify
 
             strip = []
             if should_strip_link_urls:
                 strip = ['a', 'img']
 
-            content = markdownify.markdownify(await page.content(), strip=strip)
+            # Cached while the page is unchanged, so extracting again with another goal skips the conversion
+            content = await self.page_content_cache.get_markdown(page, strip=strip)
 
-            # manually append iframe text into the content so it's readable by the LLM (includes cross-origin iframes)
-            for iframe in page.frames:
-                if iframe.url != page.url and not iframe.url.startswith('data:'):
-                    content += f'\n\nIFRAME {iframe.url}:\n'
-                    content += markdownify.markdownify(await iframe.content())
+            # Large pages: only send the sections that best match the goal
+            content, num_selected, num_chunks = select_relevant_content(content, goal, self.extraction_max_chars)
+            if num_selected < num_chunks:
+                logger.info(f'📄  Sending {num_selected} of {num_chunks} page sections relevant to the goal')
 
             prompt = 'Your task is to extract the content of the page. You will be given a page and a goal and you should extract all relevant information around this goal from the page. If the goal is vague, summarize the page. Respond in json format. Extraction goal: {goal}, Page: {page}'
             template = PromptTemplate(input_variables=['goal', 'page'], template=prompt)
@@ -1126,26 +1150,31 @@ class Controller(BrowserUseController):
                     # 	},
                     # 	span_type='TOOL',
                     # ):
-                    result = await self.registry.execute_action(
-                        action_name,
-                        params,
-                        browser=browser_context,
-                        page_extraction_llm=page_extraction_llm,
-                        sensitive_data=sensitive_data,
-                        available_file_paths=available_file_paths,
-                        context=context,
-                    )
+                    async def execute() -> ActionResult:
+                        result = await self.registry.execute_action(
+                            action_name,
+                            params,
+                            browser=browser_context,
+                            page_extraction_llm=page_extraction_llm,
+                            sensitive_data=sensitive_data,
+                            available_file_paths=available_file_paths,
+                            context=context,
+                        )
 
-                    # Laminar.set_span_output(result)
+                        # Laminar.set_span_output(result)
 
-                    if isinstance(result, str):
-                        return ActionResult(extracted_content=result)
-                    elif isinstance(result, ActionResult):
-                        return result
-                    elif result is None:
-                        return ActionResult()
-                    else:
-                        raise ValueError(f'Invalid action result type: {type(result)} of {result}')
+                        if isinstance(result, str):
+                            return ActionResult(extracted_content=result)
+                        elif isinstance(result, ActionResult):
+                            return result
+                        elif result is None:
+                            return ActionResult()
+                        else:
+                            raise ValueError(f'Invalid action result type: {type(result)} of {result}')
+
+                    if self.action_recorder is None:
+                        return await execute()
+                    return await self.action_recorder.run(action_name, params, browser_context, execute)
             return ActionResult()
         except Exception as e:
             raise e
\ No newline at end of file
@@ -0,0 +1,139 @@
+"""Streaming async downloader with an on-disk cache keyed by URL.
+
+Cached downloads expire after `ttl` seconds so that changed remote files are fetched again, and the oldest downloads
+are evicted past `max_cache_bytes`. Saved copies are hard links to the cached file, so a download is stored once.
+"""
+import os
+import time
+import shutil
+import asyncio
+import hashlib
+import threading
+from typing import Dict, Optional
+
+import httpx
+
+from src.logger import logger
+
+DEFAULT_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0 Safari/537.36",
+}
+
+
+class DownloadTooLarge(Exception):
+    pass
+
+
+class AsyncDownloader():
+    def __init__(self,
+                 cache_dir: str,
+                 max_bytes: Optional[int] = 200 * 1024 * 1024,
+                 timeout: float = 120,
+                 chunk_size: int = 1024 * 1024,
+                 max_cache_bytes: Optional[int] = 1024 * 1024 * 1024,
+                 ttl: Optional[float] = 24 * 3600,
+                 ):
+        """
+        Args:
+            cache_dir (str): Directory of the downloaded files, one per URL.
+            max_bytes (int, optional): Downloads larger than this are aborted. No limit if None.
+            timeout (float): Network timeout in seconds.
+            chunk_size (int): Size of the streamed chunks in bytes.
+            max_cache_bytes (int, optional): Total size of the cache, the oldest downloads are evicted past it.
+                No limit if None.
+            ttl (float, optional): Seconds a download is reused before it is fetched again. Forever if None.
+        """
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.timeout = timeout
+        self.chunk_size = chunk_size
+        self.max_cache_bytes = max_cache_bytes
+        self.ttl = ttl
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self._evict_lock = threading.Lock()
+        self.evictions = 0
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def cache_path(self, url: str) -> str:
+        return os.path.join(self.cache_dir, hashlib.sha256(url.encode("utf-8")).hexdigest())
+
+    async def fetch(self, url: str) -> str:
+        """Download `url` into the cache, unless it is already there, and return the cached file."""
+        path = self.cache_path(url)
+        lock = self._locks.setdefault(path, asyncio.Lock())
+        async with lock:
+            if self._is_fresh(path):
+                logger.info(f"| Using cached download of {url}")
+                return path
+
+            tmp_path = f"{path}.{os.getpid()}.part"
+            size = 0
+            try:
+                async with httpx.AsyncClient(follow_redirects=True,
+                                             timeout=self.timeout,
+                                             headers=DEFAULT_HEADERS) as client:
+                    async with client.stream("GET", url) as response:
+                        response.raise_for_status()
+                        length = response.headers.get("Content-Length")
+                        if self.max_bytes is not None and length is not None and int(length) > self.max_bytes:
+                            raise DownloadTooLarge(f"{url} is {length} bytes, over the limit of {self.max_bytes}")
+                        with open(tmp_path, "wb") as f:
+                            async for chunk in response.aiter_bytes(self.chunk_size):
+                                size += len(chunk)
+                                if self.max_bytes is not None and size > self.max_bytes:
+                                    raise DownloadTooLarge(f"{url} is over the limit of {self.max_bytes} bytes")
+                                f.write(chunk)
+                os.replace(tmp_path, path)
+            finally:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+            logger.info(f"| Downloaded {url} ({size} bytes)")
+        await asyncio.to_thread(self.evict, path)
+        return path
+
+    def _is_fresh(self, path: str) -> bool:
+        try:
+            downloaded = os.stat(path).st_mtime
+        except FileNotFoundError:
+            return False
+        return self.ttl is None or time.time() - downloaded < self.ttl
+
+    def evict(self, keep: Optional[str] = None) -> None:
+        """Remove expired downloads, then the oldest ones until the cache fits in `max_cache_bytes`."""
+        with self._evict_lock:
+            entries = []
+            for name in os.listdir(self.cache_dir):
+                path = os.path.join(self.cache_dir, name)
+                if name.endswith(".part") or path == keep:
+                    continue
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+            entries.sort()
+            size = sum(entry_size for _, entry_size, _ in entries)
+            if keep is not None and os.path.exists(keep):
+                size += os.path.getsize(keep)
+            now = time.time()
+            for mtime, entry_size, path in entries:
+                expired = self.ttl is not None and now - mtime >= self.ttl
+                if not expired and (self.max_cache_bytes is None or size <= self.max_cache_bytes):
+                    break
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+                size -= entry_size
+                self.evictions += 1
+
+    async def download(self, url: str, save_path: str) -> str:
+        """Download `url` to `save_path` through the cache, as a hard link to the cached file when possible."""
+        path = await self.fetch(url)
+        if os.path.exists(save_path):
+            os.remove(save_path)
+        try:
+            os.link(path, save_path)
+        except OSError:
+            await asyncio.to_thread(shutil.copyfile, path, save_path)
+        return save_path
@@ -0,0 +1,75 @@
+"""Embedded static file server for the pdf/video viewers.
+
+The viewers are served over http from a directory of the project. The server runs in a daemon thread of the current
+process and binds an ephemeral port, so several tools and processes can run side by side without a port clash and
+nothing blocks the event loop.
+"""
+import threading
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict
+
+from src.logger import logger
+
+
+class _QuietHandler(SimpleHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+
+class StaticFileServer():
+    def __init__(self, root: str, host: str = "127.0.0.1", port: int = 0):
+        """
+        Args:
+            root (str): The directory to serve.
+            host (str): The interface to bind.
+            port (int): The port to bind, 0 for an ephemeral one.
+        """
+        self.root = root
+        self.host = host
+        self.port = port
+        self._server = None
+        self._thread = None
+
+    @property
+    def base_url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    def url(self, path: str) -> str:
+        return f"{self.base_url}/{path.lstrip('/')}"
+
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> "StaticFileServer":
+        if self.running():
+            return self
+        handler = partial(_QuietHandler, directory=self.root)
+        self._server = ThreadingHTTPServer((self.host, self.port), handler)
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(target=self._server.serve_forever, name="static-file-server", daemon=True)
+        self._thread.start()
+        logger.info(f"| Serving {self.root} at {self.base_url}")
+        return self
+
+    def close(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+        self._server = None
+        self._thread = None
+
+
+# One server per served directory and process, shared by every tool instance
+_FILE_SERVERS: Dict[str, StaticFileServer] = {}
+_FILE_SERVERS_LOCK = threading.Lock()
+
+
+def get_file_server(root: str) -> StaticFileServer:
+    """The running server of `root`, started on first use."""
+    with _FILE_SERVERS_LOCK:
+        server = _FILE_SERVERS.get(root)
+        if server is None:
+            server = _FILE_SERVERS[root] = StaticFileServer(root)
+        return server.start()
@@ -0,0 +1,187 @@
+"""Cached page-to-markdown conversion and goal-ranked chunk selection for `extract_content`.
+
+Converting a large page to markdown is slow and sending all of it to the extraction model is expensive, while agents
+often extract several times from the same unchanged page. The markdown of a page is cached under its URL and a DOM
+mutation fingerprint, the conversion runs in a worker thread, and only the chunks that best match the extraction goal
+are sent to the model when the page is over budget.
+"""
+import re
+import math
+import asyncio
+from collections import Counter, OrderedDict
+from typing import List, Optional, Tuple
+
+# Installs a MutationObserver on first call and returns "<observer id>:<mutation count>". The id changes on
+# navigation (new document), the count changes whenever nodes or text change.
+DOM_FINGERPRINT_JS = """() => {
+    if (window.__contentObserverId === undefined) {
+        window.__contentObserverId = Math.random().toString(36).slice(2);
+        window.__contentMutations = 0;
+        new MutationObserver((mutations) => { window.__contentMutations += mutations.length; })
+            .observe(document, {subtree: true, childList: true, characterData: true});
+    }
+    return window.__contentObserverId + ':' + window.__contentMutations;
+}"""
+
+CHUNK_SEPARATOR = "\n\n[...]\n\n"
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+_HEADING_RE = re.compile(r"^#{1,6} ", re.MULTILINE)
+
+
+def tokenize(text: str) -> List[str]:
+    return [token.lower() for token in _TOKEN_RE.findall(text) if len(token) > 1]
+
+
+def split_into_chunks(markdown: str, chunk_size: int = 2000) -> List[str]:
+    """Split markdown at headings, then at paragraphs, into chunks of about `chunk_size` characters."""
+    sections = []
+    starts = [match.start() for match in _HEADING_RE.finditer(markdown)]
+    bounds = [0] + [start for start in starts if start > 0] + [len(markdown)]
+    for begin, end in zip(bounds, bounds[1:]):
+        section = markdown[begin:end].strip()
+        if section:
+            sections.append(section)
+
+    chunks = []
+    for section in sections:
+        if len(section) <= chunk_size:
+            chunks.append(section)
+            continue
+        current = ""
+        for paragraph in re.split(r"\n\s*\n", section):
+            while len(paragraph) > chunk_size:
+                if current:
+                    chunks.append(current)
+                    current = ""
+                chunks.append(paragraph[:chunk_size])
+                paragraph = paragraph[chunk_size:]
+            if current and len(current) + len(paragraph) + 2 > chunk_size:
+                chunks.append(current)
+                current = ""
+            current = f"{current}\n\n{paragraph}" if current else paragraph
+        if current:
+            chunks.append(current)
+    return chunks
+
+
+def score_chunks(chunks: List[str], goal: str) -> List[float]:
+    """BM25 score of every chunk against the goal."""
+    query = set(tokenize(goal))
+    if not query or not chunks:
+        return [0.0] * len(chunks)
+
+    counts = [Counter(tokenize(chunk)) for chunk in chunks]
+    lengths = [sum(count.values()) for count in counts]
+    avg_length = sum(lengths) / len(lengths) or 1.0
+    document_frequency = {term: sum(1 for count in counts if term in count) for term in query}
+
+    k1, b = 1.5, 0.75
+    scores = []
+    for count, length in zip(counts, lengths):
+        score = 0.0
+        for term in query:
+            tf = count.get(term, 0)
+            if not tf:
+                continue
+            idf = math.log(1 + (len(chunks) - document_frequency[term] + 0.5) / (document_frequency[term] + 0.5))
+            score += idf * tf * (k1 + 1) / (tf + k1 * (1 - b + b * length / avg_length))
+        scores.append(score)
+    return scores
+
+
+def select_relevant_content(markdown: str, goal: str, max_chars: int, chunk_size: int = 2000) -> Tuple[str, int, int]:
+    """
+    Keep the chunks of `markdown` most relevant to `goal` within `max_chars`, in page order.
+
+    Without any lexical match, e.g. for "summarize the page", the beginning of the page is kept.
+
+    Returns:
+        Tuple[str, int, int]: The selected content, the number of selected chunks and the total number of chunks.
+    """
+    if len(markdown) <= max_chars:
+        return markdown, 1, 1
+
+    chunks = split_into_chunks(markdown, chunk_size=chunk_size)
+    scores = score_chunks(chunks, goal)
+    ranked = any(scores)
+    if ranked:
+        order = sorted(range(len(chunks)), key=lambda index: (-scores[index], index))
+    else:
+        order = list(range(len(chunks)))
+
+    selected, used = [], 0
+    for index in order:
+        if used + len(chunks[index]) > max_chars:
+            if not ranked:
+                break  # keep a contiguous beginning of the page
+            continue
+        selected.append(index)
+        used += len(chunks[index]) + len(CHUNK_SEPARATOR)
+    selected.sort()
+
+    parts = []
+    for position, index in enumerate(selected):
+        if position > 0 and index != selected[position - 1] + 1:
+            parts.append(CHUNK_SEPARATOR)
+        elif position > 0:
+            parts.append("\n\n")
+        parts.append(chunks[index])
+    return "".join(parts), len(selected), len(chunks)
+
+
+def html_to_markdown(html: str, strip: Optional[List[str]] = None) -> str:
+    import markdownify
+
+    return markdownify.markdownify(html, strip=strip or [])
+
+
+class PageContentCache():
+    def __init__(self, max_entries: int = 32):
+        """
+        Markdown of recently extracted pages, keyed by URL, frames, DOM fingerprint and stripped tags.
+
+        Args:
+            max_entries (int): The number of pages kept, least recently used first out.
+        """
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[tuple, str]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    async def _fingerprint(self, page) -> Optional[str]:
+        try:
+            return await page.evaluate(DOM_FINGERPRINT_JS)
+        except Exception:
+            return None
+
+    async def get_markdown(self, page, strip: Optional[List[str]] = None) -> str:
+        """The markdown of the page and its iframes, converted off the event loop unless cached."""
+        frames = [
+            frame for frame in page.frames
+            if frame.url != page.url and not frame.url.startswith('data:')
+        ]
+        fingerprint = await self._fingerprint(page)
+        key = (page.url, tuple(frame.url for frame in frames), fingerprint, tuple(strip or []))
+
+        if fingerprint is not None and key in self._entries:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return self._entries[key]
+        self.misses += 1
+
+        content = await asyncio.to_thread(html_to_markdown, await page.content(), strip)
+        # manually append iframe text into the content so it's readable by the LLM (includes cross-origin iframes)
+        for frame in frames:
+            try:
+                frame_html = await frame.content()
+            except Exception:
+                continue
+            content += f'\n\nIFRAME {frame.url}:\n'
+            content += await asyncio.to_thread(html_to_markdown, frame_html)
+
+        if fingerprint is not None:
+            self._entries[key] = content
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return content
@@ -0,0 +1,277 @@
+"""Pool of warm headless browsers shared by the browser tools.
+
+Launching Chromium takes seconds and hundreds of MB, so instead of a browser per task the pool keeps `size` browsers
+running and hands out a fresh browser context per task. A context has its own cookies, storage and cache, and is
+closed when the task releases it, so tasks stay isolated while sharing the browser processes. Browsers are replaced
+after serving `max_tasks_per_browser` tasks, or when the browsers use more than `memory_limit_mb`, once their last
+context is released.
+"""
+import time
+import asyncio
+from contextlib import asynccontextmanager
+from typing import Any, Dict, List, Optional
+
+from browser_use import Browser, BrowserConfig
+from browser_use.browser.context import BrowserContext, BrowserContextConfig
+
+from src.tools.browser.profile import BrowsingProfile, apply_browsing_profile
+from src.logger import logger
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+BROWSER_PROCESS_NAMES = ("chrome", "chromium", "headless_shell")
+
+
+def get_browser_memory_mb() -> Optional[float]:
+    """Resident memory of the browser processes started by this process, in MB. None without psutil."""
+    if psutil is None:
+        return None
+    total = 0
+    for child in psutil.Process().children(recursive=True):
+        try:
+            if any(name in child.name().lower() for name in BROWSER_PROCESS_NAMES):
+                total += child.memory_info().rss
+        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            continue
+    return total / (1024 * 1024)
+
+
+class _PooledBrowser():
+    def __init__(self, index: int, browser: Browser):
+        self.index = index
+        self.browser = browser
+        self.active = 0
+        self.tasks = 0
+        self.retiring = False
+        self.launched_at = time.time()
+
+
+class BrowserPool():
+    def __init__(self,
+                 size: int = 2,
+                 browser_config: Optional[Dict[str, Any]] = None,
+                 context_config: Optional[Dict[str, Any]] = None,
+                 max_contexts_per_browser: int = 4,
+                 max_tasks_per_browser: int = 50,
+                 memory_limit_mb: Optional[float] = None,
+                 browsing_profile: Optional[BrowsingProfile] = None,
+                 ):
+        """
+        Args:
+            size (int): The number of browsers kept running.
+            browser_config (Dict[str, Any], optional): Arguments of `BrowserConfig`, headless by default.
+            context_config (Dict[str, Any], optional): Arguments of the `BrowserContextConfig` of every context.
+            max_contexts_per_browser (int): Contexts, hence tasks, a browser serves at once.
+            max_tasks_per_browser (int): Tasks after which a browser is replaced.
+            memory_limit_mb (float, optional): Total browser memory above which the busiest browsers are replaced.
+            browsing_profile (BrowsingProfile, optional): Request interception applied to every context.
+        """
+        self.size = max(1, size)
+        self.browser_config = dict(headless=True, disable_security=True)
+        self.browser_config.update(browser_config or {})
+        self.context_config = dict(context_config or {})
+        self.max_contexts_per_browser = max(1, max_contexts_per_browser)
+        self.max_tasks_per_browser = max_tasks_per_browser
+        self.memory_limit_mb = memory_limit_mb
+        self.browsing_profile = browsing_profile
+
+        self._browsers: Optional[List[_PooledBrowser]] = None
+        self._owners: Dict[int, _PooledBrowser] = {}  # id(context) -> browser
+        self._condition = asyncio.Condition()
+
+        self._launches = 0
+        self._recycles = 0
+        self._tasks = 0
+        self._waiting = 0
+        self._wait_time = 0.0
+
+    async def _launch(self, index: int) -> _PooledBrowser:
+        browser = Browser(config=BrowserConfig(**self.browser_config))
+        await browser.get_playwright_browser()
+        self._launches += 1
+        return _PooledBrowser(index, browser)
+
+    async def start(self):
+        """Launch the browsers."""
+        async with self._condition:
+            if self._browsers is not None:
+                return
+            results = await asyncio.gather(*[self._launch(index) for index in range(self.size)],
+                                           return_exceptions=True)
+            errors = [result for result in results if isinstance(result, BaseException)]
+            if errors:
+                # Close the browsers that did launch, the next acquire retries with a clean slate
+                await asyncio.gather(*[result.browser.close() for result in results
+                                       if not isinstance(result, BaseException)],
+                                     return_exceptions=True)
+                raise errors[0]
+            self._browsers = list(results)
+        logger.info(f"| Browser pool started with {self.size} browsers.")
+
+    def _pick(self) -> Optional[_PooledBrowser]:
+        available = [
+            pooled for pooled in self._browsers
+            if not pooled.retiring and pooled.active < self.max_contexts_per_browser
+        ]
+        if not available:
+            return None
+        return min(available, key=lambda pooled: (pooled.active, pooled.tasks))
+
+    async def acquire(self) -> BrowserContext:
+        """Get a fresh context, waiting while every browser serves `max_contexts_per_browser` contexts."""
+        await self.start()
+        start = time.time()
+        async with self._condition:
+            self._waiting += 1
+            try:
+                await self._condition.wait_for(lambda: self._pick() is not None)
+            finally:
+                self._waiting -= 1
+            pooled = self._pick()
+            pooled.active += 1
+            pooled.tasks += 1
+            self._tasks += 1
+        self._wait_time += time.time() - start
+
+        try:
+            context = await pooled.browser.new_context(BrowserContextConfig(**self.context_config))
+            await apply_browsing_profile(context, self.browsing_profile)
+        except BaseException:
+            await self._done(pooled)
+            raise
+        self._owners[id(context)] = pooled
+        return context
+
+    async def release(self, context: BrowserContext):
+        """Close a context, dropping its cookies and storage, and give its slot back."""
+        pooled = self._owners.pop(id(context), None)
+        try:
+            await context.close()
+        except Exception as e:
+            logger.warning(f"| Failed to close browser context: {e}")
+        if pooled is not None:
+            await self._done(pooled)
+
+    @asynccontextmanager
+    async def context(self):
+        """`async with pool.context() as context:` acquires a context and releases it afterwards."""
+        context = await self.acquire()
+        try:
+            yield context
+        finally:
+            await self.release(context)
+
+    async def _done(self, pooled: _PooledBrowser):
+        async with self._condition:
+            pooled.active -= 1
+            self._mark_retiring()
+            # A retiring browser is never picked, so nothing else uses it while it is replaced
+            replace = pooled.retiring and pooled.active == 0 and self._browsers is not None
+            self._condition.notify_all()
+        if replace:
+            await self._replace(pooled)
+
+    def _mark_retiring(self):
+        for pooled in self._browsers or []:
+            if self.max_tasks_per_browser and pooled.tasks >= self.max_tasks_per_browser:
+                pooled.retiring = True
+
+        if self.memory_limit_mb is None:
+            return
+        memory_mb = get_browser_memory_mb()
+        if memory_mb is not None and memory_mb > self.memory_limit_mb:
+            candidates = [pooled for pooled in self._browsers if not pooled.retiring]
+            if len(candidates) > 1:
+                # Keep one browser serving while the most used one is replaced
+                max(candidates, key=lambda pooled: pooled.tasks).retiring = True
+
+    async def _replace(self, pooled: _PooledBrowser):
+        """
+        Launch the replacement of a retired browser, then close it. The launch runs outside the condition lock so
+        that the other browsers keep serving, and when it fails the retired browser is put back in its slot.
+        """
+        logger.info(f"| Recycling browser {pooled.index} after {pooled.tasks} tasks.")
+        try:
+            replacement = await self._launch(pooled.index)
+        except Exception as e:
+            logger.warning(f"| Failed to relaunch browser {pooled.index}, keeping the current one: {e}")
+            replacement = None
+
+        async with self._condition:
+            if replacement is None:
+                pooled.retiring = False
+                pooled.tasks = 0
+                to_close = None
+            elif self._browsers is not None and self._browsers[pooled.index] is pooled:
+                self._browsers[pooled.index] = replacement
+                self._recycles += 1
+                to_close = pooled
+            else:
+                # The pool was closed meanwhile, together with the retired browser
+                to_close = replacement
+            self._condition.notify_all()
+
+        if to_close is not None:
+            try:
+                await to_close.browser.close()
+            except Exception as e:
+                logger.warning(f"| Failed to close browser {to_close.index}: {e}")
+
+    def metrics(self) -> Dict[str, Any]:
+        """Pool usage: per-browser load, launches, recycles, waiting tasks and browser memory."""
+        browsers = self._browsers or []
+        return {
+            "size": self.size,
+            "browsers": [
+                {
+                    "index": pooled.index,
+                    "active_contexts": pooled.active,
+                    "tasks": pooled.tasks,
+                    "retiring": pooled.retiring,
+                    "uptime": time.time() - pooled.launched_at,
+                }
+                for pooled in browsers
+            ],
+            "active_contexts": sum(pooled.active for pooled in browsers),
+            "waiting": self._waiting,
+            "tasks": self._tasks,
+            "launches": self._launches,
+            "recycles": self._recycles,
+            "avg_acquire_wait": self._wait_time / self._tasks if self._tasks else 0.0,
+            "memory_mb": get_browser_memory_mb(),
+            "browsing_profile": self.browsing_profile.metrics() if self.browsing_profile is not None else None,
+        }
+
+    async def close(self):
+        """Close every browser."""
+        async with self._condition:
+            browsers, self._browsers = self._browsers or [], None
+        for pooled in browsers:
+            try:
+                await pooled.browser.close()
+            except Exception as e:
+                logger.warning(f"| Failed to close browser {pooled.index}: {e}")
+        self._owners = {}
+
+
+# One pool per process, shared by every browser tool instance
+_BROWSER_POOL: Optional[BrowserPool] = None
+
+
+def get_browser_pool(**kwargs) -> BrowserPool:
+    """The process-wide browser pool, created with `kwargs` on first use."""
+    global _BROWSER_POOL
+    if _BROWSER_POOL is None:
+        _BROWSER_POOL = BrowserPool(**kwargs)
+    return _BROWSER_POOL
+
+
+async def close_browser_pool():
+    """Close the process-wide browser pool, if it was created. The next `get_browser_pool` creates a new one."""
+    global _BROWSER_POOL
+    browser_pool, _BROWSER_POOL = _BROWSER_POOL, None
+    if browser_pool is not None:
+        await browser_pool.close()
@@ -0,0 +1,228 @@
+"""Browsing profile: request interception for lighter page loads.
+
+The browser agents only need the DOM text and the occasional screenshot, so the profile aborts requests for heavy
+resource types (media, fonts, optionally images) and for ad/tracker domains, stops loading subresources of a page
+once it exceeds a byte budget, and can serve repeated subresources (scripts, stylesheets, ...) from an in-memory
+cache shared by every context of the process. Like a shared HTTP cache, it never stores responses marked private,
+varying on request headers or setting cookies.
+
+Only the cacheable subresources are fetched by the profile itself, documents, navigations and every other request
+are continued by the browser, and the page weight is counted from the finished requests.
+"""
+import weakref
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, Optional, Tuple
+from urllib.parse import urlsplit
+
+from src.logger import logger
+
+DEFAULT_BLOCKED_RESOURCE_TYPES = ["media", "font"]
+
+DEFAULT_BLOCKED_DOMAINS = [
+    "doubleclick.net",
+    "googlesyndication.com",
+    "googleadservices.com",
+    "google-analytics.com",
+    "googletagmanager.com",
+    "adservice.google.com",
+    "amazon-adsystem.com",
+    "adnxs.com",
+    "criteo.com",
+    "taboola.com",
+    "outbrain.com",
+    "scorecardresearch.com",
+    "hotjar.com",
+    "connect.facebook.net",
+]
+
+CACHEABLE_RESOURCE_TYPES = ("script", "stylesheet", "font", "image")
+
+
+class SubresourceCache():
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024, max_entry_bytes: int = 4 * 1024 * 1024):
+        """
+        LRU cache of subresource responses, bounded by their total body size.
+
+        Args:
+            max_bytes (int): Total size of the cached bodies.
+            max_entry_bytes (int): Larger responses are not cached.
+        """
+        self.max_bytes = max_bytes
+        self.max_entry_bytes = max_entry_bytes
+        self._entries: "OrderedDict[str, Tuple[int, Dict[str, str], bytes]]" = OrderedDict()
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, url: str) -> Optional[Tuple[int, Dict[str, str], bytes]]:
+        entry = self._entries.get(url)
+        if entry is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(url)
+        self.hits += 1
+        return entry
+
+    @staticmethod
+    def is_storable(status: int, headers: Dict[str, str]) -> bool:
+        """Whether a response may be reused for any context, following the rules of shared HTTP caches."""
+        cache_control = headers.get("cache-control", "").lower()
+        if status != 200 or "set-cookie" in headers:
+            return False
+        if any(directive in cache_control for directive in ("no-store", "no-cache", "private")):
+            return False
+        vary = {value.strip().lower() for value in headers.get("vary", "").split(",") if value.strip()}
+        return vary <= {"accept-encoding"}
+
+    def put(self, url: str, status: int, headers: Dict[str, str], body: bytes) -> bool:
+        if not self.is_storable(status, headers) or len(body) > self.max_entry_bytes:
+            return False
+        previous = self._entries.pop(url, None)
+        if previous is not None:
+            self.size -= len(previous[2])
+        self._entries[url] = (status, headers, body)
+        self.size += len(body)
+        while self.size > self.max_bytes and self._entries:
+            _, (_, _, evicted) = self._entries.popitem(last=False)
+            self.size -= len(evicted)
+        return True
+
+
+class BrowsingProfile():
+    def __init__(self,
+                 blocked_resource_types: Optional[Iterable[str]] = None,
+                 blocked_domains: Optional[Iterable[str]] = None,
+                 max_page_bytes: Optional[int] = None,
+                 cache_subresources: bool = False,
+                 cache_max_bytes: int = 64 * 1024 * 1024,
+                 ):
+        """
+        Args:
+            blocked_resource_types (Iterable[str], optional): Playwright resource types to abort, e.g. "image",
+                "media", "font". Defaults to media and fonts.
+            blocked_domains (Iterable[str], optional): Domains whose requests are aborted, subdomains included.
+                Defaults to common ad and tracker domains.
+            max_page_bytes (int, optional): Subresources of a page are aborted once it loaded that many bytes,
+                as counted from its finished requests.
+            cache_subresources (bool): Serve repeated scripts, stylesheets, fonts and images from memory.
+            cache_max_bytes (int): Size of the subresource cache.
+        """
+        self.blocked_resource_types = set(
+            DEFAULT_BLOCKED_RESOURCE_TYPES if blocked_resource_types is None else blocked_resource_types
+        )
+        self.blocked_domains = [
+            domain.lower().lstrip(".") for domain in
+            (DEFAULT_BLOCKED_DOMAINS if blocked_domains is None else blocked_domains)
+        ]
+        self.max_page_bytes = max_page_bytes
+        self.cache = SubresourceCache(max_bytes=cache_max_bytes) if cache_subresources else None
+
+        self._page_bytes = weakref.WeakKeyDictionary()
+        self.blocked = 0
+        self.over_budget = 0
+
+    def is_blocked_domain(self, url: str) -> bool:
+        host = (urlsplit(url).hostname or "").lower()
+        return any(host == domain or host.endswith("." + domain) for domain in self.blocked_domains)
+
+    def should_block(self, url: str, resource_type: str) -> bool:
+        """Whether a request is aborted by resource type or domain. Documents are never blocked by type."""
+        if resource_type != "document" and resource_type in self.blocked_resource_types:
+            return True
+        return self.is_blocked_domain(url)
+
+    def _add_page_bytes(self, page, size: int) -> int:
+        if page is None:
+            return 0
+        total = self._page_bytes.get(page, 0) + size
+        self._page_bytes[page] = total
+        return total
+
+    def _get_page(self, request):
+        try:
+            return request.frame.page
+        except Exception:
+            return None
+
+    async def handle_route(self, route, request):
+        url = request.url
+        resource_type = request.resource_type
+
+        if self.should_block(url, resource_type):
+            self.blocked += 1
+            return await route.abort("blockedbyclient")
+
+        page = self._get_page(request)
+        if request.is_navigation_request() or resource_type == "document" or request.method != "GET":
+            if request.is_navigation_request() and request.frame.parent_frame is None and page is not None:
+                # A new document in the main frame starts a new page budget
+                self._page_bytes[page] = 0
+            return await route.continue_()
+
+        if self.max_page_bytes is not None and page is not None \
+                and self._page_bytes.get(page, 0) > self.max_page_bytes:
+            self.over_budget += 1
+            return await route.abort("blockedbyclient")
+
+        if self.cache is None or resource_type not in CACHEABLE_RESOURCE_TYPES or "authorization" in request.headers:
+            return await route.continue_()
+
+        entry = self.cache.get(url)
+        if entry is not None:
+            status, headers, body = entry
+            return await route.fulfill(status=status, headers=headers, body=body)
+
+        try:
+            # Redirects are left to the browser, so that the resource keeps its final url
+            response = await route.fetch(max_redirects=0)
+            body = await response.body()
+        except Exception:
+            # e.g. the page navigated away meanwhile, let the browser handle the request itself
+            return await route.continue_()
+        self.cache.put(url, response.status, response.headers, body)
+        return await route.fulfill(response=response, body=body)
+
+    async def handle_request_finished(self, request):
+        """Count the bytes of every finished request of a page, whoever fetched it."""
+        if self.max_page_bytes is None:
+            return
+        page = self._get_page(request)
+        if page is None:
+            return
+        try:
+            sizes = await request.sizes()
+        except Exception:
+            return
+        self._add_page_bytes(page, sizes.get("responseBodySize", 0) + sizes.get("responseHeadersSize", 0))
+
+    async def apply(self, playwright_context) -> None:
+        """Intercept every request of a playwright browser context."""
+        await playwright_context.route("**/*", self.handle_route)
+        playwright_context.on("requestfinished", self.handle_request_finished)
+
+    def metrics(self) -> Dict[str, Any]:
+        return {
+            "blocked": self.blocked,
+            "over_budget": self.over_budget,
+            "cache_hits": self.cache.hits if self.cache is not None else 0,
+            "cache_misses": self.cache.misses if self.cache is not None else 0,
+            "cache_bytes": self.cache.size if self.cache is not None else 0,
+        }
+
+
+async def apply_browsing_profile(browser_context, profile: Optional[BrowsingProfile]) -> None:
+    """Apply a profile to a browser-use `BrowserContext`, initializing its session if needed."""
+    if profile is None:
+        return
+    try:
+        session = await browser_context.get_session()
+        await profile.apply(session.context)
+    except Exception as e:
+        logger.warning(f"| Failed to apply the browsing profile: {e}")
+
+
+def build_browsing_profile(profile_config: Optional[Dict[str, Any]]) -> Optional[BrowsingProfile]:
+    """Build a profile from its config dict, None when there is no config."""
+    if profile_config is None:
+        return None
+    return BrowsingProfile(**profile_config)
@@ -0,0 +1,132 @@
+"""Recording and deterministic replay of browser actions.
+
+Every action executed through `Controller.act` is recorded with a fingerprint of the page before and after it and its
+result. When a task is run again, actions are compared with the recording of the previous run: while the run follows
+the recorded prefix (same action, same parameters, same page fingerprint), read-only actions such as `extract_content`
+return the recorded result instead of running again. Actions that change the browser state are always executed so the
+browser stays where the recording was, and the first mismatch ends the replay for the rest of the run.
+
+The recordings are plain JSON files, one per task, which also serve as offline fixtures of browser runs.
+"""
+import os
+import json
+import hashlib
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from browser_use.agent.views import ActionResult
+
+from src.logger import logger
+
+# A fingerprint of the rendered page: location, title and visible text
+PAGE_FINGERPRINT_JS = """() => [
+    location.href,
+    document.title,
+    document.body ? document.body.innerText : '',
+].join('\\n')"""
+
+# Actions whose result only depends on the page, safe to answer from the recording
+REPLAYABLE_ACTIONS = ("extract_content", "get_dropdown_options")
+
+
+class ActionRecordStore():
+    def __init__(self, root: str):
+        """
+        Args:
+            root (str): Directory of the recordings, one JSON file per key.
+        """
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+
+    def path(self, key: str) -> str:
+        return os.path.join(self.root, hashlib.sha256(key.encode("utf-8")).hexdigest() + ".json")
+
+    def load(self, key: str) -> List[Dict[str, Any]]:
+        path = self.path(key)
+        if not os.path.exists(path):
+            return []
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f)["steps"]
+        except (json.JSONDecodeError, KeyError) as e:
+            logger.warning(f"| Ignoring unreadable action recording {path}: {e}")
+            return []
+
+    def save(self, key: str, steps: List[Dict[str, Any]]) -> None:
+        path = self.path(key)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"key": key, "steps": steps}, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+
+class ActionRecorder():
+    def __init__(self, store: ActionRecordStore, key: str, replay: bool = True):
+        """
+        Records the actions of one browser run and replays the matching prefix of the previous run of `key`.
+
+        Args:
+            store (ActionRecordStore): Where recordings are kept.
+            key (str): The recording key, e.g. the task of the browser agent.
+            replay (bool): Answer replayable actions from the previous recording. Otherwise only record.
+        """
+        self.store = store
+        self.key = key
+        self.recording = store.load(key) if replay else []
+        self.steps: List[Dict[str, Any]] = []
+        self.diverged = not self.recording
+        self.replayed = 0
+
+    async def fingerprint(self, browser_context) -> Optional[str]:
+        try:
+            page = await browser_context.get_current_page()
+            text = await page.evaluate(PAGE_FINGERPRINT_JS)
+        except Exception:
+            return None
+        return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+    def _recorded_step(self, action_name: str, params: Dict[str, Any], before: Optional[str]) -> Optional[Dict]:
+        """The recorded step at the current position, if the run still follows the recording."""
+        if self.diverged:
+            return None
+        index = len(self.steps)
+        if index >= len(self.recording):
+            self.diverged = True
+            return None
+        step = self.recording[index]
+        if step["action"] != action_name or step["params"] != params or before is None or step["before"] != before:
+            logger.info(f"| Action replay diverged at step {index} ({action_name})")
+            self.diverged = True
+            return None
+        return step
+
+    async def run(self,
+                  action_name: str,
+                  params: Dict[str, Any],
+                  browser_context,
+                  execute: Callable[[], Awaitable[ActionResult]]) -> ActionResult:
+        """Run an action through `execute`, or answer it from the recording, and record it."""
+        params = json.loads(json.dumps(params, default=str))
+        before = await self.fingerprint(browser_context)
+        step = self._recorded_step(action_name, params, before)
+
+        if step is not None and action_name in REPLAYABLE_ACTIONS:
+            result = ActionResult(**step["result"])
+            after = step["after"]
+            self.replayed += 1
+            logger.info(f"| Replayed {action_name} from the action recording")
+        else:
+            result = await execute()
+            after = await self.fingerprint(browser_context)
+            if step is not None and step["after"] != after:
+                logger.info(f"| Action replay diverged after {action_name}, the page changed")
+                self.diverged = True
+
+        self.steps.append({
+            "action": action_name,
+            "params": params,
+            "before": before,
+            "after": after,
+            "result": result.model_dump(exclude_none=True),
+        })
+        self.store.save(self.key, self.steps)
+        return result
@@ -1,6 +1,3 @@
-from dotenv import load_dotenv
-load_dotenv(verbose=True)
-
 import asyncio
 import base64
 import json
@@ -16,6 +13,8 @@ from src.tools.web_searcher import WebSearcherTool
 from src.tools.web_fetcher import fetch_url
 from src.config import config
 from src.tools.markdown.mdconvert import MarkitdownConverter
+from src.tools.browser.pool import BrowserPool
+from src.tools.browser.profile import BrowsingProfile, apply_browsing_profile
 from src.logger import logger
 
 _BROWSER_DESCRIPTION = """\
@@ -177,9 +176,16 @@ class BrowserUseTool(AsyncTool, Generic[Context]):
     }
     output_type = 'any'
 
-    def __init__(self, model):
+    def __init__(self,
+                 model,
+                 browser_pool: Optional[BrowserPool] = None,
+                 browsing_profile: Optional[BrowsingProfile] = None):
 
         self.browser_config = config.browser
+        # With a pool, the session runs in a context of a pooled browser instead of its own browser
+        self.browser_pool = browser_pool
+        # Request interception of the own context, a pool applies its own profile
+        self.browsing_profile = browsing_profile
 
         self.browser = None
         self.context = None
@@ -208,6 +214,12 @@ class BrowserUseTool(AsyncTool, Generic[Context]):
 
     async def _ensure_browser_initialized(self) -> BrowserContext:
         """Ensure browser and context are initialized."""
+        if self.browser_pool is not None:
+            if self.context is None:
+                self.context = await self.browser_pool.acquire()
+                self.dom_service = DomService(await self.context.get_current_page())
+            return self.context
+
         if self.browser is None:
             browser_config_kwargs = {"headless": False, "disable_security": True}
 
@@ -251,6 +263,7 @@ class BrowserUseTool(AsyncTool, Generic[Context]):
                 context_config = self.browser_config.new_context_config
 
             self.context = await self.browser.new_context(context_config)
+            await apply_browsing_profile(self.context, self.browsing_profile)
             self.dom_service = DomService(await self.context.get_current_page())
 
         return self.context
@@ -585,7 +598,10 @@ Page content:
         async with self.lock:
 
             if self.context is not None:
-                await self.context.close()
+                if self.browser_pool is not None:
+                    await self.browser_pool.release(self.context)
+                else:
+                    await self.context.close()
                 self.context = None
                 self.dom_service = None
             if self.browser is not None:
@@ -597,7 +613,7 @@ Page content:
 
     def __del__(self):
         """Ensure cleanup when object is destroyed."""
-        if self.browser is not None or self.context is not None:
+        if self.browser is not None or (self.context is not None and self.browser_pool is None):
             try:
                 asyncio.run(self.cleanup())
             except RuntimeError:
@@ -1,11 +1,13 @@
 import os
-from typing import Optional, Dict, Any, List
+import asyncio
+from typing import Optional, Dict, Any, List, Set, Tuple
 from PIL import Image
 
 from src.tools import AsyncTool, ToolResult
 from src.models import model_manager, ChatMessage
 from src.models.base import MessageRole
 from src.tools.markdown.mdconvert import MarkitdownConverter
+from src.tools.map_reduce import MapReduceReader
 from src.logger import logger
 from src.registry import TOOL
 
@@ -59,8 +61,25 @@ class DeepAnalyzerTool(AsyncTool):
                  *args,
                  analyzer_model_ids: Optional[List[str]] = None,
                  summarizer_model_id: Optional[str] = None,
+                 concurrent: bool = True,
+                 analyzer_timeout: Optional[float] = None,
+                 quorum: Optional[int] = None,
+                 max_content_tokens: Optional[int] = None,
+                 map_reduce_model_id: Optional[str] = None,
                  **kwargs
                  ):
+        """
+        Args:
+            analyzer_model_ids (List[str]): The models analyzing the task.
+            summarizer_model_id (str): The model summarizing their analyses.
+            concurrent (bool): Run the analyzer models in parallel instead of one after the other.
+            analyzer_timeout (float, optional): Seconds after which an analyzer model is given up.
+            quorum (int, optional): With `concurrent`, summarize as soon as this many analyses succeeded and cancel
+                the other models. Waits for every model if None.
+            max_content_tokens (int, optional): Files converted to more tokens are map-reduced into notes on the
+                task of about this size before the analysis. Never reduced if None.
+            map_reduce_model_id (str, optional): The model writing the notes, the summarizer model if None.
+        """
 
         super(DeepAnalyzerTool, self).__init__()
 
@@ -73,20 +92,36 @@ class DeepAnalyzerTool(AsyncTool):
         self.summarizer_model_id = summarizer_model_id
         self.summary_model = model_manager.registed_models[self.summarizer_model_id]
 
+        self.concurrent = concurrent
+        self.analyzer_timeout = analyzer_timeout
+        self.quorum = quorum
+
         self.converter: MarkitdownConverter = MarkitdownConverter()
 
-    async def _analyze(self,
-                 model,
+        self.max_content_tokens = max_content_tokens
+        self.map_reduce_reader = None
+        if self.max_content_tokens is not None:
+            map_reduce_model_id = map_reduce_model_id or self.summarizer_model_id
+            self.map_reduce_reader = MapReduceReader(model=model_manager.registed_models[map_reduce_model_id],
+                                                     model_id=map_reduce_model_id,
+                                                     cache=self.converter.cache)
+
+    async def _prepare_content(self,
                  task: Optional[str] = None,
-                 source: Optional[str] = None) -> str:
+                 source: Optional[str] = None) -> Tuple[List[Dict[str, Any]], bool]:
+        """
+        Build the message content once for every analyzer model: the task, then the image or converted file.
+
+        Returns:
+            Tuple[List[Dict[str, Any]], bool]: The content and whether a note on the missing task should be added.
+        """
         add_note = False
         if not task:
             add_note = True
             task = "Please write a detailed caption for the attached file or uri."
 
-        task = _DEEP_ANALYZER_INSTRUCTION + task
         content = [
-            {"type": "text", "text": task},
+            {"type": "text", "text": _DEEP_ANALYZER_INSTRUCTION + task},
         ]
 
         if source:
@@ -94,17 +129,25 @@ class DeepAnalyzerTool(AsyncTool):
             ext = os.path.splitext(source)[-1].lower()
 
             if ext in ['.png', '.jpg', '.jpeg']:
+                image = Image.open(source)
+                image.load()
                 content.append(
                     {
                         "type": "image",
-                        "image": Image.open(source),
+                        "image": image,
                     }
                 )
             else:
                 try:
-                    extracted_content = self.converter.convert(source).text_content
+                    extracted_content = (await self.converter.aconvert(source)).text_content
                 except Exception as e:
                     extracted_content = f"Failed to extract content from {source}. Error: {e}"
+                else:
+                    if self.map_reduce_reader is not None:
+                        extracted_content = await self.map_reduce_reader.read(extracted_content,
+                                                                              task=task,
+                                                                              source=source,
+                                                                              max_tokens=self.max_content_tokens)
 
                 content.append(
                     {
@@ -113,6 +156,12 @@ class DeepAnalyzerTool(AsyncTool):
                     }
                 )
 
+        return content, add_note
+
+    async def _analyze_content(self,
+                 model,
+                 content: List[Dict[str, Any]],
+                 add_note: bool = False) -> str:
         messages = [
             {
                 "role": MessageRole.USER,
@@ -173,6 +222,62 @@ class DeepAnalyzerTool(AsyncTool):
 
         return output
 
+    async def _run_analyzer(self,
+                 model_name: str,
+                 model,
+                 content: List[Dict[str, Any]],
+                 add_note: bool) -> Tuple[str, bool]:
+        """
+        Returns:
+            Tuple[str, bool]: The analysis of the model, or the reason it failed, and whether it succeeded.
+        """
+        succeeded = False
+        try:
+            output = await asyncio.wait_for(self._analyze_content(model, content, add_note), self.analyzer_timeout)
+            succeeded = True
+        except asyncio.TimeoutError:
+            output = f"Analysis failed: no answer within {self.analyzer_timeout} seconds."
+        except Exception as e:
+            output = f"Analysis failed: {e}"
+        logger.info(f"{model_name}:\n{output}\n")
+        return output, succeeded
+
+    async def _analyze_concurrently(self,
+                 content: List[Dict[str, Any]],
+                 add_note: bool) -> Tuple[Dict[str, str], Set[str]]:
+        """
+        Run every analyzer model at once, stopping at the quorum of successful analyses if one is set.
+
+        Returns:
+            Tuple[Dict[str, str], Set[str]]: The analysis or failure reason of every model, and the models that
+                succeeded.
+        """
+        tasks = {
+            asyncio.create_task(self._run_analyzer(model_name, model, content, add_note)): model_name
+            for model_name, model in self.analyzer_models.items()
+        }
+        results, succeeded = {}, set()
+        pending = set(tasks)
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for done_task in done:
+                    results[tasks[done_task]], model_succeeded = done_task.result()
+                    if model_succeeded:
+                        succeeded.add(tasks[done_task])
+                if self.quorum is not None and len(succeeded) >= self.quorum:
+                    break
+        finally:
+            for pending_task in pending:
+                pending_task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+            logger.info(f"| Quorum of {self.quorum} analyses reached, cancelled {len(pending)} analyzer models.")
+
+        # Keep the configured model order
+        analysis = {model_name: results[model_name] for model_name in self.analyzer_models if model_name in results}
+        return analysis, succeeded
+
     async def forward(self, task: Optional[str] = None, source: Optional[str] = None) -> ToolResult:
         """
         Forward the task and/or source to the analyzer model and get the analysis.
@@ -180,10 +285,24 @@ class DeepAnalyzerTool(AsyncTool):
         if not task and not source:
             raise ValueError("At least one of task or source should be provided.")
 
-        analysis = {}
-        for model_name, model in self.analyzer_models.items():
-            analysis[model_name] = await self._analyze(model, task, source)
-            logger.info(f"{model_name}:\n{analysis[model_name]}\n")
+        content, add_note = await self._prepare_content(task, source)
+
+        if self.concurrent:
+            analysis, succeeded = await self._analyze_concurrently(content, add_note)
+        else:
+            analysis, succeeded = {}, set()
+            for model_name, model in self.analyzer_models.items():
+                analysis[model_name], model_succeeded = await self._run_analyzer(model_name, model, content, add_note)
+                if model_succeeded:
+                    succeeded.add(model_name)
+
+        if not succeeded:
+            # Nothing to summarize, report why every analyzer model failed
+            reasons = "\n".join(f"{model_name}: {reason}" for model_name, reason in analysis.items())
+            return ToolResult(
+                output=None,
+                error=f"Every analyzer model failed:\n{reasons}",
+            )
 
         summary = await self._summarize(self.summary_model, analysis)
 
@@ -0,0 +1,157 @@
+"""Large-object channel between remote executors and the agent.
+
+Results are normally returned by printing a base64 pickle through the kernel output stream, which inflates them by a
+third and materializes them several times on both sides. When the executor shares a directory with the agent, results
+above a size threshold are written there instead (Arrow IPC for DataFrames, raw pixel buffers for images, pickle
+otherwise) and only a small handle goes through the stream. The agent side memory-maps the file, so callers get the
+result itself as with the stream, and the file is deleted once loaded. Callers that want to defer loading opt in to
+`LargeObjectHandle`s with `materialize=False`, and release them when done.
+"""
+import base64
+import json
+import mmap
+import os
+import pickle
+from typing import Any, Dict, Optional
+
+RESULT_PICKLE_PREFIX = "RESULT_PICKLE:"
+RESULT_HANDLE_PREFIX = "RESULT_HANDLE:"
+
+DEFAULT_LARGE_OBJECT_THRESHOLD = 1024 * 1024
+
+# Sent once to the kernel, defines `_export_result(obj, shared_dir, threshold)` which prints the result line.
+EXPORT_HELPER_CODE = '''
+def _export_result(obj, shared_dir, threshold):
+    import base64, json, os, pickle, uuid
+
+    name = uuid.uuid4().hex
+    handle = None
+
+    try:
+        import pandas as pd
+    except ImportError:
+        pd = None
+    if pd is not None and isinstance(obj, pd.DataFrame) and obj.memory_usage(deep=True).sum() >= threshold:
+        try:
+            import pyarrow as pa
+        except ImportError:
+            pa = None
+        if pa is not None:
+            table = pa.Table.from_pandas(obj)
+            with pa.OSFile(os.path.join(shared_dir, name + ".arrow"), "wb") as sink:
+                with pa.ipc.new_file(sink, table.schema) as writer:
+                    writer.write_table(table)
+            handle = {"kind": "arrow", "name": name + ".arrow", "shape": list(obj.shape)}
+
+    if handle is None:
+        try:
+            from PIL import Image
+        except ImportError:
+            Image = None
+        if Image is not None and isinstance(obj, Image.Image) and obj.width * obj.height * len(obj.getbands()) >= threshold:
+            with open(os.path.join(shared_dir, name + ".raw"), "wb") as f:
+                f.write(obj.tobytes())
+            handle = {"kind": "image", "name": name + ".raw", "mode": obj.mode, "size": list(obj.size)}
+
+    if handle is None:
+        payload = pickle.dumps(obj, protocol=pickle.HIGHEST_PROTOCOL)
+        if len(payload) < threshold:
+            print("RESULT_PICKLE:" + base64.b64encode(payload).decode())
+            return
+        with open(os.path.join(shared_dir, name + ".pkl"), "wb") as f:
+            f.write(payload)
+        handle = {"kind": "pickle", "name": name + ".pkl"}
+
+    print("RESULT_HANDLE:" + json.dumps(handle))
+'''
+
+
+class LargeObjectHandle():
+    """
+    Reference to a result written to the shared directory, loaded on first access.
+
+    Args:
+        kind (str): "arrow", "image" or "pickle".
+        path (str): Path of the file on the agent side.
+        meta (Dict[str, Any]): Kind-specific metadata, e.g. the DataFrame shape or the image mode and size.
+    """
+
+    def __init__(self, kind: str, path: str, meta: Optional[Dict[str, Any]] = None):
+        self.kind = kind
+        self.path = path
+        self.meta = meta or {}
+        self._value = None
+        self._loaded = False
+
+    @property
+    def nbytes(self) -> int:
+        return os.path.getsize(self.path)
+
+    def load(self) -> Any:
+        """Load the object, memory-mapping the file where the format allows it."""
+        if not self._loaded:
+            self._value = self._load()
+            self._loaded = True
+        return self._value
+
+    def _load(self) -> Any:
+        if self.kind == "arrow":
+            import pyarrow as pa
+
+            table = pa.ipc.open_file(pa.memory_map(self.path, "r")).read_all()
+            return table.to_pandas()
+        elif self.kind == "image":
+            import PIL.Image
+
+            with open(self.path, "rb") as f:
+                buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            mode = self.meta["mode"]
+            return PIL.Image.frombuffer(mode, tuple(self.meta["size"]), buffer, "raw", mode, 0, 1)
+        elif self.kind == "pickle":
+            with open(self.path, "rb") as f:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+                    return pickle.loads(buffer)
+        raise ValueError(f"Unknown large object kind: {self.kind}")
+
+    def release(self) -> None:
+        """Delete the file. Objects already loaded stay usable."""
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
+
+    def __repr__(self):
+        details = ", ".join(f"{key}={value}" for key, value in self.meta.items())
+        return f"LargeObjectHandle(kind={self.kind}, path={self.path}{', ' + details if details else ''})"
+
+
+def parse_result_line(text: str, shared_dir: Optional[str] = None, materialize: bool = True) -> tuple[bool, Any]:
+    """
+    Parse a result line printed by the kernel.
+
+    Args:
+        text (str): The line.
+        shared_dir (str, optional): The shared directory on the agent side.
+        materialize (bool): Load large results and delete their file. With False, large results are returned as a
+            `LargeObjectHandle` that the caller releases.
+
+    Returns:
+        tuple[bool, Any]: Whether the line is a result, and the result.
+    """
+    if text.startswith(RESULT_PICKLE_PREFIX):
+        return True, pickle.loads(base64.b64decode(text[len(RESULT_PICKLE_PREFIX):].strip()))
+    if text.startswith(RESULT_HANDLE_PREFIX):
+        if shared_dir is None:
+            raise ValueError("Received a large object handle but no shared directory is configured.")
+        meta = json.loads(text[len(RESULT_HANDLE_PREFIX):].strip())
+        kind = meta.pop("kind")
+        name = os.path.basename(meta.pop("name"))
+        handle = LargeObjectHandle(kind, os.path.join(shared_dir, name), meta)
+        if not materialize:
+            return True, handle
+        try:
+            return True, handle.load()
+        finally:
+            # Memory maps stay valid once their file is deleted
+            handle.release()
+    return False, None
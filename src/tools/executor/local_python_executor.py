@@ -21,8 +21,9 @@ import inspect
 import logging
 import math
 import re
+from collections import ChainMap
 from collections.abc import Callable, Mapping
-from functools import wraps
+from functools import lru_cache, wraps
 from importlib import import_module
 from types import BuiltinFunctionType, FunctionType, ModuleType
 from typing import Any
@@ -224,6 +225,61 @@ def safer_func(
     return _check_return
 
 
+class StaticTools(dict):
+    """
+    Static tools of an evaluation, with the set of their ids precomputed for the builtin call check.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._tool_ids = None
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self._tool_ids = None
+
+    def __delitem__(self, key):
+        super().__delitem__(key)
+        self._tool_ids = None
+
+    def update(self, *args, **kwargs):
+        super().update(*args, **kwargs)
+        self._tool_ids = None
+
+    def pop(self, *args):
+        self._tool_ids = None
+        return super().pop(*args)
+
+    def tool_ids(self) -> frozenset[int]:
+        if self._tool_ids is None:
+            self._tool_ids = frozenset(id(tool) for tool in self.values())
+        return self._tool_ids
+
+
+def get_static_tool_ids(static_tools: dict[str, Callable]) -> frozenset[int]:
+    """Ids of the static tools, precomputed when the tools come from `evaluate_python_code`."""
+    if isinstance(static_tools, StaticTools):
+        return static_tools.tool_ids()
+    return frozenset(id(tool) for tool in static_tools.values())
+
+
+class Scope(ChainMap):
+    """
+    Copy-on-write variable scope of a function call or comprehension.
+
+    Writes go to the local mapping and lookups fall back to the enclosing state, so entering a scope costs a small
+    dict instead of a copy of the whole interpreter state. Nested scopes are kept flat: a scope created from another
+    scope chains directly to its parents.
+    """
+
+    def __init__(self, parent: Mapping[str, Any], local: dict[str, Any] | None = None):
+        local = {} if local is None else local
+        if isinstance(parent, Scope):
+            super().__init__(local, *parent.maps)
+        else:
+            super().__init__(local, parent)
+
+
 class PrintContainer:
     def __init__(self):
         self.value = ""
@@ -366,9 +422,7 @@ def evaluate_lambda(
     args = [arg.arg for arg in lambda_expression.args.args]
 
     def lambda_func(*values: Any) -> Any:
-        new_state = state.copy()
-        for arg, value in zip(args, values):
-            new_state[arg] = value
+        new_state = Scope(state, dict(zip(args, values)))
         return evaluate_ast(
             lambda_expression.body,
             new_state,
@@ -412,7 +466,7 @@ def create_function(
     source_code = ast.unparse(func_def)
 
     def new_func(*args: Any, **kwargs: Any) -> Any:
-        func_state = state.copy()
+        func_state = Scope(state)
         arg_names = [arg.arg for arg in func_def.args.args]
         default_values = [
             evaluate_ast(d, state, static_tools, custom_tools, authorized_imports) for d in func_def.args.defaults
@@ -825,7 +879,11 @@ def evaluate_call(
         state["_print_outputs"] += " ".join(map(str, args)) + "\n"
         return None
     else:  # Assume it's a callable object
-        if (inspect.getmodule(func) == builtins) and inspect.isbuiltin(func) and (func not in static_tools.values()):
+        if (
+            inspect.isbuiltin(func)
+            and (inspect.getmodule(func) == builtins)
+            and (id(func) not in get_static_tool_ids(static_tools))
+        ):
             raise InterpreterError(
                 f"Invoking a builtin function that has not been explicitly added as a tool is not allowed ({func_name})."
             )
@@ -998,7 +1056,7 @@ def evaluate_listcomp(
         )
         result = []
         for value in iter_value:
-            new_state = current_state.copy()
+            new_state = Scope(current_state)
             if isinstance(generator.target, ast.Tuple):
                 for idx, elem in enumerate(generator.target.elts):
                     new_state[elem.id] = value[idx]
@@ -1025,7 +1083,7 @@ def evaluate_setcomp(
     for gen in setcomp.generators:
         iter_value = evaluate_ast(gen.iter, state, static_tools, custom_tools, authorized_imports)
         for value in iter_value:
-            new_state = state.copy()
+            new_state = Scope(state)
             set_value(
                 gen.target,
                 value,
@@ -1240,7 +1298,7 @@ def evaluate_dictcomp(
     for gen in dictcomp.generators:
         iter_value = evaluate_ast(gen.iter, state, static_tools, custom_tools, authorized_imports)
         for value in iter_value:
-            new_state = state.copy()
+            new_state = Scope(state)
             set_value(
                 gen.target,
                 value,
@@ -1307,6 +1365,158 @@ def evaluate_delete(
             raise InterpreterError(f"Deletion of {type(target).__name__} targets is not supported")
 
 
+def _evaluate_constant(expression, state, static_tools, custom_tools, authorized_imports):
+    # Constant -> just return the value
+    return expression.value
+
+
+def _evaluate_tuple(expression, state, static_tools, custom_tools, authorized_imports):
+    return tuple(evaluate_ast(elt, state, static_tools, custom_tools, authorized_imports) for elt in expression.elts)
+
+
+def _evaluate_list(expression, state, static_tools, custom_tools, authorized_imports):
+    # List -> evaluate all elements
+    return [evaluate_ast(elt, state, static_tools, custom_tools, authorized_imports) for elt in expression.elts]
+
+
+def _evaluate_set(expression, state, static_tools, custom_tools, authorized_imports):
+    return set(evaluate_ast(elt, state, static_tools, custom_tools, authorized_imports) for elt in expression.elts)
+
+
+def _evaluate_dict(expression, state, static_tools, custom_tools, authorized_imports):
+    # Dict -> evaluate all keys and values
+    keys = (evaluate_ast(k, state, static_tools, custom_tools, authorized_imports) for k in expression.keys)
+    values = (evaluate_ast(v, state, static_tools, custom_tools, authorized_imports) for v in expression.values)
+    return dict(zip(keys, values))
+
+
+def _evaluate_value(expression, state, static_tools, custom_tools, authorized_imports):
+    # Expr, Starred, Index -> evaluate the content
+    return evaluate_ast(expression.value, state, static_tools, custom_tools, authorized_imports)
+
+
+def _evaluate_formatted_value(expression, state, static_tools, custom_tools, authorized_imports):
+    # Formatted value (part of f-string) -> evaluate the content and format it
+    value = evaluate_ast(expression.value, state, static_tools, custom_tools, authorized_imports)
+    # Early return if no format spec
+    if not expression.format_spec:
+        return value
+    # Apply format specification
+    format_spec = evaluate_ast(expression.format_spec, state, static_tools, custom_tools, authorized_imports)
+    return format(value, format_spec)
+
+
+def _evaluate_joined_str(expression, state, static_tools, custom_tools, authorized_imports):
+    return "".join([str(evaluate_ast(v, state, static_tools, custom_tools, authorized_imports)) for v in expression.values])
+
+
+def _evaluate_ifexp(expression, state, static_tools, custom_tools, authorized_imports):
+    test_val = evaluate_ast(expression.test, state, static_tools, custom_tools, authorized_imports)
+    if test_val:
+        return evaluate_ast(expression.body, state, static_tools, custom_tools, authorized_imports)
+    else:
+        return evaluate_ast(expression.orelse, state, static_tools, custom_tools, authorized_imports)
+
+
+def _evaluate_slice(expression, state, static_tools, custom_tools, authorized_imports):
+    common_params = (state, static_tools, custom_tools, authorized_imports)
+    return slice(
+        evaluate_ast(expression.lower, *common_params) if expression.lower is not None else None,
+        evaluate_ast(expression.upper, *common_params) if expression.upper is not None else None,
+        evaluate_ast(expression.step, *common_params) if expression.step is not None else None,
+    )
+
+
+def _evaluate_return(expression, state, static_tools, custom_tools, authorized_imports):
+    value = expression.value
+    raise ReturnException(
+        evaluate_ast(value, state, static_tools, custom_tools, authorized_imports) if value else None
+    )
+
+
+def _evaluate_pass(expression, state, static_tools, custom_tools, authorized_imports):
+    return None
+
+
+def _evaluate_break(expression, state, static_tools, custom_tools, authorized_imports):
+    raise BreakException()
+
+
+def _evaluate_continue(expression, state, static_tools, custom_tools, authorized_imports):
+    raise ContinueException()
+
+
+def _evaluate_import(expression, state, static_tools, custom_tools, authorized_imports):
+    return evaluate_import(expression, state, authorized_imports)
+
+
+# Node type -> evaluation function, looked up once per node instead of walking an isinstance chain.
+# Every evaluation function takes (expression, state, static_tools, custom_tools, authorized_imports).
+EVALUATORS: dict[type, Callable] = {
+    ast.Assign: evaluate_assign,
+    ast.AnnAssign: evaluate_annassign,
+    ast.AugAssign: evaluate_augassign,
+    ast.Call: evaluate_call,
+    ast.Constant: _evaluate_constant,
+    ast.Tuple: _evaluate_tuple,
+    ast.ListComp: evaluate_listcomp,
+    ast.GeneratorExp: evaluate_listcomp,
+    ast.DictComp: evaluate_dictcomp,
+    ast.SetComp: evaluate_setcomp,
+    ast.UnaryOp: evaluate_unaryop,
+    ast.Starred: _evaluate_value,
+    ast.BoolOp: evaluate_boolop,
+    ast.Break: _evaluate_break,
+    ast.Continue: _evaluate_continue,
+    ast.BinOp: evaluate_binop,
+    ast.Compare: evaluate_condition,
+    ast.Lambda: evaluate_lambda,
+    ast.FunctionDef: evaluate_function_def,
+    ast.Dict: _evaluate_dict,
+    ast.Expr: _evaluate_value,
+    ast.For: evaluate_for,
+    ast.FormattedValue: _evaluate_formatted_value,
+    ast.If: evaluate_if,
+    ast.JoinedStr: _evaluate_joined_str,
+    ast.List: _evaluate_list,
+    ast.Name: evaluate_name,
+    ast.Subscript: evaluate_subscript,
+    ast.IfExp: _evaluate_ifexp,
+    ast.Attribute: evaluate_attribute,
+    ast.Slice: _evaluate_slice,
+    ast.While: evaluate_while,
+    ast.Import: _evaluate_import,
+    ast.ImportFrom: _evaluate_import,
+    ast.ClassDef: evaluate_class_def,
+    ast.Try: evaluate_try,
+    ast.Raise: evaluate_raise,
+    ast.Assert: evaluate_assert,
+    ast.With: evaluate_with,
+    ast.Set: _evaluate_set,
+    ast.Return: _evaluate_return,
+    ast.Pass: _evaluate_pass,
+    ast.Delete: evaluate_delete,
+}
+if hasattr(ast, "Index"):
+    EVALUATORS[ast.Index] = _evaluate_value
+
+
+def get_evaluator(node_type: type) -> Callable | None:
+    """
+    Get the evaluation function of an AST node type.
+
+    Exact types are a single dict lookup; subclasses of supported nodes are resolved through their MRO once and
+    memoized.
+    """
+    evaluator = EVALUATORS.get(node_type)
+    if evaluator is None:
+        for base in node_type.__mro__[1:]:
+            if base in EVALUATORS:
+                evaluator = EVALUATORS[node_type] = EVALUATORS[base]
+                break
+    return evaluator
+
+
 @safer_eval
 def evaluate_ast(
     expression: ast.AST,
@@ -1335,130 +1545,30 @@ def evaluate_ast(
             The list of modules that can be imported by the code. By default, only a few safe modules are allowed.
             If it contains "*", it will authorize any import. Use this at your own risk!
     """
-    if state.setdefault("_operations_count", {"counter": 0})["counter"] >= MAX_OPERATIONS:
+    operations_count = state.get("_operations_count")
+    if operations_count is None:
+        operations_count = state["_operations_count"] = {"counter": 0}
+    if operations_count["counter"] >= MAX_OPERATIONS:
         raise InterpreterError(
             f"Reached the max number of operations of {MAX_OPERATIONS}. Maybe there is an infinite loop somewhere in the code, or you're just asking too many calculations."
         )
-    state["_operations_count"]["counter"] += 1
-    common_params = (state, static_tools, custom_tools, authorized_imports)
-    if isinstance(expression, ast.Assign):
-        # Assignment -> we evaluate the assignment which should update the state
-        # We return the variable assigned as it may be used to determine the final result.
-        return evaluate_assign(expression, *common_params)
-    elif isinstance(expression, ast.AnnAssign):
-        return evaluate_annassign(expression, *common_params)
-    elif isinstance(expression, ast.AugAssign):
-        return evaluate_augassign(expression, *common_params)
-    elif isinstance(expression, ast.Call):
-        # Function call -> we return the value of the function call
-        return evaluate_call(expression, *common_params)
-    elif isinstance(expression, ast.Constant):
-        # Constant -> just return the value
-        return expression.value
-    elif isinstance(expression, ast.Tuple):
-        return tuple((evaluate_ast(elt, *common_params) for elt in expression.elts))
-    elif isinstance(expression, (ast.ListComp, ast.GeneratorExp)):
-        return evaluate_listcomp(expression, *common_params)
-    elif isinstance(expression, ast.DictComp):
-        return evaluate_dictcomp(expression, *common_params)
-    elif isinstance(expression, ast.SetComp):
-        return evaluate_setcomp(expression, *common_params)
-    elif isinstance(expression, ast.UnaryOp):
-        return evaluate_unaryop(expression, *common_params)
-    elif isinstance(expression, ast.Starred):
-        return evaluate_ast(expression.value, *common_params)
-    elif isinstance(expression, ast.BoolOp):
-        # Boolean operation -> evaluate the operation
-        return evaluate_boolop(expression, *common_params)
-    elif isinstance(expression, ast.Break):
-        raise BreakException()
-    elif isinstance(expression, ast.Continue):
-        raise ContinueException()
-    elif isinstance(expression, ast.BinOp):
-        # Binary operation -> execute operation
-        return evaluate_binop(expression, *common_params)
-    elif isinstance(expression, ast.Compare):
-        # Comparison -> evaluate the comparison
-        return evaluate_condition(expression, *common_params)
-    elif isinstance(expression, ast.Lambda):
-        return evaluate_lambda(expression, *common_params)
-    elif isinstance(expression, ast.FunctionDef):
-        return evaluate_function_def(expression, *common_params)
-    elif isinstance(expression, ast.Dict):
-        # Dict -> evaluate all keys and values
-        keys = (evaluate_ast(k, *common_params) for k in expression.keys)
-        values = (evaluate_ast(v, *common_params) for v in expression.values)
-        return dict(zip(keys, values))
-    elif isinstance(expression, ast.Expr):
-        # Expression -> evaluate the content
-        return evaluate_ast(expression.value, *common_params)
-    elif isinstance(expression, ast.For):
-        # For loop -> execute the loop
-        return evaluate_for(expression, *common_params)
-    elif isinstance(expression, ast.FormattedValue):
-        # Formatted value (part of f-string) -> evaluate the content and format it
-        value = evaluate_ast(expression.value, *common_params)
-        # Early return if no format spec
-        if not expression.format_spec:
-            return value
-        # Apply format specification
-        format_spec = evaluate_ast(expression.format_spec, *common_params)
-        return format(value, format_spec)
-    elif isinstance(expression, ast.If):
-        # If -> execute the right branch
-        return evaluate_if(expression, *common_params)
-    elif hasattr(ast, "Index") and isinstance(expression, ast.Index):
-        return evaluate_ast(expression.value, *common_params)
-    elif isinstance(expression, ast.JoinedStr):
-        return "".join([str(evaluate_ast(v, *common_params)) for v in expression.values])
-    elif isinstance(expression, ast.List):
-        # List -> evaluate all elements
-        return [evaluate_ast(elt, *common_params) for elt in expression.elts]
-    elif isinstance(expression, ast.Name):
-        # Name -> pick up the value in the state
-        return evaluate_name(expression, *common_params)
-    elif isinstance(expression, ast.Subscript):
-        # Subscript -> return the value of the indexing
-        return evaluate_subscript(expression, *common_params)
-    elif isinstance(expression, ast.IfExp):
-        test_val = evaluate_ast(expression.test, *common_params)
-        if test_val:
-            return evaluate_ast(expression.body, *common_params)
-        else:
-            return evaluate_ast(expression.orelse, *common_params)
-    elif isinstance(expression, ast.Attribute):
-        return evaluate_attribute(expression, *common_params)
-    elif isinstance(expression, ast.Slice):
-        return slice(
-            evaluate_ast(expression.lower, *common_params) if expression.lower is not None else None,
-            evaluate_ast(expression.upper, *common_params) if expression.upper is not None else None,
-            evaluate_ast(expression.step, *common_params) if expression.step is not None else None,
-        )
-    elif isinstance(expression, ast.While):
-        return evaluate_while(expression, *common_params)
-    elif isinstance(expression, (ast.Import, ast.ImportFrom)):
-        return evaluate_import(expression, state, authorized_imports)
-    elif isinstance(expression, ast.ClassDef):
-        return evaluate_class_def(expression, *common_params)
-    elif isinstance(expression, ast.Try):
-        return evaluate_try(expression, *common_params)
-    elif isinstance(expression, ast.Raise):
-        return evaluate_raise(expression, *common_params)
-    elif isinstance(expression, ast.Assert):
-        return evaluate_assert(expression, *common_params)
-    elif isinstance(expression, ast.With):
-        return evaluate_with(expression, *common_params)
-    elif isinstance(expression, ast.Set):
-        return set((evaluate_ast(elt, *common_params) for elt in expression.elts))
-    elif isinstance(expression, ast.Return):
-        raise ReturnException(evaluate_ast(expression.value, *common_params) if expression.value else None)
-    elif isinstance(expression, ast.Pass):
-        return None
-    elif isinstance(expression, ast.Delete):
-        return evaluate_delete(expression, *common_params)
-    else:
+    operations_count["counter"] += 1
+
+    evaluator = get_evaluator(type(expression))
+    if evaluator is None:
         # For now we refuse anything else. Let's add things as we need them.
         raise InterpreterError(f"{expression.__class__.__name__} is not supported.")
+    return evaluator(expression, state, static_tools, custom_tools, authorized_imports)
+
+
+@lru_cache(maxsize=256)
+def parse_code(code: str) -> ast.Module:
+    """
+    Parse code, caching the tree by source.
+
+    Agents often re-run the same snippet, and the evaluator never mutates the tree, so parsed programs are shared.
+    """
+    return ast.parse(code)
 
 
 class FinalAnswerException(Exception):
@@ -1495,7 +1605,7 @@ def evaluate_python_code(
             The print outputs will be stored in the state under the key "_print_outputs".
     """
     try:
-        expression = ast.parse(code)
+        expression = parse_code(code)
     except SyntaxError as e:
         raise InterpreterError(
             f"Code parsing failed on line {e.lineno} due to: {type(e).__name__}\n"
@@ -1506,7 +1616,7 @@ def evaluate_python_code(
 
     if state is None:
         state = {}
-    static_tools = static_tools.copy() if static_tools is not None else {}
+    static_tools = StaticTools(static_tools) if static_tools is not None else StaticTools()
     custom_tools = custom_tools if custom_tools is not None else {}
     result = None
     state["_print_outputs"] = PrintContainer()
@@ -16,9 +16,11 @@
 # limitations under the License.
 import base64
 import json
+import os
 import pickle
 import re
 import time
+import uuid
 from io import BytesIO
 from pathlib import Path
 from textwrap import dedent
@@ -28,18 +30,18 @@ import PIL.Image
 import requests
 
 from src.tools.executor.local_python_executor import PythonExecutor
+from src.tools.executor.large_objects import (
+    DEFAULT_LARGE_OBJECT_THRESHOLD,
+    EXPORT_HELPER_CODE,
+    LargeObjectHandle,
+    RESULT_HANDLE_PREFIX,
+    RESULT_PICKLE_PREFIX,
+    parse_result_line,
+)
 from src.logger import LogLevel
 from src.tools.tools import get_tools_definition_code
 from src.exception import AgentError
 
-try:
-    from dotenv import load_dotenv
-
-    load_dotenv()
-except ModuleNotFoundError:
-    pass
-
-
 class RemotePythonExecutor(PythonExecutor):
     def __init__(self, additional_imports: list[str], logger):
         self.additional_imports = additional_imports
@@ -161,6 +163,8 @@ class DockerExecutor(RemotePythonExecutor):
     Executes Python code using Jupyter Kernel Gateway in a Docker container.
     """
 
+    CONTAINER_SHARED_DIR = "/shared"
+
     def __init__(
         self,
         additional_imports: list[str],
@@ -170,6 +174,9 @@ class DockerExecutor(RemotePythonExecutor):
         image_name: str = "jupyter-kernel",
         build_new_image: bool = True,
         container_run_kwargs: dict[str, Any] | None = None,
+        shared_dir: str | None = None,
+        large_object_threshold: int = DEFAULT_LARGE_OBJECT_THRESHOLD,
+        return_large_object_handles: bool = False,
     ):
         """
         Initialize the Docker-based Jupyter Kernel Gateway executor.
@@ -182,6 +189,11 @@ class DockerExecutor(RemotePythonExecutor):
             image_name: Name of the Docker image to use. If the image doesn't exist, it will be built.
             build_new_image: If True, the image will be rebuilt even if it already exists.
             container_run_kwargs: Additional keyword arguments to pass to the Docker container run command.
+            shared_dir: Host directory mounted in the container. Results and variables larger than
+                `large_object_threshold` bytes go through files there instead of the kernel websocket.
+            large_object_threshold: Size in bytes above which objects use the shared directory.
+            return_large_object_handles: Return large results as `LargeObjectHandle`s loaded on demand instead of
+                the results themselves. Handles not released by the caller are released on cleanup.
         """
         super().__init__(additional_imports, logger)
         try:
@@ -194,6 +206,10 @@ class DockerExecutor(RemotePythonExecutor):
         self.host = host
         self.port = port
         self.image_name = image_name
+        self.shared_dir = os.path.abspath(shared_dir) if shared_dir is not None else None
+        self.large_object_threshold = large_object_threshold
+        self.return_large_object_handles = return_large_object_handles
+        self._large_object_handles = []
 
         # Initialize Docker
         try:
@@ -248,6 +264,11 @@ class DockerExecutor(RemotePythonExecutor):
                 container_kwargs["ports"] = {}
             container_kwargs["ports"]["8888/tcp"] = (host, port)
             container_kwargs["detach"] = True
+            if self.shared_dir is not None:
+                os.makedirs(self.shared_dir, exist_ok=True)
+                if not isinstance(container_kwargs.get("volumes"), dict):
+                    container_kwargs["volumes"] = {}
+                container_kwargs["volumes"][self.shared_dir] = {"bind": self.CONTAINER_SHARED_DIR, "mode": "rw"}
 
             self.container = self.client.containers.run(self.image_name, **container_kwargs)
 
@@ -280,6 +301,9 @@ class DockerExecutor(RemotePythonExecutor):
             ws_url = f"ws://{host}:{port}/api/kernels/{self.kernel_id}/channels"
             self.ws = create_connection(ws_url)
 
+            if self.shared_dir is not None:
+                self.run_code_raise_errors(EXPORT_HELPER_CODE)
+
             self.installed_packages = self.install_packages(additional_imports)
             self.logger.log(
                 f"Container {self.container.short_id} is running with kernel {self.kernel_id}", level=LogLevel.INFO
@@ -299,11 +323,17 @@ class DockerExecutor(RemotePythonExecutor):
                 if match:
                     pre_final_answer_code = self.final_answer_pattern.sub("", code_action)
                     result_expr = match.group(1)
-                    wrapped_code = pre_final_answer_code + dedent(f"""
-                        import pickle, base64
-                        _result = {result_expr}
-                        print("RESULT_PICKLE:" + base64.b64encode(pickle.dumps(_result)).decode())
-                        """)
+                    if self.shared_dir is not None:
+                        wrapped_code = pre_final_answer_code + dedent(f"""
+                            _result = {result_expr}
+                            _export_result(_result, {self.CONTAINER_SHARED_DIR!r}, {self.large_object_threshold})
+                            """)
+                    else:
+                        wrapped_code = pre_final_answer_code + dedent(f"""
+                            import pickle, base64
+                            _result = {result_expr}
+                            print("{RESULT_PICKLE_PREFIX}" + base64.b64encode(pickle.dumps(_result)).decode())
+                            """)
             else:
                 wrapped_code = code_action
 
@@ -326,9 +356,12 @@ class DockerExecutor(RemotePythonExecutor):
 
                 if msg_type == "stream":
                     text = msg["content"]["text"]
-                    if return_final_answer and text.startswith("RESULT_PICKLE:"):
-                        pickle_data = text[len("RESULT_PICKLE:") :].strip()
-                        result = pickle.loads(base64.b64decode(pickle_data))
+                    if return_final_answer and text.startswith((RESULT_PICKLE_PREFIX, RESULT_HANDLE_PREFIX)):
+                        # Large results are loaded from the shared directory, or returned as handles on opt-in
+                        _, result = parse_result_line(text, self.shared_dir,
+                                                      materialize=not self.return_large_object_handles)
+                        if isinstance(result, LargeObjectHandle):
+                            self._large_object_handles.append(result)
                         waiting_for_idle = True
                     else:
                         outputs.append(text)
@@ -345,10 +378,31 @@ class DockerExecutor(RemotePythonExecutor):
             self.logger.log_error(f"Code execution failed: {e}")
             raise
 
+    def send_variables(self, variables: dict):
+        """
+        Send variables to the kernel namespace, through the shared directory when they are large.
+        """
+        pickled_vars = pickle.dumps(variables)
+        if self.shared_dir is None or len(pickled_vars) < self.large_object_threshold:
+            return super().send_variables(variables)
+
+        name = f"{uuid.uuid4().hex}.pkl"
+        path = os.path.join(self.shared_dir, name)
+        with open(path, "wb") as f:
+            f.write(pickled_vars)
+        try:
+            code = f"""
+import pickle, os
+with open({os.path.join(self.CONTAINER_SHARED_DIR, name)!r}, "rb") as f:
+    vars_dict = pickle.load(f)
+locals().update(vars_dict)
+"""
+            self.run_code_raise_errors(code)
+        finally:
+            os.remove(path)
+
     def _send_execute_request(self, code: str) -> str:
         """Send code execution request to kernel."""
-        import uuid
-
         # Generate a unique message ID
         msg_id = str(uuid.uuid4())
 
@@ -377,6 +431,9 @@ class DockerExecutor(RemotePythonExecutor):
 
     def cleanup(self):
         """Clean up resources."""
+        for handle in getattr(self, "_large_object_handles", []):
+            handle.release()
+        self._large_object_handles = []
         try:
             if hasattr(self, "container"):
                 self.logger.log(f"Stopping and removing container {self.container.short_id}...", level=LogLevel.INFO)
@@ -0,0 +1,327 @@
+"""Pool of pre-warmed sandbox worker processes for the python interpreter.
+
+Code is still evaluated by the restricted interpreter of `local_python_executor`, but in separate processes, so
+CPU-heavy snippets do not block the agent event loop, the slow imports (numpy, pandas) are paid once per worker,
+and a snippet that runs away can be limited or killed without taking the agent down.
+
+Calls made under the same session id (see `python_session_id`) are routed to the same worker, whose interpreter
+state for that session persists between calls.
+"""
+import asyncio
+import contextvars
+import importlib
+import multiprocessing
+import time
+from typing import Any, Dict, List, Optional
+
+from src.logger import logger
+
+try:
+    import resource
+    import signal
+except ImportError:  # not available on Windows, limits are then only enforced by the wall-clock timeout
+    resource = None
+    signal = None
+
+# Session of the current agent task, e.g. its task id. Calls without a session get a fresh state.
+python_session_id: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar("python_session_id", default=None)
+
+
+class CPUTimeLimitExceeded(Exception):
+    pass
+
+
+def _raise_cpu_time_limit(signum, frame):
+    raise CPUTimeLimitExceeded("CPU time limit exceeded")
+
+
+def _set_cpu_time_limit(cpu_time_limit: Optional[float]):
+    """Limit the CPU time of the next call, on top of what the worker already used."""
+    if resource is None or cpu_time_limit is None:
+        return
+    _, hard = resource.getrlimit(resource.RLIMIT_CPU)
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    soft = int(usage.ru_utime + usage.ru_stime + cpu_time_limit) + 1
+    if hard != resource.RLIM_INFINITY:
+        soft = min(soft, hard)
+    resource.setrlimit(resource.RLIMIT_CPU, (soft, hard))
+
+
+def _clear_cpu_time_limit(cpu_time_limit: Optional[float]):
+    if resource is None or cpu_time_limit is None:
+        return
+    _, hard = resource.getrlimit(resource.RLIMIT_CPU)
+    resource.setrlimit(resource.RLIMIT_CPU, (hard, hard))
+
+
+def _worker_main(conn,
+                 authorized_imports: List[str],
+                 warm_imports: List[str],
+                 memory_limit_mb: Optional[int],
+                 cpu_time_limit: Optional[float],
+                 session_ttl: Optional[float]):
+    """Entry point of a worker process: evaluate the code received on `conn` until told to stop."""
+    from src.tools.executor.local_python_executor import BASE_PYTHON_TOOLS, evaluate_python_code
+
+    if resource is not None and memory_limit_mb is not None:
+        limit = memory_limit_mb * 1024 * 1024
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+    if signal is not None and cpu_time_limit is not None:
+        signal.signal(signal.SIGXCPU, _raise_cpu_time_limit)
+
+    for module_name in warm_imports:
+        try:
+            importlib.import_module(module_name)
+        except ImportError:
+            pass
+
+    states: Dict[str, Dict[str, Any]] = {}
+    last_used: Dict[str, float] = {}
+    conn.send({"ready": True})
+
+    while True:
+        try:
+            request = conn.recv()
+        except (EOFError, KeyboardInterrupt):
+            break
+        if request is None:
+            break
+
+        now = time.time()
+        if session_ttl is not None:
+            for session_id in [s for s, t in last_used.items() if now - t > session_ttl]:
+                states.pop(session_id, None)
+                last_used.pop(session_id, None)
+
+        session_id = request.get("session_id")
+        if session_id is None:
+            state = {}
+        else:
+            state = states.setdefault(session_id, {"__name__": "__main__"})
+            last_used[session_id] = now
+
+        response = {"output": None, "logs": "", "error": None}
+        try:
+            _set_cpu_time_limit(cpu_time_limit)
+            output, _ = evaluate_python_code(
+                request["code"],
+                state=state,
+                static_tools=BASE_PYTHON_TOOLS,
+                authorized_imports=authorized_imports,
+            )
+            response["output"] = str(output)
+        except Exception as e:
+            response["error"] = str(e)
+        finally:
+            _clear_cpu_time_limit(cpu_time_limit)
+        response["logs"] = str(state.get("_print_outputs", ""))
+        conn.send(response)
+
+
+class _Worker():
+    def __init__(self, index: int):
+        self.index = index
+        self.process = None
+        self.conn = None
+        self.calls = 0
+        self.sessions: Dict[str, float] = {}  # session id -> last use
+        self.lock = asyncio.Lock()
+
+    def alive(self) -> bool:
+        return self.process is not None and self.process.is_alive()
+
+    def kill(self):
+        if self.process is not None:
+            if self.process.is_alive():
+                self.process.kill()
+            self.process.join(timeout=5)
+        if self.conn is not None:
+            self.conn.close()
+        self.process = None
+        self.conn = None
+        self.calls = 0
+        self.sessions = {}
+
+
+class SandboxWorkerPool():
+    def __init__(self,
+                 size: int = 2,
+                 authorized_imports: Optional[List[str]] = None,
+                 warm_imports: Optional[List[str]] = None,
+                 timeout: float = 120,
+                 cpu_time_limit: Optional[float] = None,
+                 memory_limit_mb: Optional[int] = None,
+                 max_calls_per_worker: int = 200,
+                 session_ttl: Optional[float] = 3600,
+                 startup_timeout: float = 120,
+                 ):
+        """
+        Keep `size` sandbox worker processes ready to evaluate python code.
+
+        Args:
+            size (int): The number of worker processes.
+            authorized_imports (List[str], optional): Modules the evaluated code may import.
+            warm_imports (List[str], optional): Modules imported when a worker starts, if installed.
+            timeout (float): Wall-clock seconds after which a call is aborted and its worker restarted.
+            cpu_time_limit (float, optional): CPU seconds a single call may use.
+            memory_limit_mb (int, optional): Address space limit of a worker, in MB.
+            max_calls_per_worker (int): Calls after which a worker holding no session is replaced by a fresh one.
+            session_ttl (float, optional): Seconds of inactivity after which a session state is dropped.
+            startup_timeout (float): Seconds to wait for a worker to start and warm up.
+        """
+        self.size = max(1, size)
+        self.authorized_imports = list(authorized_imports or [])
+        self.warm_imports = list(warm_imports or [])
+        self.timeout = timeout
+        self.cpu_time_limit = cpu_time_limit
+        self.memory_limit_mb = memory_limit_mb
+        self.max_calls_per_worker = max_calls_per_worker
+        self.session_ttl = session_ttl
+        self.startup_timeout = startup_timeout
+
+        self._context = multiprocessing.get_context("spawn")
+        self._workers: Optional[List[_Worker]] = None
+        self._affinity: Dict[str, _Worker] = {}
+        self._recycling = set()
+
+    def _spawn(self, worker: _Worker):
+        parent_conn, child_conn = self._context.Pipe()
+        process = self._context.Process(
+            target=_worker_main,
+            args=(child_conn,
+                  self.authorized_imports,
+                  self.warm_imports,
+                  self.memory_limit_mb,
+                  self.cpu_time_limit,
+                  self.session_ttl),
+            daemon=True,
+        )
+        process.start()
+        child_conn.close()
+        worker.process = process
+        worker.conn = parent_conn
+
+    async def _start(self, worker: _Worker):
+        """(Re)start a worker and wait until it is warm. The caller holds the worker lock."""
+        worker.kill()
+        for session_id in [s for s, w in self._affinity.items() if w is worker]:
+            del self._affinity[session_id]
+        self._spawn(worker)
+        ready = await asyncio.to_thread(worker.conn.poll, self.startup_timeout)
+        if not ready:
+            worker.kill()
+            raise TimeoutError(f"Sandbox worker {worker.index} did not start within {self.startup_timeout}s")
+        worker.conn.recv()
+
+    async def start(self):
+        """Start and warm up every worker."""
+        if self._workers is not None:
+            return
+        self._workers = [_Worker(index) for index in range(self.size)]
+
+        async def start_worker(worker):
+            async with worker.lock:
+                await self._start(worker)
+
+        await asyncio.gather(*[start_worker(worker) for worker in self._workers])
+        logger.info(f"| Sandbox worker pool started with {self.size} workers.")
+
+    def _expire_sessions(self, worker: _Worker):
+        if self.session_ttl is None:
+            return
+        now = time.time()
+        for session_id in [s for s, t in worker.sessions.items() if now - t > self.session_ttl]:
+            del worker.sessions[session_id]
+            if self._affinity.get(session_id) is worker:
+                del self._affinity[session_id]
+
+    def _pick_worker(self, session_id: Optional[str]) -> _Worker:
+        if session_id is not None and session_id in self._affinity:
+            return self._affinity[session_id]
+        for worker in self._workers:
+            self._expire_sessions(worker)
+        # Prefer an idle worker, then the one serving the fewest sessions
+        worker = min(self._workers, key=lambda w: (w.lock.locked(), len(w.sessions)))
+        if session_id is not None:
+            self._affinity[session_id] = worker
+        return worker
+
+    async def run(self, code: str, session_id: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Evaluate `code` in a worker.
+
+        Args:
+            code (str): The code to evaluate.
+            session_id (str, optional): Calls with the same session id share their interpreter state.
+
+        Returns:
+            Dict[str, Any]: The `output` (str), the print `logs` and the `error` message, if any.
+        """
+        await self.start()
+        worker = self._pick_worker(session_id)
+
+        async with worker.lock:
+            if not worker.alive():
+                await self._start(worker)
+                if session_id is not None:
+                    self._affinity[session_id] = worker
+
+            if session_id is not None:
+                worker.sessions[session_id] = time.time()
+            worker.calls += 1
+            worker.conn.send({"code": code, "session_id": session_id})
+
+            try:
+                ready = await asyncio.to_thread(worker.conn.poll, self.timeout)
+                response = worker.conn.recv() if ready else None
+            except (EOFError, OSError):
+                ready, response = True, None
+            except BaseException:
+                # Cancelled while the worker evaluates, e.g. by a step timeout: its response would be read
+                # by the next call on this worker, so the worker is killed and restarted by the next call
+                worker.kill()
+                raise
+
+            if response is None:
+                if ready:
+                    error = "Sandbox worker crashed, possibly because it ran out of memory"
+                else:
+                    error = f"Code execution timed out after {self.timeout}s"
+                logger.warning(f"| {error}, restarting sandbox worker {worker.index}.")
+                worker.kill()
+                response = {"output": None, "logs": "", "error": error}
+
+        if worker.alive() and worker.calls >= self.max_calls_per_worker and not worker.sessions:
+            self._recycle(worker)
+        return response
+
+    def _recycle(self, worker: _Worker):
+        if worker in self._recycling:
+            return
+
+        async def recycle():
+            try:
+                async with worker.lock:
+                    if worker.calls >= self.max_calls_per_worker and not worker.sessions:
+                        await self._start(worker)
+            except Exception as e:
+                logger.warning(f"| Failed to recycle sandbox worker {worker.index}: {e}")
+            finally:
+                self._recycling.discard(worker)
+
+        self._recycling.add(worker)
+        asyncio.create_task(recycle())
+
+    async def close(self):
+        """Stop every worker."""
+        if self._workers is None:
+            return
+        for worker in self._workers:
+            if worker.alive():
+                try:
+                    worker.conn.send(None)
+                except (OSError, BrokenPipeError):
+                    pass
+            await asyncio.to_thread(worker.kill)
+        self._workers = None
+        self._affinity = {}
@@ -1,6 +1,10 @@
+from typing import Optional
+
 from src.tools import AsyncTool, ToolResult
-from src.models import Model
+from src.models import Model, model_manager
 from src.tools.markdown.mdconvert import MarkitdownConverter
+from src.tools.map_reduce import MapReduceReader
+from src.utils.token_utils import get_token_count
 from src.registry import TOOL
 
 
@@ -28,7 +32,13 @@ class FileReaderTool(AsyncTool):
     }
     output_type = "any"
 
-    def __init__(self, text_limit: int = 50000):
+    def __init__(self, text_limit: Optional[int] = None, summarizer_model_id: Optional[str] = None):
+        """
+        Args:
+            text_limit (int, optional): Token budget of the returned content, None returns the whole content.
+            summarizer_model_id (str, optional): Content over `text_limit` is map-reduced into notes by this model.
+                It is truncated if None.
+        """
         super().__init__()
         self.text_limit = text_limit
 
@@ -38,12 +48,34 @@ class FileReaderTool(AsyncTool):
             timeout = 30
         )
 
+        self.map_reduce_reader = None
+        if summarizer_model_id is not None:
+            self.map_reduce_reader = MapReduceReader(model=model_manager.registed_models[summarizer_model_id],
+                                                     model_id=summarizer_model_id,
+                                                     cache=self.converter.cache)
+
+    async def _fit(self, text: str, file_path: str) -> str:
+        """The content within `text_limit` tokens, as notes of the whole file or truncated."""
+        if self.text_limit is None:
+            return text
+        if self.map_reduce_reader is not None:
+            return await self.map_reduce_reader.read(text,
+                                                     task="Keep the overall content of the file.",
+                                                     source=file_path,
+                                                     max_tokens=self.text_limit)
+        num_tokens = get_token_count(text)
+        if num_tokens <= self.text_limit:
+            return text
+        # Tokens are about 4 characters, cut proportionally
+        text = text[:int(len(text) * self.text_limit / num_tokens)]
+        return text + f"\n\n[Truncated to the first {self.text_limit} of {num_tokens} tokens]"
+
     async def forward(self,
                 file_path: str) -> ToolResult:
         """Read a file and return its content as text."""
 
         try:
-            result = self.converter.convert(file_path)
+            result = await self.converter.aconvert(file_path)
         except Exception as e:
             return ToolResult(
                 output=None,
@@ -51,7 +83,7 @@ class FileReaderTool(AsyncTool):
             )
 
         result = ToolResult(
-            output=result.text_content,
+            output=await self._fit(result.text_content, file_path),
             error=None
         )
 
@@ -0,0 +1,140 @@
+"""Map-reduce reading of texts larger than a model context.
+
+The text is split into token-budgeted chunks. The map step turns every chunk into dense notes, concurrently, and does
+not depend on the task, so the notes are cached by chunk and reused by follow-up questions on the same file. The
+reduce step merges groups of notes with the task in mind, level by level, until they fit the requested budget.
+"""
+import json
+import asyncio
+import hashlib
+from typing import List, Optional
+
+from src.models import ChatMessage
+from src.models.base import MessageRole
+from src.tools.markdown.cache import ConversionCache
+from src.utils.token_utils import get_token_count, split_by_tokens
+from src.logger import logger
+
+# Part of the cache key of the notes, bump it when MAP_PROMPT changes
+MAP_PROMPT_VERSION = "1"
+
+MAP_PROMPT = """Below is one part of a longer document. Write dense notes of this part for a reader who cannot see it. Keep every fact, number, name, date, table row and quotation that could matter, in the order they appear. Do not add anything that is not in the text.
+
+Part of the document:
+{chunk}"""
+
+REDUCE_PROMPT = """Below are notes on consecutive parts of {source}. Merge them into one set of notes of at most about {max_tokens} tokens. Keep everything relevant to the task first, with its exact numbers, names and quotations, and drop repetitions.
+
+Task: {task}
+
+Notes:
+{notes}"""
+
+
+class MapReduceReader():
+    def __init__(self,
+                 model,
+                 model_id: str,
+                 chunk_tokens: int = 8000,
+                 max_concurrency: int = 4,
+                 cache: Optional[ConversionCache] = None,
+                 token_model: str = "gpt-4o",
+                 ):
+        """
+        Args:
+            model: The model writing and merging the notes.
+            model_id (str): Its id, part of the cache key of the notes.
+            chunk_tokens (int): Token budget of a chunk and of a group of notes merged at once.
+            max_concurrency (int): Model calls at once.
+            cache (ConversionCache, optional): Cache of the notes of every chunk.
+            token_model (str): The tokenizer used to count tokens.
+        """
+        self.model = model
+        self.model_id = model_id
+        self.chunk_tokens = chunk_tokens
+        self.cache = cache
+        self.token_model = token_model
+        self.max_concurrency = max_concurrency
+
+    def count_tokens(self, text: str) -> int:
+        return get_token_count(text, model=self.token_model)
+
+    async def _complete(self, prompt: str, semaphore: asyncio.Semaphore) -> str:
+        messages = [ChatMessage.from_dict({
+            "role": MessageRole.USER,
+            "content": [{"type": "text", "text": prompt}],
+        })]
+        async with semaphore:
+            response = await self.model(messages=messages)
+        if not response.content:
+            # A refusal or a filtered response, an empty note keeps the others usable
+            logger.warning("| The model returned no content for a map-reduce step")
+            return ""
+        return response.content
+
+    def _cache_key(self, chunk: str) -> str:
+        return hashlib.sha256(json.dumps({
+            "chunk": hashlib.sha256(chunk.encode("utf-8")).hexdigest(),
+            "model_id": self.model_id,
+            "prompt": MAP_PROMPT_VERSION,
+        }, sort_keys=True).encode("utf-8")).hexdigest()[:32]
+
+    async def _map_chunk(self, chunk: str, semaphore: asyncio.Semaphore) -> str:
+        key = self._cache_key(chunk) if self.cache is not None else None
+        if key is not None:
+            entry = self.cache.get(key)
+            if entry is not None:
+                return entry["notes"]
+        notes = await self._complete(MAP_PROMPT.format(chunk=chunk), semaphore)
+        if key is not None and notes:
+            self.cache.put(key, {"notes": notes})
+        return notes
+
+    async def map(self, text: str) -> List[str]:
+        """Notes of every chunk of `text`, in order."""
+        chunks = split_by_tokens(text, self.chunk_tokens, model=self.token_model)
+        logger.info(f"| Reading {len(chunks)} chunks of {self.chunk_tokens} tokens")
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        return list(await asyncio.gather(*[self._map_chunk(chunk, semaphore) for chunk in chunks]))
+
+    def _group(self, notes: List[str]) -> List[List[str]]:
+        """Consecutive groups of notes within `chunk_tokens`, at least two notes per group so every level shrinks."""
+        groups, current, current_tokens = [], [], 0
+        for note in notes:
+            tokens = self.count_tokens(note)
+            if len(current) >= 2 and current_tokens + tokens > self.chunk_tokens:
+                groups.append(current)
+                current, current_tokens = [], 0
+            current.append(note)
+            current_tokens += tokens
+        if current:
+            if len(current) == 1 and groups:
+                groups[-1].extend(current)
+            else:
+                groups.append(current)
+        return groups
+
+    async def reduce(self, notes: List[str], task: str, source: str, max_tokens: int) -> str:
+        """Merge the notes level by level until they fit in `max_tokens`."""
+        level, semaphore = 0, asyncio.Semaphore(self.max_concurrency)
+        while len(notes) > 1 and self.count_tokens("\n\n".join(notes)) > max_tokens:
+            level += 1
+            groups = self._group(notes)
+            budget = max(max_tokens // len(groups), 256)
+            logger.info(f"| Merging {len(notes)} notes into {len(groups)} at level {level}")
+            notes = list(await asyncio.gather(*[
+                self._complete(REDUCE_PROMPT.format(source=source,
+                                                    max_tokens=budget,
+                                                    task=task,
+                                                    notes="\n\n".join(group)),
+                               semaphore)
+                for group in groups
+            ]))
+        return "\n\n".join(notes)
+
+    async def read(self, text: str, task: str, source: str, max_tokens: int) -> str:
+        """`text` itself when it fits in `max_tokens`, otherwise notes on it focused on `task`."""
+        if self.count_tokens(text) <= max_tokens:
+            return text
+        notes = await self.map(text)
+        return await self.reduce(notes, task=task, source=source, max_tokens=max_tokens)
@@ -1,5 +1,16 @@
-from src.tools.markdown.mdconvert import MarkitdownConverter
+from src.utils.lazy_utils import lazy_exports
+
+# Names are imported from their module on first use, the converters import markitdown, pdfminer and litellm
+_EXPORTS = {
+    "MarkitdownConverter": "src.tools.markdown.mdconvert",
+    "ConversionCache": "src.tools.markdown.cache",
+    "get_conversion_cache": "src.tools.markdown.cache",
+}
+
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
 
 __all__ = [
     "MarkitdownConverter",
-]
\ No newline at end of file
+    "ConversionCache",
+    "get_conversion_cache",
+]
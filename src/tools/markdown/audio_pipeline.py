@@ -0,0 +1,182 @@
+"""Chunked, concurrent audio transcription.
+
+A long recording is split into chunks of about `chunk_seconds`, each cut at the quietest pause before the chunk end
+so words are not split, and the chunks are transcribed concurrently. Every chunk stays far below the size limit of the
+transcription APIs and the whole file takes about as long as its slowest chunk. A failed chunk is retried, and when
+it still fails the caller falls back to transcribing the whole file at once. Transcripts of chunks are cached by the
+hash of their audio samples, so a rerun only transcribes what it has not seen.
+"""
+import io
+import json
+import asyncio
+import hashlib
+import threading
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, List, Optional
+
+from src.tools.markdown.cache import ConversionCache
+from src.logger import logger
+
+try:
+    from pydub import AudioSegment
+    from pydub.silence import detect_silence
+except ImportError:
+    AudioSegment = None
+    detect_silence = None
+
+
+@dataclass
+class AudioChunk():
+    start_ms: int
+    end_ms: int
+    data: bytes  # encoded audio of the chunk
+    digest: str  # hash of the chunk samples
+
+
+def format_timestamp(ms: int) -> str:
+    seconds = ms // 1000
+    return f"{seconds // 3600:02d}:{seconds % 3600 // 60:02d}:{seconds % 60:02d}"
+
+
+def find_cut(audio, start_ms: int, end_ms: int, min_silence_ms: int, silence_thresh: float) -> int:
+    """The middle of the longest pause in [start_ms, end_ms], or `end_ms` without any pause."""
+    silences = detect_silence(audio[start_ms:end_ms], min_silence_len=min_silence_ms, silence_thresh=silence_thresh)
+    if not silences:
+        return end_ms
+    begin, end = max(silences, key=lambda silence: silence[1] - silence[0])
+    return start_ms + (begin + end) // 2
+
+
+def split_audio(audio,
+                chunk_seconds: float = 120,
+                search_seconds: float = 15,
+                min_silence_ms: int = 400,
+                export_format: str = "mp3") -> List[AudioChunk]:
+    """Split a pydub `AudioSegment` into chunks cut at pauses."""
+    chunk_ms, search_ms = int(chunk_seconds * 1000), int(search_seconds * 1000)
+    silence_thresh = audio.dBFS - 16 if audio.dBFS != float("-inf") else -60
+
+    chunks, start = [], 0
+    while start < len(audio):
+        end = min(start + chunk_ms, len(audio))
+        if end < len(audio):
+            end = find_cut(audio, max(start + 1, end - search_ms), end, min_silence_ms, silence_thresh)
+        segment = audio[start:end]
+        buffer = io.BytesIO()
+        segment.export(buffer, format=export_format)
+        chunks.append(AudioChunk(start_ms=start,
+                                 end_ms=end,
+                                 data=buffer.getvalue(),
+                                 digest=hashlib.sha256(segment.raw_data).hexdigest()))
+        start = end
+    return chunks
+
+
+def run_sync(coroutine: Awaitable) -> Any:
+    """Run a coroutine from synchronous code, also when the calling thread already runs an event loop."""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coroutine)
+
+    result = {}
+
+    def target():
+        try:
+            result["value"] = asyncio.run(coroutine)
+        except BaseException as e:
+            result["error"] = e
+
+    thread = threading.Thread(target=target)
+    thread.start()
+    thread.join()
+    if "error" in result:
+        raise result["error"]
+    return result["value"]
+
+
+async def transcribe_chunks(chunks: List[AudioChunk],
+                            transcribe: Callable[[io.BytesIO], Awaitable[str]],
+                            max_concurrency: int = 8,
+                            cache: Optional[ConversionCache] = None,
+                            cache_options: Optional[dict] = None,
+                            export_format: str = "mp3",
+                            max_retries: int = 2,
+                            retry_delay: float = 1.0) -> List[str]:
+    """
+    Transcribe the chunks concurrently, at most `max_concurrency` at once, in chunk order. A chunk is retried
+    `max_retries` times with a growing delay, its last error is raised.
+    """
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def transcribe_chunk(chunk: AudioChunk) -> str:
+        key = None
+        if cache is not None:
+            key = hashlib.sha256(json.dumps({"audio_chunk": chunk.digest, "options": cache_options},
+                                            sort_keys=True).encode("utf-8")).hexdigest()[:32]
+            entry = cache.get(key)
+            if entry is not None:
+                return entry["text"]
+
+        for attempt in range(max_retries + 1):
+            try:
+                async with semaphore:
+                    file_stream = io.BytesIO(chunk.data)
+                    file_stream.name = f"chunk_{chunk.start_ms}.{export_format}"
+                    text = await transcribe(file_stream)
+                break
+            except Exception as e:
+                if attempt == max_retries:
+                    raise
+                logger.warning(f"| Transcription of the chunk at {format_timestamp(chunk.start_ms)} failed, "
+                               f"retrying: {e}")
+                await asyncio.sleep(retry_delay * 2 ** attempt)
+
+        if key is not None and text:
+            cache.put(key, {"text": text})
+        return text
+
+    return list(await asyncio.gather(*[transcribe_chunk(chunk) for chunk in chunks]))
+
+
+def stitch_transcripts(chunks: List[AudioChunk], texts: List[str]) -> str:
+    """One line per chunk, prefixed with its time range in the recording."""
+    lines = []
+    for chunk, text in zip(chunks, texts):
+        text = (text or "").strip()
+        if text:
+            lines.append(f"[{format_timestamp(chunk.start_ms)} - {format_timestamp(chunk.end_ms)}] {text}")
+    return "\n".join(lines)
+
+
+def transcribe_audio_file(file_stream,
+                          audio_format: str,
+                          transcribe: Callable[[io.BytesIO], Awaitable[str]],
+                          chunk_seconds: float = 120,
+                          max_concurrency: int = 8,
+                          cache: Optional[ConversionCache] = None,
+                          cache_options: Optional[dict] = None) -> Optional[str]:
+    """
+    Transcribe an audio stream in chunks. None without pydub, when the audio cannot be decoded or when a chunk fails
+    after its retries, the caller then transcribes the whole stream at once.
+    """
+    if AudioSegment is None:
+        return None
+    try:
+        audio = AudioSegment.from_file(file_stream, format=audio_format)
+    except Exception as e:
+        logger.warning(f"| Cannot split the audio into chunks: {e}")
+        return None
+
+    chunks = split_audio(audio, chunk_seconds=chunk_seconds)
+    logger.info(f"| Transcribing {len(audio) / 1000:.0f}s of audio in {len(chunks)} chunks")
+    try:
+        texts = run_sync(transcribe_chunks(chunks,
+                                           transcribe,
+                                           max_concurrency=max_concurrency,
+                                           cache=cache,
+                                           cache_options=cache_options))
+    except Exception as e:
+        logger.warning(f"| Chunked transcription failed: {e}")
+        return None
+    return stitch_transcripts(chunks, texts)
@@ -0,0 +1,150 @@
+"""On-disk cache of file to markdown conversions.
+
+Converting a pdf with table extraction or transcribing an audio file takes from seconds to minutes, and the same
+attachments are converted by several tools and again in every run. Conversions are stored on disk keyed by the
+sha256 of the file content and the converter version and options, the least recently used entries are evicted past
+`max_bytes`, and concurrent conversions of the same file within a process run once.
+"""
+import os
+import json
+import hashlib
+import threading
+from typing import Any, Dict, Optional, Tuple
+
+from src.logger import logger
+
+
+def _hash(obj: Any) -> str:
+    return hashlib.sha256(json.dumps(obj, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+class ConversionCache():
+    def __init__(self, cache_dir: str, max_bytes: Optional[int] = 2 * 1024 * 1024 * 1024):
+        """
+        Args:
+            cache_dir (str): Directory of the cached conversions.
+            max_bytes (int, optional): Total size of the cache, least recently used entries are evicted past it.
+                No limit if None.
+        """
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        os.makedirs(cache_dir, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._key_locks: Dict[str, threading.Lock] = {}
+        # (path, size, mtime_ns) -> content hash, so unchanged files are hashed once per process
+        self._file_hashes: Dict[Tuple[str, int, int], str] = {}
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.size = sum(os.path.getsize(path) for path in self._entries())
+
+    def _entries(self):
+        for name in os.listdir(self.cache_dir):
+            if name.endswith(".json"):
+                yield os.path.join(self.cache_dir, name)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def file_hash(self, path: str) -> str:
+        stat = os.stat(path)
+        file_key = (os.path.abspath(path), stat.st_size, stat.st_mtime_ns)
+        digest = self._file_hashes.get(file_key)
+        if digest is None:
+            sha256 = hashlib.sha256()
+            with open(path, "rb") as f:
+                for block in iter(lambda: f.read(1024 * 1024), b""):
+                    sha256.update(block)
+            digest = self._file_hashes[file_key] = sha256.hexdigest()
+        return digest
+
+    def key(self, path: str, options: Dict[str, Any]) -> str:
+        """Key of the conversion of the file at `path` with `options`, e.g. the converter version."""
+        return _hash({"content": self.file_hash(path), "extension": os.path.splitext(path)[-1].lower(),
+                      "options": options})[:32]
+
+    def key_lock(self, key: str) -> threading.Lock:
+        with self._lock:
+            return self._key_locks.setdefault(key, threading.Lock())
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        path = self._path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning(f"| Ignoring unreadable markdown cache entry {path}: {e}")
+            self.misses += 1
+            return None
+        try:
+            os.utime(path)  # recently used
+        except OSError:
+            pass
+        self.hits += 1
+        return entry
+
+    def put(self, key: str, entry: Dict[str, Any]) -> None:
+        path = self._path(key)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(entry, f, ensure_ascii=False)
+        size = os.path.getsize(tmp_path)
+        previous = os.path.getsize(path) if os.path.exists(path) else 0
+        os.replace(tmp_path, path)
+        with self._lock:
+            self.size += size - previous
+        self.evict()
+
+    def evict(self) -> None:
+        """Remove the least recently used entries until the cache fits in `max_bytes`."""
+        if self.max_bytes is None or self.size <= self.max_bytes:
+            return
+        with self._lock:
+            entries = []
+            for path in self._entries():
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+            entries.sort()
+            self.size = sum(size for _, size, _ in entries)
+            for _, size, path in entries:
+                if self.size <= self.max_bytes:
+                    break
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+                self.size -= size
+                self.evictions += 1
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "bytes": self.size,
+            "entries": sum(1 for _ in self._entries()),
+        }
+
+
+# One cache per process, shared by every converter
+_CONVERSION_CACHE: Optional[ConversionCache] = None
+_CONVERSION_CACHE_LOCK = threading.Lock()
+
+
+def get_conversion_cache(**kwargs) -> ConversionCache:
+    """The process-wide conversion cache, created with `kwargs` on first use."""
+    global _CONVERSION_CACHE
+    with _CONVERSION_CACHE_LOCK:
+        if _CONVERSION_CACHE is None:
+            _CONVERSION_CACHE = ConversionCache(**kwargs)
+        return _CONVERSION_CACHE
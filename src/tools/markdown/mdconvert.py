@@ -1,12 +1,11 @@
 import os
-from dotenv import load_dotenv
-load_dotenv(verbose=True)
-
 from markitdown import MarkItDown
 import requests
 import io
-from typing import BinaryIO, Any
-import camelot
+from typing import BinaryIO, Any, Optional
+from importlib.metadata import version, PackageNotFoundError
+import shutil
+import asyncio
 import tempfile
 from markitdown.converters import PdfConverter
 from markitdown.converters import AudioConverter
@@ -15,22 +14,61 @@ from markitdown.converters._exiftool import exiftool_metadata
 from markitdown._stream_info import StreamInfo
 from markitdown._base_converter import DocumentConverterResult
 from markitdown._exceptions import MissingDependencyException, MISSING_DEPENDENCY_MESSAGE
-import pdfminer
-import pdfminer.high_level
-from litellm import transcription
+from litellm import transcription, atranscription
 
 from src.models import model_manager
+from src.tools.markdown.cache import ConversionCache, get_conversion_cache
+from src.tools.markdown.pdf_pipeline import pdf_to_markdown
+from src.tools.markdown.audio_pipeline import transcribe_audio_file
+from src.tools.retrieval.index import aindex_document
+from src.config import config
+from src.utils import assemble_project_path
 from src.logger import logger
 
+# Part of the conversion cache key, bump it when the converters change to invalidate the cached conversions
+CONVERTER_VERSION = "4"
+
+try:
+    MARKITDOWN_VERSION = version("markitdown")
+except PackageNotFoundError:
+    MARKITDOWN_VERSION = None
 
-def read_tables_from_stream(file_stream):
-    with tempfile.NamedTemporaryFile(suffix=".pdf", delete=True) as temp_pdf:
-        temp_pdf.write(file_stream.read())
-        temp_pdf.flush()
-        tables = camelot.read_pdf(temp_pdf.name, flavor="lattice")
-        return tables
 
-def transcribe_audio(file_stream, audio_format):
+def get_transcription_model_id() -> str:
+    return "whisper" if "whisper" in model_manager.registed_models else "gpt-4o-transcribe"
+
+
+async def atranscribe(file_stream) -> str:
+    """Transcribe one chunk, raising when the response has no text so that it is retried and never cached."""
+    if "whisper" in model_manager.registed_models:
+        # Use the Whisper model for transcription
+        return await model_manager.registed_models["whisper"].agenerate(file_stream=file_stream, raise_on_missing=True)
+    response = (await atranscription(model="gpt-4o-transcribe", file=file_stream)).json()
+    if "text" not in response:
+        raise ValueError(f"The transcription response has no text: {str(response)[:200]}")
+    return response["text"]
+
+
+def transcribe_audio(file_stream,
+                     audio_format,
+                     chunk_seconds: float = 120,
+                     max_concurrency: int = 8,
+                     cache: Optional[ConversionCache] = None):
+    """
+    Transcribe in concurrent chunks cut at pauses, or in a single request when the audio cannot be split or a chunk
+    still fails after its retries.
+    """
+    position = file_stream.tell()
+    result = transcribe_audio_file(file_stream,
+                                   audio_format=audio_format,
+                                   transcribe=atranscribe,
+                                   chunk_seconds=chunk_seconds,
+                                   max_concurrency=max_concurrency,
+                                   cache=cache,
+                                   cache_options={"model_id": get_transcription_model_id()})
+    if result is not None:
+        return result
+    file_stream.seek(position)
 
     if "whisper" in model_manager.registed_models:
         # Use the Whisper model for transcription
@@ -45,6 +83,20 @@ def transcribe_audio(file_stream, audio_format):
     return result
 
 class AudioWhisperConverter(AudioConverter):
+    def __init__(self,
+                 chunk_seconds: float = 120,
+                 max_concurrency: int = 8,
+                 cache: Optional[ConversionCache] = None):
+        """
+        Args:
+            chunk_seconds (float): Approximate length of the transcribed chunks.
+            max_concurrency (int): Chunks transcribed at once.
+            cache (ConversionCache, optional): Cache of the chunk transcripts.
+        """
+        super().__init__()
+        self.chunk_seconds = chunk_seconds
+        self.max_concurrency = max_concurrency
+        self.cache = cache
 
     def convert(
             self,
@@ -94,7 +146,11 @@ class AudioWhisperConverter(AudioConverter):
         # Transcribe
         if audio_format:
             try:
-                transcript = transcribe_audio(file_stream, audio_format=audio_format)
+                transcript = transcribe_audio(file_stream,
+                                              audio_format=audio_format,
+                                              chunk_seconds=self.chunk_seconds,
+                                              max_concurrency=self.max_concurrency,
+                                              cache=self.cache)
                 if transcript:
                     md_content += "\n\n### Audio Transcript:\n" + transcript
             except MissingDependencyException:
@@ -104,12 +160,27 @@ class AudioWhisperConverter(AudioConverter):
         return DocumentConverterResult(markdown=md_content.strip())
 
 class PdfWithTableConverter(PdfConverter):
+    def __init__(self, max_pages: Optional[int] = None, max_workers: Optional[int] = None):
+        """
+        Args:
+            max_pages (int, optional): Only convert the first pages of larger documents.
+            max_workers (int, optional): Processes converting the pages of large documents.
+        """
+        super().__init__()
+        self.max_pages = max_pages
+        self.max_workers = max_workers
+
     def convert(
         self,
         file_stream: BinaryIO,
         stream_info: StreamInfo,
         **kwargs: Any,  # Options to pass to the converter
     ) -> DocumentConverterResult:
+        """
+        Options:
+            pdf_pages (str): 1-based page range like "1-3,7,10-".
+            pdf_max_pages (int): Only convert the first pages.
+        """
         # Check the dependencies
         if _dependency_exc_info is not None:
             raise MissingDependencyException(
@@ -126,28 +197,36 @@ class PdfWithTableConverter(PdfConverter):
 
         assert isinstance(file_stream, io.IOBase)  # for mypy
 
-        tables = read_tables_from_stream(file_stream)
-        num_tables = tables.n
-        if num_tables == 0:
-            return DocumentConverterResult(
-                markdown=pdfminer.high_level.extract_text(file_stream),
-            )
-        else:
-            markdown_content = pdfminer.high_level.extract_text(file_stream)
-            table_content = ""
-            for i in range(num_tables):
-                table = tables[i].df
-                table_content += f"Table {i + 1}:\n" + table.to_markdown(index=False) + "\n\n"
-            markdown_content += "\n\n" + table_content
-            return DocumentConverterResult(
-                markdown=markdown_content,
-            )
+        options = dict(
+            pages=kwargs.get("pdf_pages"),
+            max_pages=kwargs.get("pdf_max_pages", self.max_pages),
+            max_workers=self.max_workers,
+        )
+
+        # The pages are parsed from a file, use the local file itself when the stream has one
+        path = getattr(file_stream, "name", None)
+        if isinstance(path, str) and os.path.isfile(path):
+            return DocumentConverterResult(markdown=pdf_to_markdown(path, **options))
+
+        with tempfile.NamedTemporaryFile(suffix=".pdf", delete=True) as temp_pdf:
+            shutil.copyfileobj(file_stream, temp_pdf)
+            temp_pdf.flush()
+            return DocumentConverterResult(markdown=pdf_to_markdown(temp_pdf.name, **options))
 
 class MarkitdownConverter():
     def __init__(self,
                  use_llm: bool = False,
                  model_id: str = None,
-                 timeout: int = 30):
+                 timeout: int = 30,
+                 cache: Optional[ConversionCache] = None):
+        """
+        Args:
+            use_llm (bool): Describe images with the model `model_id`.
+            model_id (str): The model used with `use_llm`.
+            timeout (int): Timeout of the conversions in seconds.
+            cache (ConversionCache, optional): Cache of the conversions of local files. Defaults to the
+                process-wide cache of `markdown_cache_config`, no cache if that is not configured.
+        """
 
         self.timeout = timeout
         self.use_llm = use_llm
@@ -173,10 +252,58 @@ class MarkitdownConverter():
             converter for converter in self.client._converters
             if not isinstance(converter.converter, tuple(removed_converters))
         ]
+        if cache is None:
+            cache_config = config.get("markdown_cache_config", None)
+            if cache_config:
+                cache = get_conversion_cache(cache_dir=assemble_project_path(cache_config["cache_dir"]),
+                                             max_bytes=cache_config.get("max_bytes", None))
+        self.cache = cache
+
         self.client.register_converter(PdfWithTableConverter())
-        self.client.register_converter(AudioWhisperConverter())
+        self.client.register_converter(AudioWhisperConverter(cache=cache))
+
+    def _cache_options(self, kwargs: dict) -> dict:
+        return {
+            "version": CONVERTER_VERSION,
+            "markitdown": MARKITDOWN_VERSION,
+            "use_llm": self.use_llm,
+            "model_id": self.model_id if self.use_llm else None,
+            "kwargs": kwargs,
+        }
 
     def convert(self, source: str, **kwargs: Any):
+        """Convert `source` to markdown. Local files go through the conversion cache."""
+        if self.cache is None or not isinstance(source, str) or not os.path.isfile(source):
+            return self._convert(source, **kwargs)
+
+        try:
+            key = self.cache.key(source, self._cache_options(kwargs))
+        except OSError:
+            return self._convert(source, **kwargs)
+
+        # Concurrent conversions of the same file, e.g. by several analyzer models, run once
+        with self.cache.key_lock(key):
+            entry = self.cache.get(key)
+            if entry is not None:
+                logger.info(f"| Using cached conversion of {source}")
+                return DocumentConverterResult(markdown=entry["markdown"], title=entry.get("title"))
+
+            result = self._convert(source, **kwargs)
+            if result is not None:
+                self.cache.put(key, {"markdown": result.markdown, "title": result.title})
+            return result
+
+    async def aconvert(self, source: str, **kwargs: Any):
+        """
+        `convert` in a worker thread, so long conversions do not block the event loop. The result is added to the
+        retrieval index of the current task.
+        """
+        result = await asyncio.to_thread(self.convert, source, **kwargs)
+        if result is not None and isinstance(source, str):
+            await aindex_document(source, result.markdown, title=result.title)
+        return result
+
+    def _convert(self, source: str, **kwargs: Any):
         try:
             result = self.client.convert(
                 source,
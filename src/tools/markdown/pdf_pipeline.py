@@ -0,0 +1,215 @@
+"""Page-parallel pdf to markdown conversion.
+
+The selected pages are split in chunks, each parsed once by pdfminer in a single pass that gives both the text of its
+pages, rendered as `pdfminer.high_level.extract_text` does, and their ruling lines. Lattice table detection by
+camelot, the slow part, only runs on the pages of the chunk that have ruling lines, in one call. Chunks are converted
+in a process pool, in page ranges or the first pages only for huge documents, and are yielded as they complete.
+"""
+import os
+import re
+import math
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, Optional
+
+from src.logger import logger
+
+# Pages with fewer ruling lines or rectangles cannot hold a lattice table
+MIN_RULING_LINES = 4
+
+# Documents up to this many pages are converted in the calling process, a pool does not pay off
+INLINE_MAX_PAGES = 4
+
+
+@dataclass
+class PdfPageResult():
+    page_number: int  # 1-based
+    text: str
+    tables: List[str] = field(default_factory=list)  # markdown tables
+    error: Optional[str] = None
+
+
+def count_pages(path: str) -> int:
+    """Page count from the page tree root, without walking the pages."""
+    from pdfminer.pdfdocument import PDFDocument
+    from pdfminer.pdfpage import PDFPage
+    from pdfminer.pdfparser import PDFParser
+    from pdfminer.pdftypes import resolve1
+
+    with open(path, "rb") as f:
+        document = PDFDocument(PDFParser(f))
+        try:
+            return int(resolve1(resolve1(document.catalog["Pages"])["Count"]))
+        except Exception:
+            return sum(1 for _ in PDFPage.create_pages(document))
+
+
+def parse_page_range(pages: str, num_pages: int) -> List[int]:
+    """1-based page numbers of a range like "1-3,7,10-", limited to the document."""
+    numbers = []
+    for part in pages.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        match = re.fullmatch(r"(\d*)\s*-\s*(\d*)", part)
+        if match:
+            start = int(match.group(1)) if match.group(1) else 1
+            end = int(match.group(2)) if match.group(2) else num_pages
+        else:
+            start = end = int(part)
+        numbers.extend(range(max(start, 1), min(end, num_pages) + 1))
+    return sorted(set(numbers))
+
+
+def select_pages(num_pages: int, pages: Optional[str] = None, max_pages: Optional[int] = None) -> List[int]:
+    selected = parse_page_range(pages, num_pages) if pages else list(range(1, num_pages + 1))
+    if max_pages is not None:
+        selected = selected[:max_pages]
+    return selected
+
+
+def _read_tables(path: str, page_numbers: List[int]) -> Dict[int, List[str]]:
+    """Markdown tables of the given pages, in one camelot call."""
+    import camelot
+
+    tables = camelot.read_pdf(path, flavor="lattice", pages=",".join(str(number) for number in page_numbers))
+    page_tables = {}
+    for index in range(tables.n):
+        page_tables.setdefault(int(tables[index].page), []).append(tables[index].df.to_markdown(index=False))
+    return page_tables
+
+
+def _render_layout(item, texts: List[str]) -> int:
+    """Append the text of a layout item as `pdfminer`'s `TextConverter` writes it, text inside figures included,
+    and return the number of ruling lines and rectangles it holds."""
+    from pdfminer.layout import LTContainer, LTText, LTTextBox, LTLine, LTRect
+
+    ruling_lines = 0
+    if isinstance(item, (LTLine, LTRect)):
+        ruling_lines += 1
+    if isinstance(item, LTContainer):
+        for child in item:
+            ruling_lines += _render_layout(child, texts)
+    elif isinstance(item, LTText):
+        texts.append(item.get_text())
+    if isinstance(item, LTTextBox):
+        texts.append("\n")
+    return ruling_lines
+
+
+def convert_pages(path: str, page_numbers: List[int], detect_tables: bool = True) -> List[PdfPageResult]:
+    """Text and tables of some pages, parsing the document once. Runs in the pool workers."""
+    from pdfminer.high_level import extract_pages
+
+    page_numbers = sorted(page_numbers)
+    results, ruled_pages = [], []
+    try:
+        for page_number, page_layout in zip(page_numbers,
+                                            extract_pages(path, page_numbers=[number - 1 for number in page_numbers])):
+            texts = []
+            ruling_lines = _render_layout(page_layout, texts)
+            results.append(PdfPageResult(page_number=page_number, text="".join(texts) + "\f"))
+            if ruling_lines >= MIN_RULING_LINES:
+                ruled_pages.append(page_number)
+    except Exception as e:
+        done = {result.page_number for result in results}
+        return results + [PdfPageResult(page_number=page_number, text="", error=f"{type(e).__name__}: {e}")
+                          for page_number in page_numbers if page_number not in done]
+
+    if detect_tables and ruled_pages:
+        try:
+            page_tables = _read_tables(path, ruled_pages)
+        except Exception as e:
+            page_tables = {}
+            for result in results:
+                if result.page_number in ruled_pages:
+                    result.error = f"Table extraction failed: {type(e).__name__}: {e}"
+        for result in results:
+            result.tables = page_tables.get(result.page_number, [])
+    return results
+
+
+def convert_page(path: str, page_number: int, detect_tables: bool = True) -> PdfPageResult:
+    """Text and tables of one page."""
+    return convert_pages(path, [page_number], detect_tables)[0]
+
+
+def _default_workers(max_workers: Optional[int] = None) -> int:
+    return max_workers or min(8, os.cpu_count() or 1)
+
+
+# One pool per process, shared by every conversion
+_PROCESS_POOL: Optional[ProcessPoolExecutor] = None
+
+
+def get_process_pool(max_workers: Optional[int] = None) -> ProcessPoolExecutor:
+    global _PROCESS_POOL
+    if _PROCESS_POOL is None:
+        _PROCESS_POOL = ProcessPoolExecutor(max_workers=_default_workers(max_workers),
+                                            mp_context=multiprocessing.get_context("spawn"))
+    return _PROCESS_POOL
+
+
+def iter_pdf_pages(path: str,
+                   page_numbers: List[int],
+                   detect_tables: bool = True,
+                   max_workers: Optional[int] = None,
+                   ) -> Iterator[PdfPageResult]:
+    """Convert the pages of the pdf at `path`, yielding the pages of each chunk as soon as it is done."""
+    if len(page_numbers) <= INLINE_MAX_PAGES:
+        yield from convert_pages(path, page_numbers, detect_tables)
+        return
+
+    # A few contiguous chunks per worker, so that the first pages come back early and every chunk is parsed once
+    chunk_size = max(INLINE_MAX_PAGES, math.ceil(len(page_numbers) / (_default_workers(max_workers) * 4)))
+    chunks = [page_numbers[index:index + chunk_size] for index in range(0, len(page_numbers), chunk_size)]
+
+    pool = get_process_pool(max_workers)
+    futures = [pool.submit(convert_pages, path, chunk, detect_tables) for chunk in chunks]
+    try:
+        for future in as_completed(futures):
+            yield from future.result()
+    finally:
+        for future in futures:
+            future.cancel()
+
+
+def pdf_to_markdown(path: str,
+                    pages: Optional[str] = None,
+                    max_pages: Optional[int] = None,
+                    detect_tables: bool = True,
+                    max_workers: Optional[int] = None,
+                    ) -> str:
+    """
+    Convert a pdf to markdown: the text of the pages, then their tables.
+
+    Args:
+        path (str): The pdf file.
+        pages (str, optional): 1-based page range like "1-3,7,10-". All pages if None.
+        max_pages (int, optional): Only convert the first `max_pages` selected pages.
+        detect_tables (bool): Extract lattice tables with camelot on pages with ruling lines.
+        max_workers (int, optional): Size of the process pool, created on first use.
+    """
+    num_pages = count_pages(path)
+    page_numbers = select_pages(num_pages, pages=pages, max_pages=max_pages)
+    results = sorted(iter_pdf_pages(path, page_numbers, detect_tables=detect_tables, max_workers=max_workers),
+                     key=lambda result: result.page_number)
+
+    for result in results:
+        if result.error:
+            logger.warning(f"| Page {result.page_number} of {path}: {result.error}")
+
+    markdown_content = "".join(result.text for result in results)
+
+    table_content, table_index = "", 0
+    for result in results:
+        for table in result.tables:
+            table_index += 1
+            table_content += f"Table {table_index} (page {result.page_number}):\n" + table + "\n\n"
+    if table_content:
+        markdown_content += "\n\n" + table_content
+
+    if len(page_numbers) < num_pages:
+        markdown_content += f"\n\n[Converted {len(page_numbers)} of {num_pages} pages]"
+    return markdown_content
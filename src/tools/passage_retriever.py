@@ -0,0 +1,72 @@
+from typing import Optional
+
+from src.tools import AsyncTool, ToolResult
+from src.tools.retrieval.index import get_retrieval_index
+from src.registry import TOOL
+
+
+_RETRIEVE_PASSAGES_DESCRIPTION = """Search the attached files and web pages already read in this task for the passages most relevant to a query.
+Much cheaper than reading a whole document again to answer a narrow question about it.
+* Only documents read before by the other tools (file reader, deep analyzer, web fetcher) can be searched.
+* Use keywords from the expected answer as the query, e.g. names, dates or units.
+* Set `source` to a file path or url to only search that document.
+"""
+
+
+@TOOL.register_module(name="retrieve_passages_tool", force=True)
+class RetrievePassagesTool(AsyncTool):
+    name: str = "retrieve_passages_tool"
+    description: str = _RETRIEVE_PASSAGES_DESCRIPTION
+    parameters: dict = {
+        "type": "object",
+        "properties": {
+            "query": {
+                "type": "string",
+                "description": "What to look for in the documents.",
+            },
+            "top_k": {
+                "type": "integer",
+                "description": "(optional) The number of passages to return.",
+                "nullable": True,
+            },
+            "source": {
+                "type": "string",
+                "description": "(optional) Only search the document at this file path or url.",
+                "nullable": True,
+            },
+        },
+        "required": ["query"],
+        "additionalProperties": False,
+    }
+    output_type = "any"
+
+    def __init__(self, top_k: int = 5, max_top_k: int = 20):
+        """
+        Args:
+            top_k (int): The number of passages returned when the query does not say.
+            max_top_k (int): The most passages returned for a query.
+        """
+        super().__init__()
+        self.top_k = top_k
+        self.max_top_k = max_top_k
+
+    async def forward(self, query: str, top_k: Optional[int] = None, source: Optional[str] = None) -> ToolResult:
+        """Return the passages most relevant to the query, best first."""
+        index = get_retrieval_index()
+        if index is None:
+            return ToolResult(output=None, error="Passage retrieval is not enabled, set `retrieval_config`.")
+        if not len(index):
+            return ToolResult(output=None, error="No documents have been read in this task yet.")
+
+        top_k = min(top_k or self.top_k, self.max_top_k)
+        results = index.search(query, top_k=top_k, source=source)
+        if not results:
+            return ToolResult(output=f"No passages match the query: {query}", error=None)
+
+        output = ""
+        for rank, (passage, score) in enumerate(results, start=1):
+            title = f" ({passage.title})" if passage.title else ""
+            output += f"[{rank}] {passage.source}{title}, passage {passage.position + 1}, score {score:.2f}:\n"
+            output += f"{passage.text}\n\n"
+
+        return ToolResult(output=output.strip(), error=None)
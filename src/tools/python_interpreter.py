@@ -1,8 +1,11 @@
+import asyncio
+
 from src.tools.executor.local_python_executor import (
     BASE_BUILTIN_MODULES,
     BASE_PYTHON_TOOLS,
     evaluate_python_code,
 )
+from src.tools.executor.worker_pool import SandboxWorkerPool, python_session_id
 from src.tools import AsyncTool, ToolResult
 from src.registry import TOOL
 
@@ -22,7 +25,14 @@ class PythonInterpreterTool(AsyncTool):
     }
     output_type = "any"
 
-    def __init__(self, *args, authorized_imports=None, **kwargs):
+    def __init__(self, *args, authorized_imports=None, worker_pool_config=None, **kwargs):
+        """
+        Args:
+            authorized_imports (list[str], optional): Modules the code may import, on top of the base ones.
+            worker_pool_config (dict, optional): Arguments of a `SandboxWorkerPool`. When given, code runs in
+                pre-warmed sandbox processes instead of inline, and calls made under the same `python_session_id`
+                share their variables.
+        """
         if authorized_imports is None:
             self.authorized_imports = list(set(BASE_BUILTIN_MODULES))
         else:
@@ -42,10 +52,37 @@ class PythonInterpreterTool(AsyncTool):
         }
         self.base_python_tools = BASE_PYTHON_TOOLS
         self.python_evaluator = evaluate_python_code
+        self.worker_pool_config = worker_pool_config
+        self.worker_pool = None
+        self._worker_pool_lock = asyncio.Lock()
         super().__init__(*args, **kwargs)
 
+    async def get_worker_pool(self) -> SandboxWorkerPool:
+        async with self._worker_pool_lock:
+            if self.worker_pool is None:
+                worker_pool = SandboxWorkerPool(authorized_imports=self.authorized_imports, **self.worker_pool_config)
+                await worker_pool.start()
+                self.worker_pool = worker_pool
+        return self.worker_pool
+
+    async def close(self):
+        """Stop the sandbox workers, if any."""
+        if self.worker_pool is not None:
+            await self.worker_pool.close()
+            self.worker_pool = None
+
     async def forward(self, code: str) -> ToolResult:
 
+        if self.worker_pool_config is not None:
+            worker_pool = await self.get_worker_pool()
+            response = await worker_pool.run(code, session_id=python_session_id.get())
+            if response["error"] is not None:
+                return ToolResult(output=None, error=response["error"])
+            return ToolResult(
+                output=f"Stdout:\n{response['logs']}\nOutput: {response['output']}",
+                error=None,
+            )
+
         try:
             state = {}
             output = str(
@@ -0,0 +1,17 @@
+from src.tools.retrieval.index import (RetrievalIndex,
+                                       Passage,
+                                       chunk_markdown,
+                                       get_retrieval_index,
+                                       index_document,
+                                       aindex_document,
+                                       retrieval_session_id)
+
+__all__ = [
+    "RetrievalIndex",
+    "Passage",
+    "chunk_markdown",
+    "get_retrieval_index",
+    "index_document",
+    "aindex_document",
+    "retrieval_session_id",
+]
@@ -0,0 +1,375 @@
+"""Local passage retrieval over the documents read during a task.
+
+Every attachment converted by `MarkitdownConverter` and every page fetched by `WebFetcherTool` is split into passages
+and added to the BM25 index of the current task, so narrow follow-up questions retrieve a few passages instead of
+reading the whole document again. Scoring is vectorized with NumPy over per-term posting arrays. Local hashed
+embeddings of words and character trigrams can be mixed in to match inflections and typos. Every task has its own
+index, persisted in its working directory and updated as new documents are read. Indexing runs in a worker thread
+and saves are debounced, so reading many documents in a row writes the index once.
+"""
+import os
+import re
+import json
+import zlib
+import atexit
+import asyncio
+import hashlib
+import threading
+import contextvars
+from collections import OrderedDict
+from dataclasses import dataclass, asdict
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from src.config import config
+from src.utils import assemble_project_path
+from src.logger import logger
+
+# Part of the persisted index, bump it when the chunking or the tokenization changes
+INDEX_VERSION = "1"
+
+# Task of the current agent run, e.g. its task id. Documents read without a task go to a shared in-memory index.
+retrieval_session_id: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar("retrieval_session_id",
+                                                                                     default=None)
+
+_TOKEN_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+
+def tokenize(text: str) -> List[str]:
+    return _TOKEN_PATTERN.findall(text.lower())
+
+
+def chunk_markdown(text: str, chunk_chars: int = 1500) -> List[str]:
+    """Split markdown into passages of about `chunk_chars` characters, at paragraphs and headings when possible."""
+    passages, current = [], ""
+    for paragraph in re.split(r"\n\s*\n", text):
+        paragraph = paragraph.strip()
+        if not paragraph:
+            continue
+        # A heading starts a new passage, so it stays with the text below it
+        if current and (paragraph.startswith("#") or len(current) + len(paragraph) + 2 > chunk_chars):
+            passages.append(current)
+            current = ""
+        while len(paragraph) > chunk_chars:
+            cut = paragraph.rfind(" ", 0, chunk_chars)
+            cut = cut if cut > chunk_chars // 2 else chunk_chars
+            if current:
+                passages.append(current)
+                current = ""
+            passages.append(paragraph[:cut].strip())
+            paragraph = paragraph[cut:].strip()
+        current = f"{current}\n\n{paragraph}" if current else paragraph
+    if current:
+        passages.append(current)
+    return passages
+
+
+def hash_embed(texts: List[str], dim: int = 512) -> np.ndarray:
+    """L2-normalized signed feature hashing of the words and character trigrams of every text."""
+    matrix = np.zeros((len(texts), dim), dtype=np.float32)
+    for row, text in enumerate(texts):
+        features = []
+        for token in tokenize(text):
+            features.append(token)
+            padded = f"#{token}#"
+            features.extend(padded[i:i + 3] for i in range(len(padded) - 2))
+        if not features:
+            continue
+        hashes = np.fromiter((zlib.crc32(feature.encode("utf-8")) for feature in features),
+                             dtype=np.uint32, count=len(features))
+        signs = np.where(hashes & 1, 1.0, -1.0).astype(np.float32)
+        np.add.at(matrix[row], (hashes >> 1) % dim, signs)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return matrix / np.maximum(norms, 1e-12)
+
+
+@dataclass
+class Passage():
+    source: str  # file path or url of the document
+    title: Optional[str]
+    position: int  # index of the passage in the document
+    text: str
+
+
+class RetrievalIndex():
+    def __init__(self,
+                 path: Optional[str] = None,
+                 chunk_chars: int = 1500,
+                 k1: float = 1.5,
+                 b: float = 0.75,
+                 embedding_weight: float = 0.0,
+                 embedding_dim: int = 512,
+                 embedder: Optional[Callable[[List[str]], np.ndarray]] = None,
+                 max_documents: Optional[int] = None,
+                 save_delay: float = 2.0,
+                 ):
+        """
+        Args:
+            path (str, optional): JSON file the index is persisted to and loaded from. In memory only if None.
+            chunk_chars (int): Size of the passages in characters.
+            k1 (float): BM25 term frequency saturation.
+            b (float): BM25 length normalization.
+            embedding_weight (float): Weight of the embedding similarity in the score, from 0 (BM25 only) to 1.
+            embedding_dim (int): Size of the hashed embeddings.
+            embedder (Callable, optional): Embeds a list of texts into L2-normalized rows, defaults to `hash_embed`.
+            max_documents (int, optional): The oldest documents are dropped past this many, unbounded if None.
+            save_delay (float): Seconds to wait for more documents before saving, 0 saves on every add.
+        """
+        self.path = path
+        self.chunk_chars = chunk_chars
+        self.k1 = k1
+        self.b = b
+        self.embedding_weight = embedding_weight
+        self.embedder = embedder or (lambda texts: hash_embed(texts, dim=embedding_dim))
+        self.max_documents = max_documents
+        self.save_delay = save_delay
+
+        self._lock = threading.RLock()
+        self._save_timer: Optional[threading.Timer] = None
+        self._dirty = False
+        self.documents: Dict[str, Dict[str, Optional[str]]] = {}  # source -> content hash and title
+        self.passages: List[Passage] = []
+        self._lengths: List[int] = []
+        self._postings: Dict[str, Tuple[List[int], List[int]]] = {}  # term -> passage ids, term frequencies
+        self._embeddings: List[np.ndarray] = []
+        self._arrays: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}  # posting lists as arrays, built on demand
+        self._matrix: Optional[np.ndarray] = None
+
+        if path is not None and os.path.exists(path):
+            self.load()
+
+    def __len__(self) -> int:
+        return len(self.passages)
+
+    def _add_passage(self, passage: Passage) -> None:
+        passage_id = len(self.passages)
+        counts: Dict[str, int] = {}
+        tokens = tokenize(passage.text)
+        for token in tokens:
+            counts[token] = counts.get(token, 0) + 1
+        for term, count in counts.items():
+            ids, frequencies = self._postings.setdefault(term, ([], []))
+            ids.append(passage_id)
+            frequencies.append(count)
+        self.passages.append(passage)
+        self._lengths.append(len(tokens))
+
+    def _rebuild(self, passages: List[Passage]) -> None:
+        self.passages, self._lengths, self._postings = [], [], {}
+        for passage in passages:
+            self._add_passage(passage)
+        self._embeddings = []
+        if self.embedding_weight > 0 and passages:
+            self._embeddings = list(self.embedder([passage.text for passage in passages]))
+        self._arrays, self._matrix = {}, None
+
+    def add_document(self, source: str, text: str, title: Optional[str] = None) -> int:
+        """
+        Index a document, replacing an older version from the same source.
+
+        Returns:
+            int: The number of passages added, 0 when the same content was already indexed.
+        """
+        digest = hashlib.sha256(text.encode("utf-8")).hexdigest()
+        with self._lock:
+            previous = self.documents.get(source)
+            if previous is not None and previous["hash"] == digest:
+                return 0
+            # Drop the older version and, past `max_documents`, the oldest documents
+            dropped = set()
+            if previous is not None:
+                dropped.add(source)
+                del self.documents[source]
+            while self.max_documents is not None and self.documents and len(self.documents) >= self.max_documents:
+                oldest = next(iter(self.documents))
+                dropped.add(oldest)
+                del self.documents[oldest]
+            if dropped:
+                self._rebuild([passage for passage in self.passages if passage.source not in dropped])
+
+            passages = [Passage(source=source, title=title, position=position, text=chunk)
+                        for position, chunk in enumerate(chunk_markdown(text, self.chunk_chars))]
+            for passage in passages:
+                self._add_passage(passage)
+            if self.embedding_weight > 0 and passages:
+                self._embeddings.extend(self.embedder([passage.text for passage in passages]))
+            self.documents[source] = {"hash": digest, "title": title}
+            self._arrays, self._matrix = {}, None
+            if self.path is not None:
+                self._schedule_save()
+        logger.info(f"| Indexed {len(passages)} passages of {source}")
+        return len(passages)
+
+    def _posting_arrays(self, term: str) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        arrays = self._arrays.get(term)
+        if arrays is None and term in self._postings:
+            ids, frequencies = self._postings[term]
+            arrays = self._arrays[term] = (np.asarray(ids, dtype=np.int64), np.asarray(frequencies, dtype=np.float32))
+        return arrays
+
+    def bm25_scores(self, query: str) -> np.ndarray:
+        num_passages = len(self.passages)
+        scores = np.zeros(num_passages, dtype=np.float32)
+        if not num_passages:
+            return scores
+        lengths = np.asarray(self._lengths, dtype=np.float32)
+        norms = self.k1 * (1 - self.b + self.b * lengths / max(float(lengths.mean()), 1.0))
+        for term in set(tokenize(query)):
+            arrays = self._posting_arrays(term)
+            if arrays is None:
+                continue
+            ids, frequencies = arrays
+            idf = np.log(1 + (num_passages - len(ids) + 0.5) / (len(ids) + 0.5))
+            scores[ids] += idf * frequencies * (self.k1 + 1) / (frequencies + norms[ids])
+        return scores
+
+    def search(self, query: str, top_k: int = 5, source: Optional[str] = None) -> List[Tuple[Passage, float]]:
+        """The `top_k` passages most relevant to `query`, optionally only from `source`, best first."""
+        with self._lock:
+            if not self.passages:
+                return []
+            scores = self.bm25_scores(query)
+            if self.embedding_weight > 0:
+                if self._matrix is None:
+                    self._matrix = np.vstack(self._embeddings)
+                similarities = self._matrix @ self.embedder([query])[0]
+                peak = scores.max()
+                scores = ((1 - self.embedding_weight) * (scores / peak if peak > 0 else scores)
+                          + self.embedding_weight * similarities)
+            if source is not None:
+                mask = np.fromiter((passage.source == source for passage in self.passages),
+                                   dtype=bool, count=len(self.passages))
+                scores = np.where(mask, scores, -np.inf)
+            top_k = min(top_k, len(self.passages))
+            candidates = np.argpartition(-scores, top_k - 1)[:top_k]
+            ranked = candidates[np.argsort(-scores[candidates], kind="stable")]
+            return [(self.passages[i], float(scores[i])) for i in ranked if scores[i] > 0]
+
+    def _schedule_save(self) -> None:
+        """Save after `save_delay` seconds in a timer thread, later adds within the delay share that save."""
+        self._dirty = True
+        if self.save_delay <= 0:
+            self.flush()
+        elif self._save_timer is None:
+            self._save_timer = threading.Timer(self.save_delay, self.flush)
+            self._save_timer.daemon = True
+            self._save_timer.start()
+
+    def flush(self) -> None:
+        """Save now if documents were added since the last save."""
+        with self._lock:
+            if self._save_timer is not None:
+                self._save_timer.cancel()
+                self._save_timer = None
+            if not self._dirty:
+                return
+            self._dirty = False
+            try:
+                self.save()
+            except OSError as e:
+                logger.warning(f"| Failed to save the retrieval index {self.path}: {e}")
+
+    def save(self) -> None:
+        with self._lock:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            tmp_path = f"{self.path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({
+                    "version": INDEX_VERSION,
+                    "chunk_chars": self.chunk_chars,
+                    "documents": self.documents,
+                    "passages": [asdict(passage) for passage in self.passages],
+                }, f, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+
+    def load(self) -> None:
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning(f"| Ignoring unreadable retrieval index {self.path}: {e}")
+            return
+        if data.get("version") != INDEX_VERSION or data.get("chunk_chars") != self.chunk_chars:
+            logger.info(f"| Ignoring retrieval index {self.path} built with other settings")
+            return
+        with self._lock:
+            self.documents = data["documents"]
+            self._rebuild([Passage(**passage) for passage in data["passages"]])
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "documents": len(self.documents),
+            "passages": len(self.passages),
+            "terms": len(self._postings),
+        }
+
+
+def _open_index(session_id: str, retrieval_config) -> "RetrievalIndex":
+    if session_id == "default":
+        # Documents read outside of a task are not persisted, so they do not pile up across runs
+        path = None
+    else:
+        index_dir = retrieval_config.get("index_dir", None)
+        if index_dir is None:
+            index_dir = os.path.join(config.get("exp_path", assemble_project_path("workdir")), "retrieval")
+        else:
+            index_dir = assemble_project_path(index_dir)
+        path = os.path.join(index_dir, re.sub(r"[^\w.-]", "_", session_id), "index.json")
+    return RetrievalIndex(path=path,
+                          chunk_chars=retrieval_config.get("chunk_chars", 1500),
+                          embedding_weight=retrieval_config.get("embedding_weight", 0.0),
+                          max_documents=retrieval_config.get("max_documents", None))
+
+
+# Indexes of the recent tasks, the others are reloaded from disk when needed
+_INDEXES: "OrderedDict[str, RetrievalIndex]" = OrderedDict()
+_INDEXES_LOCK = threading.Lock()
+MAX_OPEN_INDEXES = 16
+
+
+def get_retrieval_index(session_id: Optional[str] = None) -> Optional[RetrievalIndex]:
+    """The index of the task `session_id`, by default the current one. None if `retrieval_config` is not set."""
+    retrieval_config = config.get("retrieval_config", None)
+    if not retrieval_config:
+        return None
+    session_id = session_id or retrieval_session_id.get() or "default"
+
+    with _INDEXES_LOCK:
+        index = _INDEXES.get(session_id)
+        if index is None:
+            index = _INDEXES[session_id] = _open_index(session_id, retrieval_config)
+            while len(_INDEXES) > MAX_OPEN_INDEXES:
+                _, evicted = _INDEXES.popitem(last=False)
+                evicted.flush()
+        else:
+            _INDEXES.move_to_end(session_id)
+        return index
+
+
+def index_document(source: str, text: Optional[str], title: Optional[str] = None) -> None:
+    """Add a converted or fetched document to the index of the current task, if retrieval is enabled."""
+    if not text or not text.strip():
+        return
+    try:
+        index = get_retrieval_index()
+        if index is not None:
+            index.add_document(source, text, title=title)
+    except Exception as e:
+        logger.warning(f"| Failed to index {source} for retrieval: {e}")
+
+
+async def aindex_document(source: str, text: Optional[str], title: Optional[str] = None) -> None:
+    """`index_document` in a worker thread, chunking and tokenizing a long document would block the event loop."""
+    if not text or not text.strip():
+        return
+    await asyncio.to_thread(index_document, source, text, title)
+
+
+@atexit.register
+def flush_retrieval_indexes() -> None:
+    """Save the pending documents of every open index."""
+    with _INDEXES_LOCK:
+        indexes = list(_INDEXES.values())
+    for index in indexes:
+        index.flush()
@@ -1,11 +1,17 @@
-from .baidu_search import BaiduSearchEngine
-from .bing_search import BingSearchEngine
-from .google_search import GoogleSearchEngine
-from .ddg_search import DuckDuckGoSearchEngine
-from .firecrawl_search import FirecrawlSearchEngine
-from .base import SearchItem, WebSearchEngine
+from src.utils.lazy_utils import lazy_exports
 
+# Names are imported from their module on first use, every engine imports its own client
+_EXPORTS = {
+    "BaiduSearchEngine": ".baidu_search",
+    "BingSearchEngine": ".bing_search",
+    "GoogleSearchEngine": ".google_search",
+    "DuckDuckGoSearchEngine": ".ddg_search",
+    "FirecrawlSearchEngine": ".firecrawl_search",
+    "SearchItem": ".base",
+    "WebSearchEngine": ".base",
+}
 
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
 
 __all__ = [
     "BaiduSearchEngine",
@@ -14,5 +20,5 @@ __all__ = [
     "DuckDuckGoSearchEngine",
     "SearchItem",
     "WebSearchEngine",
-    "FirecrawlSearchEngine"
+    "FirecrawlSearchEngine",
 ]
@@ -1,9 +1,6 @@
 import os
 import time
 
-from dotenv import load_dotenv
-load_dotenv(verbose=True)
-
 from typing import List
 from firecrawl import FirecrawlApp
 import asyncio
@@ -1,7 +1,4 @@
 from typing import List
-from dotenv import load_dotenv
-load_dotenv(verbose=True)
-
 import requests
 import os
 from bs4 import BeautifulSoup
@@ -3,6 +3,7 @@ from markitdown._base_converter import DocumentConverterResult
 
 from src.tools import AsyncTool
 from src.utils import fetch_url
+from src.tools.retrieval.index import aindex_document
 from src.logger import logger
 from src.registry import TOOL
 
@@ -40,6 +41,8 @@ class WebFetcherTool(AsyncTool):
                     markdown=f"Failed to fetch content from {url}",
                     title="Error",
                 )
+            else:
+                await aindex_document(url, res.markdown, title=res.title)
         except Exception as e:
             logger.error(f"Error fetching content: {e}")
             res = DocumentConverterResult(
@@ -1,37 +1,58 @@
-from .path_utils import assemble_project_path
-from .token_utils import get_token_count
-from .image_utils import download_image
-from .utils import (escape_code_brackets,
-                             _is_package_available,
-                             BASE_BUILTIN_MODULES,
-                             get_source,
-                             is_valid_name,
-                             instance_to_source,
-                             truncate_content,
-                             encode_image_base64,
-                             make_image_url,
-                             parse_json_blob,
-                             make_json_serializable,
-                             make_init_file,
-                             parse_code_blobs,
-                             extract_code_from_text
-                             )
-from .singleton import Singleton
-from .function_utils import (_convert_type_hints_to_json_schema,
-                            get_imports,
-                            get_json_schema)
-from .agent_types import (AgentType,
-                           AgentText,
-                           AgentAudio,
-                           AgentImage,
-                           handle_agent_output_types,
-                           handle_agent_input_types)
-from .url_utils import fetch_url
+from .lazy_utils import lazy_exports
+from .env_utils import load_env
+
+# Names are imported from their module on first use, e.g. `fetch_url` imports crawl4ai and firecrawl
+_EXPORTS = {
+    "assemble_project_path": ".path_utils",
+    "get_token_count": ".token_utils",
+    "split_by_tokens": ".token_utils",
+    "download_image": ".image_utils",
+    "ObservationImageEncoder": ".image_utils",
+    "escape_code_brackets": ".utils",
+    "_is_package_available": ".utils",
+    "BASE_BUILTIN_MODULES": ".utils",
+    "get_source": ".utils",
+    "is_valid_name": ".utils",
+    "instance_to_source": ".utils",
+    "truncate_content": ".utils",
+    "encode_image_base64": ".utils",
+    "make_image_url": ".utils",
+    "parse_json_blob": ".utils",
+    "make_json_serializable": ".utils",
+    "make_init_file": ".utils",
+    "parse_code_blobs": ".utils",
+    "extract_code_from_text": ".utils",
+    "Singleton": ".singleton",
+    "_convert_type_hints_to_json_schema": ".function_utils",
+    "get_imports": ".function_utils",
+    "get_json_schema": ".function_utils",
+    "AgentType": ".agent_types",
+    "AgentText": ".agent_types",
+    "AgentImage": ".agent_types",
+    "AgentAudio": ".agent_types",
+    "handle_agent_output_types": ".agent_types",
+    "handle_agent_input_types": ".agent_types",
+    "fetch_url": ".url_utils",
+    "ResultsStore": ".results_store",
+    "DONE_STATUSES": ".results_store",
+    "get_shard_index": ".shard_utils",
+    "shard_tasks": ".shard_utils",
+    "get_shard_path": ".shard_utils",
+    "merge_shards": ".shard_utils",
+    "run_shards": ".shard_utils",
+    "format_throughput": ".shard_utils",
+}
+
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
 
 __all__ = [
+    "lazy_exports",
+    "load_env",
     "assemble_project_path",
     "get_token_count",
+    "split_by_tokens",
     "download_image",
+    "ObservationImageEncoder",
     "escape_code_brackets",
     "_is_package_available",
     "BASE_BUILTIN_MODULES",
@@ -57,4 +78,12 @@ __all__ = [
     "handle_agent_output_types",
     "handle_agent_input_types",
     "fetch_url",
-]
\ No newline at end of file
+    "ResultsStore",
+    "DONE_STATUSES",
+    "get_shard_index",
+    "shard_tasks",
+    "get_shard_path",
+    "merge_shards",
+    "run_shards",
+    "format_throughput",
+]
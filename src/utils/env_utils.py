@@ -0,0 +1,11 @@
+from dotenv import load_dotenv
+
+_ENV_LOADED = False
+
+
+def load_env(verbose: bool = True) -> None:
+    """Load the `.env` file of the project into the environment, once per process."""
+    global _ENV_LOADED
+    if not _ENV_LOADED:
+        load_dotenv(verbose=verbose)
+        _ENV_LOADED = True
@@ -3,6 +3,8 @@ import os
 import base64
 import mimetypes
 import uuid
+import weakref
+from io import BytesIO
 
 def download_image(image_url, download_path):
 
@@ -29,4 +31,101 @@ def download_image(image_url, download_path):
         for chunk in response.iter_content(chunk_size=512):
             fh.write(chunk)
 
-    return download_image_path
\ No newline at end of file
+    return download_image_path
+
+class ObservationImageEncoder():
+    def __init__(self,
+                 max_size: tuple[int, int] | None = (1280, 1280),
+                 crop_box: tuple[int, int, int, int] | None = None,
+                 image_format: str = "JPEG",
+                 quality: int = 75,
+                 dedup_distance: int | None = 0,
+                 ):
+        """
+        Downscales, recompresses and deduplicates the observation images sent to the models, e.g. browser screenshots.
+
+        Encodings and hashes are cached on the image objects, so an observation kept in memory is encoded once
+        instead of on every later model call.
+
+        Args:
+            max_size (tuple[int, int], optional): Images are downscaled to fit, keeping their aspect ratio.
+            crop_box (tuple[int, int, int, int], optional): (left, upper, right, lower) box cropped first.
+            image_format (str): Format of the image urls, "JPEG", "WEBP" or "PNG".
+            quality (int): Quality of the lossy formats.
+            dedup_distance (int, optional): Images whose perceptual hashes differ by at most this many bits are
+                considered unchanged. 0 only drops pixel-identical images, a small edit such as text typed in a
+                field can leave the hash unchanged. None disables deduplication.
+        """
+        self.max_size = max_size
+        self.crop_box = crop_box
+        self.image_format = image_format.upper()
+        self.quality = quality
+        self.dedup_distance = dedup_distance
+        # id(image) -> cached hash and encodings, dropped when the image is collected. PIL images compare by
+        # content and are not hashable, hence the ids
+        self._cache: dict[int, dict] = {}
+
+    def _entry(self, image) -> dict:
+        key = id(image)
+        entry = self._cache.get(key)
+        if entry is None:
+            entry = {}
+            try:
+                weakref.finalize(image, self._cache.pop, key, None)
+            except TypeError:
+                return entry
+            self._cache[key] = entry
+        return entry
+
+    def prepare(self, image):
+        """Crop and downscale an image, the original is left untouched."""
+        if self.crop_box is not None:
+            image = image.crop(self.crop_box)
+        if self.max_size is not None and (image.width > self.max_size[0] or image.height > self.max_size[1]):
+            image = image.copy()
+            image.thumbnail(self.max_size)
+        return image
+
+    def hash_image(self, image) -> int:
+        """64 bit difference hash: brightness gradients of a 9x8 grayscale thumbnail."""
+        entry = self._entry(image)
+        if "hash" not in entry:
+            small = image.convert("L").resize((9, 8))
+            pixels = small.tobytes()
+            value = 0
+            for row in range(8):
+                for col in range(8):
+                    value = (value << 1) | int(pixels[row * 9 + col] > pixels[row * 9 + col + 1])
+            entry["hash"] = value
+        return entry["hash"]
+
+    def is_duplicate(self, image, previous) -> bool:
+        """Whether `image` looks the same as `previous`."""
+        if self.dedup_distance is None or previous is None:
+            return False
+        if bin(self.hash_image(image) ^ self.hash_image(previous)).count("1") > self.dedup_distance:
+            return False
+        if self.dedup_distance == 0:
+            return (image.size == previous.size and image.mode == previous.mode
+                    and image.tobytes() == previous.tobytes())
+        return True
+
+    def encode(self, image, image_format: str | None = None) -> tuple[str, str]:
+        """
+        Returns:
+            tuple[str, str]: The base64 encoding of the prepared image and its mime type.
+        """
+        image_format = (image_format or self.image_format).upper()
+        entry = self._entry(image)
+        if image_format not in entry:
+            prepared = self.prepare(image)
+            if image_format == "JPEG" and prepared.mode not in ("RGB", "L"):
+                prepared = prepared.convert("RGB")
+            buffered = BytesIO()
+            if image_format == "PNG":
+                prepared.save(buffered, format=image_format, optimize=False)
+            else:
+                prepared.save(buffered, format=image_format, quality=self.quality)
+            entry[image_format] = (base64.b64encode(buffered.getvalue()).decode("utf-8"),
+                                   f"image/{image_format.lower()}")
+        return entry[image_format]
@@ -0,0 +1,89 @@
+"""Import time of the package.
+
+Imports the given modules in a fresh interpreter with `-X importtime` and reports the slowest modules by cumulative
+import time, and the total self time of every top-level package. Run as a module:
+
+    python -m src.utils.import_profile src.config src.models src.tools src.agent
+"""
+import re
+import sys
+import argparse
+import subprocess
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+DEFAULT_MODULES = ["src.config", "src.models", "src.tools", "src.agent"]
+
+_IMPORTTIME_LINE = re.compile(r"^import time:\s*(\d+)\s*\|\s*(\d+)\s*\|(\s*)(\S+)\s*$")
+
+
+@dataclass
+class ImportTiming:
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+def parse_importtime(output: str) -> List[ImportTiming]:
+    """
+    Parse the stderr of `python -X importtime`.
+
+    Args:
+        output (str): The stderr of the interpreter.
+
+    Returns:
+        List[ImportTiming]: One timing per imported module, in import order.
+    """
+    timings = []
+    for line in output.splitlines():
+        match = _IMPORTTIME_LINE.match(line)
+        if match is None:
+            continue
+        self_us, cumulative_us, indent, module = match.groups()
+        timings.append(ImportTiming(module=module,
+                                    self_us=int(self_us),
+                                    cumulative_us=int(cumulative_us),
+                                    depth=max(len(indent) - 1, 0) // 2))
+    return timings
+
+
+def profile_imports(modules: List[str], python: str = sys.executable) -> List[ImportTiming]:
+    """Import `modules` in a fresh interpreter and return the timings of every module it imported."""
+    statement = "; ".join(f"import {module}" for module in modules)
+    process = subprocess.run([python, "-X", "importtime", "-c", statement], capture_output=True, text=True)
+    if process.returncode != 0:
+        raise RuntimeError(f"Importing {', '.join(modules)} failed:\n{process.stderr[-2000:]}")
+    return parse_importtime(process.stderr)
+
+
+def totals_by_package(timings: List[ImportTiming]) -> Dict[str, int]:
+    """Total self time in microseconds of every top-level package, slowest first."""
+    totals = defaultdict(int)
+    for timing in timings:
+        totals[timing.module.split(".")[0]] += timing.self_us
+    return dict(sorted(totals.items(), key=lambda item: item[1], reverse=True))
+
+
+def main(args: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Import time of the package.")
+    parser.add_argument("modules", nargs="*", default=DEFAULT_MODULES, help="modules to import")
+    parser.add_argument("--top", type=int, default=25, help="number of modules and packages to report")
+    args = parser.parse_args(args)
+
+    timings = profile_imports(args.modules)
+    total_us = sum(timing.self_us for timing in timings)
+    print(f"Imported {len(timings)} modules in {total_us / 1e6:.2f}s")
+
+    print(f"\nSlowest modules by cumulative time:")
+    for timing in sorted(timings, key=lambda timing: timing.cumulative_us, reverse=True)[:args.top]:
+        print(f"{timing.cumulative_us / 1e3:10.1f} ms  {timing.module}")
+
+    print(f"\nSlowest top-level packages by self time:")
+    for package, self_us in list(totals_by_package(timings).items())[:args.top]:
+        print(f"{self_us / 1e3:10.1f} ms  {package}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,27 @@
+import sys
+import importlib
+from typing import Any, Callable, Dict, List, Tuple
+
+
+def lazy_exports(package: str, exports: Dict[str, str]) -> Tuple[Callable[[str], Any], Callable[[], List[str]]]:
+    """
+    Module `__getattr__` and `__dir__` of a package whose exported names are imported from their module on first
+    access, so importing the package does not import the dependencies of all its modules.
+
+    Args:
+        package (str): `__name__` of the package.
+        exports (Dict[str, str]): Exported name -> module defining it, relative to the package or absolute.
+    """
+
+    def __getattr__(name: str) -> Any:
+        module_name = exports.get(name)
+        if module_name is None:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}")
+        value = getattr(importlib.import_module(module_name, package), name)
+        setattr(sys.modules[package], name, value)
+        return value
+
+    def __dir__() -> List[str]:
+        return sorted(set(vars(sys.modules[package])) | set(exports))
+
+    return __getattr__, __dir__
@@ -0,0 +1,222 @@
+import os
+import json
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional, Set
+
+INDEX_SUFFIX = ".index"
+
+STATUS_CORRECT = "correct"
+STATUS_WRONG = "wrong"
+STATUS_ANSWERED = "answered"  # has a prediction but no ground truth to score against
+STATUS_FAILED = "failed"  # no usable prediction
+STATUS_INVALID = "invalid"  # unparsable line, e.g. truncated by an interrupted writer
+
+DONE_STATUSES = (STATUS_CORRECT, STATUS_ANSWERED)
+
+
+class ResultsStore():
+    """
+    Append-only JSONL result file with a sidecar index.
+
+    The index file (`<path>.index`) holds one small JSON line per record with its
+    `task_id`, byte `offset` and `length` in the data file, `status` and `score`. Startup only
+    reads the index (plus any tail of the data file the index has not seen yet), so membership
+    checks are O(1) and the large `intermediate_steps` payloads are never loaded unless asked for.
+
+    Every append is a single `os.write` on an `O_APPEND` descriptor, which the kernel serializes on
+    local filesystems, so concurrent writers (threads or processes) need no shared lock. A newer
+    record for the same `task_id` supersedes the older one; nothing is rewritten unless
+    :meth:`compact` is called.
+    """
+
+    def __init__(self, path: str, scorer: Optional[Callable[[str, str], bool]] = None):
+        """
+        Args:
+            path (str): The JSONL result file.
+            scorer (Callable[[str, str], bool], optional): Scores `(prediction, true_answer)`
+                when a record is indexed. Without it records are only `answered` or `failed`.
+        """
+        self.path = path
+        self.index_path = path + INDEX_SUFFIX
+        self.scorer = scorer
+
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._index_pos = 0
+        self._data_end = 0
+
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.refresh()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, task_id):
+        return task_id in self._entries
+
+    def refresh(self) -> None:
+        """Pick up records appended since the last refresh, possibly by other processes."""
+        data_size = os.path.getsize(self.path) if os.path.exists(self.path) else 0
+
+        if os.path.exists(self.index_path):
+            with open(self.index_path, "rb") as f:
+                f.seek(self._index_pos)
+                for line in f:
+                    if not line.endswith(b"\n"):
+                        break  # being written by another process
+                    self._index_pos += len(line)
+                    try:
+                        self._add_entry(json.loads(line))
+                    except json.JSONDecodeError:
+                        continue
+
+        if self._data_end > data_size:
+            # The data file was replaced behind the index, start over
+            self.rebuild()
+        elif self._data_end < data_size:
+            self._index_tail(self._data_end)
+
+    def rebuild(self) -> None:
+        """Drop the index and rebuild it from the data file."""
+        self._entries = {}
+        self._index_pos = 0
+        self._data_end = 0
+        if os.path.exists(self.index_path):
+            os.remove(self.index_path)
+        self._index_tail(0)
+
+    def append(self, record: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Append a record and index it.
+
+        Returns:
+            Dict[str, Any]: The index entry of the record.
+        """
+        line = (json.dumps(record) + "\n").encode("utf-8")
+        offset = self._append_line(self.path, line)
+        entry = self._make_entry(record, offset, len(line))
+        self._append_line(self.index_path, (json.dumps(entry) + "\n").encode("utf-8"))
+        self._add_entry(entry)
+        return entry
+
+    def entry(self, task_id: str) -> Optional[Dict[str, Any]]:
+        """The index entry of the latest record of `task_id`."""
+        return self._entries.get(task_id)
+
+    def get(self, task_id: str) -> Optional[Dict[str, Any]]:
+        """Load the latest full record of `task_id` from the data file."""
+        entry = self._entries.get(task_id)
+        if entry is None:
+            return None
+        with open(self.path, "rb") as f:
+            f.seek(entry["offset"])
+            return json.loads(f.read(entry["length"]))
+
+    def task_ids(self, statuses: Optional[Iterable[str]] = None) -> Set[str]:
+        """Task ids of the latest records, optionally restricted to some statuses."""
+        if statuses is None:
+            return set(self._entries)
+        statuses = set(statuses)
+        return set(task_id for task_id, entry in self._entries.items() if entry["status"] in statuses)
+
+    def entries(self) -> Iterator[Dict[str, Any]]:
+        """Index entries of the latest record of every task."""
+        return iter(self._entries.values())
+
+    def records(self) -> Iterator[Dict[str, Any]]:
+        """Full latest records, read sequentially from the data file."""
+        offsets = sorted(entry["offset"] for entry in self._entries.values())
+        with open(self.path, "rb") as f:
+            for offset in offsets:
+                f.seek(offset)
+                yield json.loads(f.readline())
+
+    def compact(self) -> None:
+        """Rewrite the data file keeping only the latest record of every task."""
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            for record in self.records():
+                f.write((json.dumps(record) + "\n").encode("utf-8"))
+        os.replace(tmp_path, self.path)
+        self.rebuild()
+
+    def remove(self) -> None:
+        """Delete the data and index files."""
+        for path in (self.path, self.index_path):
+            if os.path.exists(path):
+                os.remove(path)
+        self._entries = {}
+        self._index_pos = 0
+        self._data_end = 0
+
+    def score(self, record: Dict[str, Any]):
+        """Status and score of a record."""
+        prediction = record.get("prediction")
+        truth = record.get("true_answer")
+
+        # If the prediction is "Unable to determine", we consider it as not answered
+        if prediction is None or str(prediction) == "Unable to determine":
+            return STATUS_FAILED, None
+
+        # Test datasets do not contain the true answer
+        if self.scorer is None or truth is None or truth == "?":
+            return STATUS_ANSWERED, None
+
+        score = bool(self.scorer(str(prediction), str(truth)))
+        return (STATUS_CORRECT if score else STATUS_WRONG), score
+
+    def _make_entry(self, record: Optional[Dict[str, Any]], offset: int, length: int) -> Dict[str, Any]:
+        if record is None or "task_id" not in record:
+            status, score, task_id = STATUS_INVALID, None, None
+        else:
+            status, score = self.score(record)
+            task_id = record["task_id"]
+        return {
+            "task_id": task_id,
+            "offset": offset,
+            "length": length,
+            "status": status,
+            "score": score,
+        }
+
+    def _add_entry(self, entry: Dict[str, Any]) -> None:
+        self._data_end = max(self._data_end, entry["offset"] + entry["length"])
+        task_id = entry["task_id"]
+        if task_id is None:
+            return
+        previous = self._entries.get(task_id)
+        if previous is None or previous["offset"] <= entry["offset"]:
+            self._entries[task_id] = entry
+
+    def _index_tail(self, start: int) -> None:
+        """Index the records of the data file from `start`, which the index has not seen."""
+        if not os.path.exists(self.path):
+            return
+        lines = []
+        with open(self.path, "rb") as f:
+            f.seek(start)
+            offset = start
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break  # being written by another process
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    record = None
+                entry = self._make_entry(record, offset, len(line))
+                lines.append(json.dumps(entry) + "\n")
+                self._add_entry(entry)
+                offset += len(line)
+        if lines:
+            self._append_line(self.index_path, "".join(lines).encode("utf-8"))
+
+    @staticmethod
+    def _append_line(path: str, data: bytes) -> int:
+        """Atomically append `data` to `path` and return the offset it was written at."""
+        fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            written = os.write(fd, data)
+            end = os.lseek(fd, 0, os.SEEK_CUR)
+        finally:
+            os.close(fd)
+        if written != len(data):
+            raise IOError(f"Short write to {path}: {written} of {len(data)} bytes.")
+        return end - len(data)
@@ -0,0 +1,117 @@
+import os
+import glob
+import time
+import hashlib
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+from src.utils.results_store import (ResultsStore,
+                                     STATUS_CORRECT,
+                                     STATUS_ANSWERED,
+                                     STATUS_WRONG,
+                                     STATUS_FAILED)
+
+SHARD_SUFFIX = ".shard-{index:03d}-of-{total:03d}"
+
+# Rank of a record status when merging, a record never replaces a better one
+STATUS_RANKS = {STATUS_CORRECT: 4, STATUS_ANSWERED: 3, STATUS_WRONG: 2, STATUS_FAILED: 1}
+
+
+def get_shard_index(task_id: str, num_shards: int) -> int:
+    """
+    Map a task id to a shard.
+
+    A stable digest is used instead of `hash()` so that every process (and every machine
+    sharing the filesystem) agrees on the assignment regardless of PYTHONHASHSEED.
+    """
+    digest = hashlib.md5(str(task_id).encode("utf-8")).hexdigest()
+    return int(digest, 16) % num_shards
+
+
+def shard_tasks(tasks: List[dict], shard_index: int, num_shards: int) -> List[dict]:
+    """Keep only the tasks that belong to `shard_index`."""
+    if num_shards <= 1:
+        return tasks
+    return [task for task in tasks if get_shard_index(task["task_id"], num_shards) == shard_index]
+
+
+def get_shard_path(save_path: str, shard_index: int, num_shards: int) -> str:
+    """
+    Build the result file of a shard next to the merged result file,
+    e.g. "dra.jsonl" -> "dra.shard-001-of-004.jsonl".
+    """
+    base, ext = os.path.splitext(save_path)
+    return base + SHARD_SUFFIX.format(index=shard_index, total=num_shards) + ext
+
+
+def list_shard_paths(save_path: str) -> List[str]:
+    """List every shard file of `save_path`, whatever the number of shards it was run with."""
+    base, ext = os.path.splitext(save_path)
+    return sorted(glob.glob(glob.escape(base) + ".shard-*-of-*" + glob.escape(ext)))
+
+
+def merge_shards(save_path: str,
+                 scorer: Optional[Callable[[str, str], bool]] = None,
+                 remove_shards: bool = True) -> Dict[str, Any]:
+    """
+    Merge every shard file of `save_path` into the results store at `save_path`.
+
+    Records are de-duplicated by `task_id`: shard records are appended to the store and supersede
+    the records already there with the same or a worse status, so a correct record is never replaced
+    by a wrong one, nor an answered one by a failed one.
+
+    Returns:
+        Dict[str, Any]: merge statistics (records per shard, merged and duplicated counts).
+    """
+    store = ResultsStore(save_path, scorer=scorer)
+
+    shard_counts = {}
+    duplicates = 0
+    for shard_path in list_shard_paths(save_path):
+        shard_store = ResultsStore(shard_path, scorer=scorer)
+        shard_counts[os.path.basename(shard_path)] = len(shard_store)
+        for record in shard_store.records():
+            previous = store.entry(record["task_id"])
+            if previous is not None:
+                duplicates += 1
+                status, _ = store.score(record)
+                if STATUS_RANKS.get(status, 0) < STATUS_RANKS.get(previous["status"], 0):
+                    continue
+            store.append(record)
+        if remove_shards:
+            shard_store.remove()
+
+    return {
+        "shards": shard_counts,
+        "new_records": sum(shard_counts.values()),
+        "merged_records": len(store),
+        "duplicates": duplicates,
+    }
+
+
+def run_shards(worker: Callable[..., Any], num_shards: int, *args) -> Dict[str, Any]:
+    """
+    Run `worker(*args, shard_index, num_shards)` for every shard, each in its own spawned process.
+
+    Every process gets a fresh interpreter, hence its own model manager and event loop. `worker`
+    must be a picklable module-level function.
+
+    Returns:
+        Dict[str, Any]: per-shard return values and the elapsed wall time in seconds.
+    """
+    start = time.time()
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=num_shards, mp_context=context) as executor:
+        futures = [executor.submit(worker, *args, shard_index, num_shards) for shard_index in range(num_shards)]
+        results = [future.result() for future in futures]
+    return {
+        "results": results,
+        "elapsed": time.time() - start,
+    }
+
+
+def format_throughput(num_records: int, elapsed: float) -> str:
+    """Human readable aggregate throughput of a sharded run."""
+    per_minute = num_records / elapsed * 60 if elapsed > 0 else 0.0
+    return f"{num_records} tasks in {elapsed:.1f}s ({per_minute:.2f} tasks/min)"
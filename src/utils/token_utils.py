@@ -1,5 +1,16 @@
+import re
+from functools import lru_cache
+from typing import List
+
 import tiktoken
 
+
+@lru_cache(maxsize=None)
+def get_encoding(model: str = "gpt-4o"):
+    """The tiktoken encoding of a model, loaded once."""
+    return tiktoken.encoding_for_model(model)
+
+
 def get_token_count(prompt: str, model: str = "gpt-4o") -> int:
     """
     Get the number of tokens in a prompt.
@@ -7,5 +18,34 @@ def get_token_count(prompt: str, model: str = "gpt-4o") -> int:
     :param model: The model to use for tokenization. Default is "gpt-4o".
     :return: The number of tokens in the prompt.
     """
-    encoding = tiktoken.encoding_for_model(model)
-    return len(encoding.encode(prompt))
\ No newline at end of file
+    encoding = get_encoding(model)
+    return len(encoding.encode(prompt))
+
+
+def split_by_tokens(text: str, max_tokens: int, model: str = "gpt-4o") -> List[str]:
+    """
+    Split a text into chunks of at most `max_tokens` tokens, at paragraph boundaries when possible.
+    :param text: The text to split.
+    :param max_tokens: The token budget of a chunk.
+    :param model: The model to use for tokenization. Default is "gpt-4o".
+    :return: The chunks, in order.
+    """
+    encoding = get_encoding(model)
+    chunks, current, current_tokens = [], [], 0
+    for paragraph in re.split(r"(?<=\n)\s*\n", text):
+        tokens = encoding.encode(paragraph)
+        if len(tokens) > max_tokens:
+            if current:
+                chunks.append("".join(current))
+                current, current_tokens = [], 0
+            for start in range(0, len(tokens), max_tokens):
+                chunks.append(encoding.decode(tokens[start:start + max_tokens]))
+            continue
+        if current and current_tokens + len(tokens) > max_tokens:
+            chunks.append("".join(current))
+            current, current_tokens = [], 0
+        current.append(paragraph if not current else "\n" + paragraph)
+        current_tokens += len(tokens)
+    if current:
+        chunks.append("".join(current))
+    return [chunk for chunk in chunks if chunk.strip()]
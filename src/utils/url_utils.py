@@ -1,14 +1,14 @@
 import os
-from typing import Optional
-from dotenv import load_dotenv
-load_dotenv(verbose=True)
+from typing import Optional, TYPE_CHECKING
 
-from markitdown._base_converter import DocumentConverterResult
-from crawl4ai import AsyncWebCrawler
-from firecrawl import FirecrawlApp
+if TYPE_CHECKING:
+    from markitdown._base_converter import DocumentConverterResult
+
+# firecrawl, crawl4ai and markitdown are imported by the functions using them, crawl4ai alone takes seconds to import
 
 async def firecrawl_fetch_url(url: str):
     try:
+        from firecrawl import FirecrawlApp
         app = FirecrawlApp(api_key=os.getenv("FIRECRAWL_API_KEY", None))
 
         response = app.scrape_url(
@@ -24,6 +24,7 @@ async def firecrawl_fetch_url(url: str):
 async def fetch_crawl4ai_url(url: str):
     """Fetch content from a given URL using the crawl4ai library."""
     try:
+        from crawl4ai import AsyncWebCrawler
         async with AsyncWebCrawler() as crawler:
             response = await crawler.arun(
                 url=url,
@@ -37,8 +38,9 @@ async def fetch_crawl4ai_url(url: str):
     except Exception as e:
         return None
 
-async def fetch_url(url: str) -> Optional[DocumentConverterResult]:
+async def fetch_url(url: str) -> Optional["DocumentConverterResult"]:
     # Fetch content from a URL using Firecrawl and Crawl4AI.
+    from markitdown._base_converter import DocumentConverterResult
 
     try:
         firecrawl_result = await firecrawl_fetch_url(url)
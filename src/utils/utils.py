@@ -399,8 +399,8 @@ def encode_image_base64(image):
     return base64.b64encode(buffered.getvalue()).decode("utf-8")
 
 
-def make_image_url(base64_image):
-    return f"data:image/png;base64,{base64_image}"
+def make_image_url(base64_image, mime_type="image/png"):
+    return f"data:{mime_type};base64,{base64_image}"
 
 
 def make_init_file(folder: str | Path):
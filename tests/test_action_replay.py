@@ -0,0 +1,75 @@
+import asyncio
+import tempfile
+import unittest
+
+from browser_use.agent.views import ActionResult
+
+from src.tools.browser.replay import ActionRecorder, ActionRecordStore
+
+
+class _Page():
+    def __init__(self):
+        self.text = "https://example.com\nExample\nHello"
+
+    async def evaluate(self, script):
+        return self.text
+
+
+class _BrowserContext():
+    def __init__(self):
+        self.page = _Page()
+
+    async def get_current_page(self):
+        return self.page
+
+
+class TestActionReplay(unittest.TestCase):
+
+    def run_task(self, store, browser_context, actions):
+        recorder = ActionRecorder(store, key="task")
+        calls = []
+
+        async def scenario():
+            results = []
+            for action_name, params in actions:
+                async def execute(action_name=action_name):
+                    calls.append(action_name)
+                    if action_name == "go_to_url":
+                        browser_context.page.text = f"{params['url']}\nPage\nContent"
+                    return ActionResult(extracted_content=f"{action_name} done")
+                results.append(await recorder.run(action_name, params, browser_context, execute))
+            return results
+
+        return asyncio.run(scenario()), calls, recorder
+
+    def test_replays_read_only_prefix(self):
+        actions = [
+            ("go_to_url", {"url": "https://example.org"}),
+            ("extract_content", {"goal": "title", "should_strip_link_urls": True}),
+        ]
+        with tempfile.TemporaryDirectory() as root:
+            store = ActionRecordStore(root)
+            _, calls, _ = self.run_task(store, _BrowserContext(), actions)
+            self.assertEqual(calls, ["go_to_url", "extract_content"])
+
+            results, calls, recorder = self.run_task(store, _BrowserContext(), actions)
+            self.assertEqual(calls, ["go_to_url"])
+            self.assertEqual(results[1].extracted_content, "extract_content done")
+            self.assertEqual(recorder.replayed, 1)
+            self.assertEqual(len(store.load("task")), 2)
+
+    def test_changed_page_is_not_replayed(self):
+        actions = [("extract_content", {"goal": "title", "should_strip_link_urls": True})]
+        with tempfile.TemporaryDirectory() as root:
+            store = ActionRecordStore(root)
+            self.run_task(store, _BrowserContext(), actions)
+
+            browser_context = _BrowserContext()
+            browser_context.page.text = "https://example.com\nExample\nUpdated"
+            _, calls, recorder = self.run_task(store, browser_context, actions)
+            self.assertEqual(calls, ["extract_content"])
+            self.assertTrue(recorder.diverged)
+
+
+if __name__ == '__main__':
+    unittest.main()
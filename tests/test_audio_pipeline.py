@@ -0,0 +1,68 @@
+import asyncio
+import tempfile
+import unittest
+
+from pydub import AudioSegment
+from pydub.generators import Sine
+
+from src.tools.markdown.audio_pipeline import split_audio, stitch_transcripts, transcribe_chunks
+from src.tools.markdown.cache import ConversionCache
+
+
+def make_audio() -> AudioSegment:
+    tone = Sine(440).to_audio_segment(duration=50_000, volume=-10)
+    return tone + AudioSegment.silent(duration=2_000) + tone
+
+
+class TestAudioPipeline(unittest.TestCase):
+
+    def test_split_cuts_at_pauses(self):
+        chunks = split_audio(make_audio(), chunk_seconds=60, export_format="wav")
+        self.assertEqual(len(chunks), 2)
+        self.assertTrue(50_000 <= chunks[0].end_ms <= 52_000)
+        self.assertEqual(chunks[1].start_ms, chunks[0].end_ms)
+        self.assertEqual(chunks[-1].end_ms, 102_000)
+
+    def test_transcribes_concurrently_with_cache(self):
+        chunks = split_audio(make_audio(), chunk_seconds=60, export_format="wav")
+        calls = []
+
+        async def transcribe(file_stream):
+            calls.append(file_stream.name)
+            await asyncio.sleep(0)
+            return f"text of {file_stream.name}"
+
+        with tempfile.TemporaryDirectory() as cache_dir:
+            cache = ConversionCache(cache_dir)
+            texts = asyncio.run(transcribe_chunks(chunks, transcribe, max_concurrency=2, cache=cache))
+            self.assertEqual(len(calls), 2)
+            self.assertEqual(asyncio.run(transcribe_chunks(chunks, transcribe, cache=cache)), texts)
+            self.assertEqual(len(calls), 2)
+
+        transcript = stitch_transcripts(chunks, texts)
+        self.assertTrue(transcript.startswith("[00:00:00 - 00:00:5"))
+        self.assertEqual(len(transcript.splitlines()), 2)
+
+    def test_failed_chunks_are_retried_and_not_cached(self):
+        chunks = split_audio(make_audio(), chunk_seconds=60, export_format="wav")
+        failures = {chunks[1].start_ms: 1}
+
+        async def transcribe(file_stream):
+            start_ms = int(file_stream.name.split("_")[1].split(".")[0])
+            if failures.get(start_ms, 0) > 0:
+                failures[start_ms] -= 1
+                raise ValueError("The transcription response has no text")
+            return f"text of {start_ms}"
+
+        with tempfile.TemporaryDirectory() as cache_dir:
+            cache = ConversionCache(cache_dir)
+            texts = asyncio.run(transcribe_chunks(chunks, transcribe, cache=cache, retry_delay=0))
+            self.assertEqual(texts, [f"text of {chunk.start_ms}" for chunk in chunks])
+
+            failures[chunks[0].start_ms] = 5
+            with self.assertRaises(ValueError):
+                asyncio.run(transcribe_chunks(chunks[:1], transcribe, retry_delay=0))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,76 @@
+import os
+import io
+import tempfile
+import unittest
+import warnings
+from contextlib import redirect_stdout
+
+from src.metric.gaia_scorer import question_scorer, batch_question_scorer
+from src.metric.analytics import load_results, score_results, summarize_results
+from src.utils.results_store import ResultsStore
+
+
+PAIRS = [
+    ("42", "42"),
+    ("$1,000", "1000"),
+    ("12%", "12"),
+    ("forty two", "42"),
+    ("3.0", "3"),
+    ("Sea Gull!", "seagull"),
+    ("sea-gull", "Seagull"),
+    ("Paris", "London"),
+    ("a, b, 3", "A,B,3"),
+    ("a; b", "a,b"),
+    ("a, b", "a, b, c"),
+    ("1, x", "1.0, y"),
+    ("St. Petersburg, 2", "st.petersburg,2"),
+    ("", "0"),
+    ("inf", "1e400"),
+]
+
+
+class TestBatchScoring(unittest.TestCase):
+
+    def test_matches_question_scorer(self):
+        with warnings.catch_warnings(), redirect_stdout(io.StringIO()):
+            warnings.simplefilter("ignore")
+            expected = [question_scorer(answer, truth) for answer, truth in PAIRS]
+        scores = batch_question_scorer([answer for answer, _ in PAIRS], [truth for _, truth in PAIRS], dataset="test")
+        self.assertEqual(scores.tolist(), expected)
+
+    def test_batch_is_silent(self):
+        with warnings.catch_warnings(record=True) as caught, redirect_stdout(io.StringIO()) as output:
+            warnings.simplefilter("always")
+            batch_question_scorer(["a, b", "not a number"], ["a, b, c", "7"])
+        self.assertEqual(caught, [])
+        self.assertEqual(output.getvalue(), "")
+
+    def test_summary_per_level(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            store = ResultsStore(os.path.join(tmpdir, "dra.jsonl"))
+            store.append({"task_id": "a", "task": "1", "prediction": "Paris", "true_answer": "paris",
+                          "start_time": "2025-01-01 00:00:00", "end_time": "2025-01-01 00:00:10",
+                          "token_usage": {"input_tokens": 100, "output_tokens": 10}})
+            store.append({"task_id": "b", "task": "1", "prediction": "Unable to determine", "true_answer": "2",
+                          "start_time": "2025-01-01 00:00:00", "end_time": "2025-01-01 00:00:30",
+                          "intermediate_steps": ["ActionStep(token_usage=TokenUsage(input_tokens=50, "
+                                                 "output_tokens=5, total_tokens=55))"]})
+            store.append({"task_id": "c", "task": "2", "prediction": "7", "true_answer": "7",
+                          "start_time": "2025-01-01 00:00:00", "end_time": "2025-01-01 00:01:00"})
+            store.append({"task_id": "d", "task": "2", "prediction": "x", "true_answer": "?"})
+
+            results = score_results(load_results(store.path))
+            summary = summarize_results(results)
+
+        self.assertEqual(summary.loc["1", "tasks"], 2)
+        self.assertEqual(summary.loc["1", "accuracy"], 0.5)
+        self.assertEqual(summary.loc["1", "latency_mean"], 20.0)
+        self.assertEqual(summary.loc["1", "input_tokens_mean"], 75.0)
+        self.assertEqual(summary.loc["2", "accuracy"], 1.0)
+        self.assertEqual(summary.loc["all", "tasks"], 4)
+        self.assertEqual(summary.loc["all", "correct"], 2)
+        self.assertEqual(summary.loc["all", "answered"], 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
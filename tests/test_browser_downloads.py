@@ -0,0 +1,73 @@
+import os
+import time
+import tempfile
+import unittest
+import urllib.request
+
+from src.tools.browser.file_server import StaticFileServer
+from src.tools.browser.downloader import AsyncDownloader, DownloadTooLarge
+
+
+class TestBrowserDownloads(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.root = os.path.join(self.tmpdir.name, "root")
+        os.makedirs(self.root)
+        with open(os.path.join(self.root, "doc.pdf"), "wb") as f:
+            f.write(b"%PDF-1.4" + b"0" * 4096)
+        self.server = StaticFileServer(self.root).start()
+
+    def tearDown(self):
+        self.server.close()
+        self.tmpdir.cleanup()
+
+    def test_servers_bind_distinct_ports(self):
+        other = StaticFileServer(self.root).start()
+        try:
+            self.assertNotEqual(other.port, self.server.port)
+            with urllib.request.urlopen(other.url("doc.pdf")) as response:
+                self.assertTrue(response.read().startswith(b"%PDF"))
+        finally:
+            other.close()
+
+    async def test_download_is_cached_by_url(self):
+        downloader = AsyncDownloader(os.path.join(self.tmpdir.name, "cache"))
+        save_path = os.path.join(self.tmpdir.name, "saved.pdf")
+        await downloader.download(self.server.url("doc.pdf"), save_path)
+        self.assertEqual(os.path.getsize(save_path), 4104)
+
+        os.remove(os.path.join(self.root, "doc.pdf"))
+        await downloader.download(self.server.url("doc.pdf"), save_path)
+        self.assertEqual(os.path.getsize(save_path), 4104)
+
+    async def test_expired_downloads_are_fetched_again(self):
+        downloader = AsyncDownloader(os.path.join(self.tmpdir.name, "cache"), ttl=60)
+        path = await downloader.fetch(self.server.url("doc.pdf"))
+        with open(os.path.join(self.root, "doc.pdf"), "wb") as f:
+            f.write(b"%PDF-1.5")
+        self.assertEqual(os.path.getsize(await downloader.fetch(self.server.url("doc.pdf"))), 4104)
+
+        os.utime(path, (time.time() - 120, time.time() - 120))
+        self.assertEqual(os.path.getsize(await downloader.fetch(self.server.url("doc.pdf"))), 8)
+
+    async def test_oldest_downloads_are_evicted(self):
+        with open(os.path.join(self.root, "other.pdf"), "wb") as f:
+            f.write(b"%PDF-1.4" + b"1" * 4096)
+        downloader = AsyncDownloader(os.path.join(self.tmpdir.name, "cache"), max_cache_bytes=6000)
+        first = await downloader.fetch(self.server.url("doc.pdf"))
+        os.utime(first, (time.time() - 10, time.time() - 10))
+        second = await downloader.fetch(self.server.url("other.pdf"))
+        self.assertFalse(os.path.exists(first))
+        self.assertTrue(os.path.exists(second))
+        self.assertEqual(downloader.evictions, 1)
+
+    async def test_size_limit(self):
+        downloader = AsyncDownloader(os.path.join(self.tmpdir.name, "cache"), max_bytes=1024)
+        with self.assertRaises(DownloadTooLarge):
+            await downloader.fetch(self.server.url("doc.pdf"))
+        self.assertEqual(os.listdir(downloader.cache_dir), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
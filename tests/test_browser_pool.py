@@ -0,0 +1,90 @@
+import asyncio
+import unittest
+
+from src.tools.browser.pool import BrowserPool, _PooledBrowser
+
+
+class _Context():
+    async def close(self):
+        pass
+
+
+class _Browser():
+    def __init__(self):
+        self.closed = False
+
+    async def new_context(self, config):
+        return _Context()
+
+    async def close(self):
+        self.closed = True
+
+
+class _FakePool(BrowserPool):
+    def __init__(self, launch_gate=None, fail_relaunch=False, fail_start_index=None, **kwargs):
+        super().__init__(**kwargs)
+        self.launch_gate = launch_gate
+        self.fail_relaunch = fail_relaunch
+        self.fail_start_index = fail_start_index
+        self.launched = []
+
+    async def _launch(self, index):
+        if self._browsers is None and index == self.fail_start_index:
+            raise RuntimeError("launch failed")
+        if self._browsers is not None:
+            if self.fail_relaunch:
+                raise RuntimeError("launch failed")
+            if self.launch_gate is not None:
+                await self.launch_gate.wait()
+        self._launches += 1
+        pooled = _PooledBrowser(index, _Browser())
+        self.launched.append(pooled)
+        return pooled
+
+
+class TestBrowserPool(unittest.IsolatedAsyncioTestCase):
+
+    async def test_failed_relaunch_keeps_the_browser(self):
+        pool = _FakePool(size=1, max_tasks_per_browser=1, fail_relaunch=True)
+        context = await pool.acquire()
+        first = pool._browsers[0]
+        await pool.release(context)
+
+        self.assertIs(pool._browsers[0], first)
+        self.assertFalse(first.retiring)
+        self.assertFalse(first.browser.closed)
+        context = await asyncio.wait_for(pool.acquire(), timeout=1)
+        await pool.release(context)
+        await pool.close()
+
+    async def test_acquire_is_not_blocked_by_a_relaunch(self):
+        gate = asyncio.Event()
+        pool = _FakePool(size=2, max_tasks_per_browser=1, max_contexts_per_browser=1, launch_gate=gate)
+        await pool.start()
+        first = pool._browsers[0]
+        context = await pool.acquire()
+        release = asyncio.create_task(pool.release(context))
+        await asyncio.sleep(0)
+
+        other = await asyncio.wait_for(pool.acquire(), timeout=1)
+        self.assertIs(pool._owners[id(other)], pool._browsers[1])
+
+        gate.set()
+        await release
+        self.assertIsNot(pool._browsers[0], first)
+        self.assertTrue(first.browser.closed)
+        self.assertEqual(pool.metrics()["recycles"], 1)
+        await pool.release(other)
+        await pool.close()
+
+    async def test_failed_start_closes_the_launched_browsers(self):
+        pool = _FakePool(size=3, fail_start_index=1)
+        with self.assertRaises(RuntimeError):
+            await pool.start()
+        self.assertIsNone(pool._browsers)
+        self.assertEqual(len(pool.launched), 2)
+        self.assertTrue(all(pooled.browser.closed for pooled in pool.launched))
+
+
+if __name__ == '__main__':
+    unittest.main()
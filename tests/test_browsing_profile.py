@@ -0,0 +1,118 @@
+import asyncio
+import unittest
+
+from src.tools.browser.profile import BrowsingProfile, SubresourceCache
+
+
+class _Frame():
+    def __init__(self, page):
+        self.page = page
+        self.parent_frame = None
+
+
+class _Page():
+    pass
+
+
+class _Request():
+    def __init__(self, url, resource_type, page, navigation=False, method="GET", size=0):
+        self.url = url
+        self.resource_type = resource_type
+        self.method = method
+        self.headers = {}
+        self.frame = _Frame(page)
+        self._navigation = navigation
+        self._size = size
+
+    def is_navigation_request(self):
+        return self._navigation
+
+    async def sizes(self):
+        return {"responseBodySize": self._size, "responseHeadersSize": 0}
+
+
+class _Response():
+    def __init__(self, body, headers=None):
+        self.status = 200
+        self.headers = {"content-type": "text/javascript", **(headers or {})}
+        self._body = body
+
+    async def body(self):
+        return self._body
+
+
+class _Route():
+    def __init__(self, body=b"", headers=None):
+        self.body = body
+        self.headers = headers
+        self.outcome = None
+
+    async def abort(self, error_code=None):
+        self.outcome = "abort"
+
+    async def continue_(self):
+        self.outcome = "continue"
+
+    async def fetch(self, max_redirects=None):
+        return _Response(self.body, self.headers)
+
+    async def fulfill(self, response=None, status=None, headers=None, body=None):
+        self.outcome = "fetched" if response is not None else "cached"
+
+
+class TestBrowsingProfile(unittest.TestCase):
+
+    def test_blocks_resource_types_and_domains(self):
+        profile = BrowsingProfile(blocked_resource_types=["image", "media"])
+        self.assertTrue(profile.should_block("https://example.com/a.png", "image"))
+        self.assertFalse(profile.should_block("https://example.com/", "document"))
+        self.assertTrue(profile.should_block("https://stats.g.doubleclick.net/x.js", "script"))
+        self.assertFalse(profile.should_block("https://notdoubleclick.net/x.js", "script"))
+
+    def test_cache_serves_repeats_and_evicts(self):
+        cache = SubresourceCache(max_bytes=10)
+        self.assertTrue(cache.put("a", 200, {}, b"123456"))
+        self.assertFalse(cache.put("b", 404, {}, b"1"))
+        self.assertFalse(cache.put("c", 200, {"cache-control": "no-store"}, b"1"))
+        self.assertTrue(cache.put("d", 200, {}, b"123456"))
+        self.assertIsNone(cache.get("a"))
+        self.assertEqual(cache.get("d")[2], b"123456")
+        self.assertEqual(cache.size, 6)
+
+    def test_cache_skips_private_responses(self):
+        cache = SubresourceCache()
+        self.assertFalse(cache.put("a", 200, {"cache-control": "private, max-age=60"}, b"1"))
+        self.assertFalse(cache.put("b", 200, {"vary": "Cookie"}, b"1"))
+        self.assertFalse(cache.put("c", 200, {"set-cookie": "id=1"}, b"1"))
+        self.assertTrue(cache.put("d", 200, {"vary": "Accept-Encoding"}, b"1"))
+
+    def test_route_caches_and_caps_page_weight(self):
+        profile = BrowsingProfile(max_page_bytes=5, cache_subresources=True)
+        page = _Page()
+
+        async def run(url, resource_type, body=b"", navigation=False, method="GET", headers=None):
+            route = _Route(body, headers)
+            request = _Request(url, resource_type, page, navigation, method, size=len(body))
+            await profile.handle_route(route, request)
+            if route.outcome != "abort":
+                await profile.handle_request_finished(request)
+            return route.outcome
+
+        async def scenario():
+            self.assertEqual(await run("https://example.com/", "document", b"<html>", True), "continue")
+            self.assertEqual(await run("https://example.com/a.js", "script", b"1234"), "abort")
+            self.assertEqual(await run("https://example.com/", "document", b"", True), "continue")
+            self.assertEqual(await run("https://example.com/api", "xhr", b"1", method="POST"), "continue")
+            self.assertEqual(await run("https://example.com/a.js", "script", b"12"), "fetched")
+            self.assertEqual(await run("https://example.com/a.js", "script", b"12"), "cached")
+            self.assertEqual(await run("https://example.com/p.js", "script", b"1", headers={"cache-control": "private"}),
+                             "fetched")
+            self.assertEqual(await run("https://example.com/p.js", "script", b"1"), "abort")
+            self.assertEqual(await run("https://example.com/v.mp4", "media"), "abort")
+
+        asyncio.run(scenario())
+        self.assertEqual(profile.metrics()["cache_hits"], 1)
+        self.assertEqual(profile.metrics()["over_budget"], 2)
+
+if __name__ == '__main__':
+    unittest.main()
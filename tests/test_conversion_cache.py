@@ -0,0 +1,59 @@
+import os
+import time
+import tempfile
+import unittest
+
+from src.tools.markdown.cache import ConversionCache
+
+
+class TestConversionCache(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cache_dir = os.path.join(self.tmp.name, "cache")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write(self, name: str, content: bytes) -> str:
+        path = os.path.join(self.tmp.name, name)
+        with open(path, "wb") as f:
+            f.write(content)
+        return path
+
+    def test_key_follows_content_and_options(self):
+        cache = ConversionCache(self.cache_dir)
+        first = self.write("a.pdf", b"same content")
+        second = self.write("b.pdf", b"same content")
+        options = {"version": "1"}
+        self.assertEqual(cache.key(first, options), cache.key(second, options))
+        self.assertNotEqual(cache.key(first, options), cache.key(first, {"version": "2"}))
+
+        time.sleep(0.01)
+        self.write("a.pdf", b"new content")
+        self.assertNotEqual(cache.key(first, options), cache.key(second, options))
+
+    def test_get_put_and_stats(self):
+        cache = ConversionCache(self.cache_dir)
+        key = cache.key(self.write("a.mp3", b"audio"), {})
+        self.assertIsNone(cache.get(key))
+        cache.put(key, {"markdown": "transcript", "title": None})
+        self.assertEqual(ConversionCache(self.cache_dir).get(key)["markdown"], "transcript")
+        stats = cache.stats()
+        self.assertEqual((stats["misses"], stats["entries"]), (1, 1))
+
+    def test_evicts_least_recently_used(self):
+        cache = ConversionCache(self.cache_dir, max_bytes=400)
+        for index in range(3):
+            cache.put(f"key{index}", {"markdown": "x" * 100})
+            os.utime(os.path.join(self.cache_dir, f"key{index}.json"), (index, index))
+        cache.get("key0")
+        cache.put("key3", {"markdown": "x" * 100})
+        self.assertIsNotNone(cache.get("key0"))
+        self.assertIsNone(cache.get("key1"))
+        self.assertLessEqual(cache.size, 400)
+        self.assertGreater(cache.stats()["evictions"], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
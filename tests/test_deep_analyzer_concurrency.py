@@ -0,0 +1,75 @@
+import asyncio
+import unittest
+
+from src.tools.deep_analyzer import DeepAnalyzerTool
+
+
+class _Analyzer(DeepAnalyzerTool):
+    def __init__(self, delays, quorum=None, analyzer_timeout=None):
+        # No registered models needed, the analysis is faked below
+        self.analyzer_models = {name: delay for name, delay in delays.items()}
+        self.concurrent = True
+        self.quorum = quorum
+        self.analyzer_timeout = analyzer_timeout
+        self.cancelled = []
+
+    async def _analyze_content(self, model, content, add_note=False):
+        delay = model
+        if delay is None:
+            raise RuntimeError("model error")
+        try:
+            await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            self.cancelled.append(delay)
+            raise
+        return f"answer after {delay}"
+
+
+class TestDeepAnalyzerConcurrency(unittest.TestCase):
+
+    def test_runs_models_in_parallel(self):
+        analyzer = _Analyzer({"a": 0.2, "b": 0.2, "c": None})
+
+        async def run():
+            start = asyncio.get_running_loop().time()
+            analysis, succeeded = await analyzer._analyze_concurrently([], False)
+            return analysis, succeeded, asyncio.get_running_loop().time() - start
+
+        analysis, succeeded, elapsed = asyncio.run(run())
+        self.assertLess(elapsed, 0.35)
+        self.assertEqual(list(analysis), ["a", "b", "c"])
+        self.assertEqual(analysis["c"], "Analysis failed: model error")
+        self.assertEqual(succeeded, {"a", "b"})
+
+    def test_quorum_cancels_stragglers(self):
+        analyzer = _Analyzer({"fast": 0.01, "failing": None, "slow": 5}, quorum=1)
+        analysis, _ = asyncio.run(analyzer._analyze_concurrently([], False))
+        self.assertEqual(analysis["fast"], "answer after 0.01")
+        self.assertNotIn("slow", analysis)
+        self.assertEqual(analyzer.cancelled, [5])
+
+    def test_timeout(self):
+        analyzer = _Analyzer({"slow": 5}, analyzer_timeout=0.05)
+        analysis, succeeded = asyncio.run(analyzer._analyze_concurrently([], False))
+        self.assertIn("no answer within", analysis["slow"])
+        self.assertEqual(succeeded, set())
+
+    def test_no_summary_when_every_model_fails(self):
+        analyzer = _Analyzer({"a": None, "b": None})
+
+        async def prepare_content(task, source):
+            return [], False
+
+        async def summarize(model, analysis):
+            raise AssertionError("the failures must not be summarized")
+
+        analyzer._prepare_content = prepare_content
+        analyzer._summarize = summarize
+        analyzer.summary_model = None
+        result = asyncio.run(analyzer.forward(task="task"))
+        self.assertIsNone(result.output)
+        self.assertIn("a: Analysis failed: model error", result.error)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,60 @@
+import unittest
+
+from PIL import Image, ImageDraw
+
+from src.utils.image_utils import ObservationImageEncoder
+from src.models.base import ChatMessage, MessageRole
+from src.models.message_manager import MessageManager, UNCHANGED_IMAGE_TEXT
+
+
+def make_screenshot(box_x: int) -> Image.Image:
+    image = Image.new("RGB", (1920, 1080), "white")
+    draw = ImageDraw.Draw(image)
+    draw.rectangle((box_x, 100, box_x + 600, 700), fill="black")
+    return image
+
+
+class TestObservationImageEncoder(unittest.TestCase):
+
+    def test_downscales_and_caches_encoding(self):
+        encoder = ObservationImageEncoder(max_size=(640, 640), image_format="JPEG")
+        image = make_screenshot(100)
+        encoded, mime_type = encoder.encode(image)
+        self.assertEqual(mime_type, "image/jpeg")
+        self.assertIs(encoder.encode(image)[0], encoded)
+        self.assertEqual(image.size, (1920, 1080))
+        self.assertEqual(encoder.prepare(image).size, (640, 360))
+
+    def test_deduplicates_unchanged_images(self):
+        encoder = ObservationImageEncoder()
+        first, same, moved = make_screenshot(100), make_screenshot(100), make_screenshot(1200)
+        self.assertTrue(encoder.is_duplicate(same, first))
+        self.assertFalse(encoder.is_duplicate(moved, first))
+        self.assertFalse(encoder.is_duplicate(first, None))
+        self.assertFalse(ObservationImageEncoder(dedup_distance=None).is_duplicate(same, first))
+
+    def test_small_edit_is_not_a_duplicate(self):
+        first, typed = make_screenshot(100), make_screenshot(100)
+        ImageDraw.Draw(typed).text((1400, 50), "query", fill="black")
+        self.assertFalse(ObservationImageEncoder().is_duplicate(typed, first))
+
+    def test_only_observation_images_are_encoded(self):
+        manager = MessageManager(model_id="gpt-4o")
+        attachment = make_screenshot(100)
+        messages = [
+            ChatMessage(role=MessageRole.USER, content=[{"type": "image", "image": attachment},
+                                                        {"type": "image", "image": attachment}]),
+            ChatMessage(role=MessageRole.ASSISTANT, content=[{"type": "text", "text": "ok"}]),
+            ChatMessage(role=MessageRole.USER, content=[{"type": "image", "image": attachment, "observation": True},
+                                                        {"type": "image", "image": attachment, "observation": True}]),
+        ]
+        output = manager.get_clean_message_list(messages, convert_images_to_image_urls=True)
+        task_content, observation_content = output[0]["content"], output[2]["content"]
+        self.assertEqual([element["type"] for element in task_content], ["image_url", "image_url"])
+        self.assertTrue(task_content[0]["image_url"]["url"].startswith("data:image/png;base64,"))
+        self.assertTrue(observation_content[0]["image_url"]["url"].startswith("data:image/jpeg;base64,"))
+        self.assertEqual(observation_content[1], {"type": "text", "text": UNCHANGED_IMAGE_TEXT})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,78 @@
+import contextlib
+import io
+import os
+import tempfile
+import unittest
+
+from src.tools.executor.large_objects import EXPORT_HELPER_CODE, LargeObjectHandle, parse_result_line
+
+
+class TestLargeObjectChannel(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        namespace = {}
+        exec(EXPORT_HELPER_CODE, namespace)
+        self.export_result = namespace["_export_result"]
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def _roundtrip(self, obj, threshold, materialize=True):
+        stdout = io.StringIO()
+        with contextlib.redirect_stdout(stdout):
+            self.export_result(obj, self.tmpdir.name, threshold)
+        is_result, result = parse_result_line(stdout.getvalue(), self.tmpdir.name, materialize=materialize)
+        self.assertTrue(is_result)
+        return result
+
+    def test_small_results_are_inlined(self):
+        result = self._roundtrip({"a": [1, 2, 3]}, threshold=1024)
+        self.assertEqual(result, {"a": [1, 2, 3]})
+        self.assertEqual(os.listdir(self.tmpdir.name), [])
+
+    def test_large_results_are_materialized(self):
+        value = list(range(10000))
+        self.assertEqual(self._roundtrip(value, threshold=1024), value)
+        self.assertEqual(os.listdir(self.tmpdir.name), [])
+
+    def test_large_results_are_passed_by_handle_on_request(self):
+        value = list(range(10000))
+        handle = self._roundtrip(value, threshold=1024, materialize=False)
+        self.assertIsInstance(handle, LargeObjectHandle)
+        self.assertEqual(handle.kind, "pickle")
+        self.assertEqual(handle.load(), value)
+
+        handle.release()
+        self.assertEqual(os.listdir(self.tmpdir.name), [])
+
+    def test_large_images_are_passed_as_raw_buffers(self):
+        try:
+            from PIL import Image
+        except ImportError:
+            self.skipTest("PIL is not installed")
+        image = Image.new("RGB", (64, 64), color=(10, 20, 30))
+        loaded = self._roundtrip(image, threshold=1024)
+        self.assertIsInstance(loaded, Image.Image)
+        self.assertEqual(loaded.size, (64, 64))
+        self.assertEqual(loaded.getpixel((5, 5)), (10, 20, 30))
+        self.assertEqual(os.listdir(self.tmpdir.name), [])
+
+    def test_large_dataframes_are_materialized(self):
+        try:
+            import pandas as pd
+            import pyarrow  # noqa: F401
+        except ImportError:
+            self.skipTest("pandas or pyarrow is not installed")
+        frame = pd.DataFrame({"a": range(1000), "b": [str(i) for i in range(1000)]})
+        loaded = self._roundtrip(frame, threshold=1024)
+        self.assertIsInstance(loaded, pd.DataFrame)
+        self.assertTrue(loaded.equals(frame))
+        self.assertEqual(os.listdir(self.tmpdir.name), [])
+
+    def test_non_result_lines(self):
+        self.assertEqual(parse_result_line("hello\n"), (False, None))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,54 @@
+import sys
+import types
+import unittest
+
+from src.utils.lazy_utils import lazy_exports
+from src.utils.import_profile import parse_importtime, totals_by_package
+
+
+IMPORTTIME_OUTPUT = """import time: self [us] | cumulative | imported package
+import time:       120 |        120 |   _io
+import time:        80 |        200 | io
+import time:       300 |        300 |     litellm.types
+import time:      1000 |       1300 |   litellm
+import time:        50 |       1350 | src.models
+"""
+
+
+class TestLazyExports(unittest.TestCase):
+
+    def setUp(self):
+        self.package = types.ModuleType("lazy_package")
+        self.package.__getattr__, self.package.__dir__ = lazy_exports("lazy_package", {"dumps": "json"})
+        sys.modules["lazy_package"] = self.package
+
+    def tearDown(self):
+        sys.modules.pop("lazy_package", None)
+
+    def test_import_on_first_access(self):
+        import json
+        self.assertNotIn("dumps", vars(self.package))
+        self.assertIs(self.package.dumps, json.dumps)
+        self.assertIs(vars(self.package)["dumps"], json.dumps)
+
+    def test_unknown_name(self):
+        with self.assertRaises(AttributeError):
+            self.package.loads
+        self.assertIn("dumps", dir(self.package))
+
+
+class TestImportProfile(unittest.TestCase):
+
+    def test_parse_importtime(self):
+        timings = parse_importtime(IMPORTTIME_OUTPUT)
+        self.assertEqual([timing.module for timing in timings], ["_io", "io", "litellm.types", "litellm", "src.models"])
+        self.assertEqual([timing.depth for timing in timings], [1, 0, 2, 1, 0])
+        self.assertEqual(timings[3].cumulative_us, 1300)
+
+        totals = totals_by_package(timings)
+        self.assertEqual(list(totals), ["litellm", "_io", "io", "src"])
+        self.assertEqual(totals["litellm"], 1300)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -219,6 +219,36 @@ finally:
         with self.assertRaisesRegex(InterpreterError, "Import of os is not allowed"):
             self._evaluate(code, authorized_imports=[])
 
+    def test_function_and_comprehension_scopes_do_not_leak(self):
+        code = """
+x = 10
+def f(n):
+    x = n * 2
+    return x
+squares = [i * i for i in range(5)]
+y = f(3)
+"""
+        state = {}
+        self._evaluate(code, state=state)
+        self.assertEqual(state["x"], 10)
+        self.assertEqual(state["y"], 6)
+        self.assertEqual(state["squares"], [0, 1, 4, 9, 16])
+        self.assertNotIn("i", state)
+        self.assertNotIn("n", state)
+
+    def test_recursive_function_reads_enclosing_state(self):
+        code = """
+offset = 1
+def fact(n):
+    if n <= 1:
+        return offset
+    return n * fact(n - 1)
+result = fact(5)
+"""
+        state = {}
+        self._evaluate(code, state=state)
+        self.assertEqual(state["result"], 120)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,91 @@
+import asyncio
+import tempfile
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+
+from src.tools.map_reduce import MapReduceReader
+from src.tools.markdown.cache import ConversionCache
+
+
+class _WordEncoding():
+    """One token per word, so the tests do not need the tiktoken encodings."""
+
+    def encode(self, text):
+        return text.split()
+
+    def decode(self, tokens):
+        return " ".join(tokens)
+
+
+class _FakeModel():
+    def __init__(self):
+        self.prompts = []
+
+    async def __call__(self, messages):
+        prompt = messages[0].content[0]["text"]
+        self.prompts.append(prompt)
+        if prompt.startswith("Below are notes"):
+            return SimpleNamespace(content="merged")
+        return SimpleNamespace(content=f"note {len(self.prompts)}")
+
+
+class _EmptyMergeModel(_FakeModel):
+    """Writes notes but returns no content when merging them, like a filtered response."""
+
+    async def __call__(self, messages):
+        response = await super().__call__(messages)
+        return SimpleNamespace(content=None) if response.content == "merged" else response
+
+
+class TestMapReduceReader(unittest.TestCase):
+
+    def setUp(self):
+        patcher = mock.patch("src.utils.token_utils.get_encoding", return_value=_WordEncoding())
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+    def test_short_text_is_returned_unchanged(self):
+        model = _FakeModel()
+        reader = MapReduceReader(model, "fake", chunk_tokens=10)
+        self.assertEqual(asyncio.run(reader.read("a few words", task="t", source="s", max_tokens=10)),
+                         "a few words")
+        self.assertEqual(model.prompts, [])
+
+    def test_maps_chunks_and_reduces_hierarchically(self):
+        model = _FakeModel()
+        reader = MapReduceReader(model, "fake", chunk_tokens=4)
+        text = "\n\n".join(" ".join(["word"] * 4) for _ in range(6))
+        result = asyncio.run(reader.read(text, task="the task", source="file.pdf", max_tokens=1))
+        self.assertEqual(result, "merged")
+        map_prompts = [prompt for prompt in model.prompts if not prompt.startswith("Below are notes")]
+        self.assertEqual(len(map_prompts), 6)
+        self.assertTrue(all("the task" not in prompt for prompt in map_prompts))
+        self.assertGreater(len(model.prompts), 7)
+
+    def test_notes_are_cached_by_chunk(self):
+        cache = ConversionCache(self.tmp.name)
+        text = "\n\n".join(" ".join([f"word{index}"] * 4) for index in range(3))
+
+        first = _FakeModel()
+        notes = asyncio.run(MapReduceReader(first, "fake", chunk_tokens=4, cache=cache).map(text))
+        second = _FakeModel()
+        self.assertEqual(asyncio.run(MapReduceReader(second, "fake", chunk_tokens=4, cache=cache).map(text)), notes)
+        self.assertEqual(second.prompts, [])
+
+        other = _FakeModel()
+        asyncio.run(MapReduceReader(other, "other", chunk_tokens=4, cache=cache).map(text))
+        self.assertEqual(len(other.prompts), 3)
+
+    def test_empty_responses_do_not_break_the_reduce(self):
+        model = _EmptyMergeModel()
+        reader = MapReduceReader(model, "fake", chunk_tokens=4)
+        text = "\n\n".join(" ".join(["word"] * 4) for _ in range(6))
+        result = asyncio.run(reader.read(text, task="t", source="s", max_tokens=1))
+        self.assertEqual(result.strip(), "")
+
+
+if __name__ == '__main__':
+    unittest.main()
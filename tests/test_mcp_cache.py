@@ -0,0 +1,56 @@
+import os
+import tempfile
+import unittest
+
+from src.mcp.cache import MCPToolsCache, fingerprint_tools
+
+CONFIG = {
+    "mcpServers": {
+        "LocalMCP": {
+            "command": "python",
+            "args": ["src/mcp/server.py"],
+        }
+    }
+}
+
+TOOLS = [
+    {"name": "get_weather", "description": "Weather.", "inputSchema": {"type": "object", "properties": {}}},
+    {"name": "get_time", "description": "Time.", "inputSchema": {"type": "object", "properties": {}}},
+]
+
+
+class TestMCPToolsCache(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_snapshot_survives_restart(self):
+        MCPToolsCache(self.tmpdir.name).save(CONFIG, TOOLS)
+        self.assertEqual(MCPToolsCache(self.tmpdir.name).load(CONFIG), TOOLS)
+
+    def test_key_depends_on_server_definitions(self):
+        cache = MCPToolsCache(self.tmpdir.name)
+        cache.save(CONFIG, TOOLS)
+        other = {"mcpServers": {"LocalMCP": {"command": "python", "args": ["other.py"]}}}
+        self.assertIsNone(cache.load(other))
+
+    def test_ttl_and_invalidate(self):
+        MCPToolsCache(self.tmpdir.name).save(CONFIG, TOOLS)
+        self.assertIsNone(MCPToolsCache(self.tmpdir.name, ttl=0).load(CONFIG))
+
+        cache = MCPToolsCache(self.tmpdir.name)
+        cache.invalidate(CONFIG)
+        self.assertIsNone(cache.load(CONFIG))
+        self.assertEqual(os.listdir(self.tmpdir.name), [])
+
+    def test_fingerprint_ignores_order(self):
+        self.assertEqual(fingerprint_tools(TOOLS), fingerprint_tools(list(reversed(TOOLS))))
+        changed = [dict(TOOLS[0], inputSchema={"type": "object", "properties": {"city": {}}}), TOOLS[1]]
+        self.assertNotEqual(fingerprint_tools(TOOLS), fingerprint_tools(changed))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,44 @@
+import unittest
+
+from src.models.models import ModelManager, ModelRegistry
+
+
+class TestModelRegistry(unittest.TestCase):
+
+    def test_built_on_first_access(self):
+        calls = []
+        registry = ModelRegistry()
+        registry.register("a", lambda: calls.append("a") or object())
+        registry.register("b", lambda: calls.append("b") or object())
+
+        self.assertIn("a", registry)
+        self.assertEqual(list(registry.keys()), ["a", "b"])
+        self.assertEqual(calls, [])
+
+        model = registry["a"]
+        self.assertIs(registry["a"], model)
+        self.assertEqual(calls, ["a"])
+        self.assertTrue(registry.is_built("a"))
+        self.assertFalse(registry.is_built("b"))
+
+        with self.assertRaises(KeyError):
+            registry["c"]
+        self.assertIsNone(registry.get("c"))
+
+    def test_register_replaces_built_model(self):
+        registry = ModelRegistry()
+        registry.register("a", lambda: 1)
+        self.assertEqual(registry["a"], 1)
+        registry.register("a", lambda: 2)
+        self.assertEqual(registry["a"], 2)
+
+    def test_init_models_builds_nothing(self):
+        manager = ModelManager()
+        manager.init_models(use_local_proxy=True)
+        self.assertIn("gpt-4.1", manager.registed_models)
+        self.assertIn("whisper", manager.registed_models)
+        self.assertFalse(any(manager.registed_models.is_built(name) for name in manager.registed_models))
+
+
+if __name__ == '__main__':
+    unittest.main()
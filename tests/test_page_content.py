@@ -0,0 +1,43 @@
+import unittest
+
+from src.tools.browser.page_content import (CHUNK_SEPARATOR,
+                                            score_chunks,
+                                            select_relevant_content,
+                                            split_into_chunks)
+
+PAGE = "\n\n".join(
+    [f"# Section {i}\n\n" + "filler text about nothing in particular. " * 20 for i in range(20)]
+    + ["# Population\n\nThe population of the city was 1,234,567 in the 2020 census."]
+    + [f"# Appendix {i}\n\n" + "more unrelated filler. " * 20 for i in range(5)]
+)
+
+
+class TestPageContent(unittest.TestCase):
+
+    def test_split_respects_headings_and_size(self):
+        chunks = split_into_chunks(PAGE, chunk_size=500)
+        self.assertTrue(all(len(chunk) <= 500 for chunk in chunks))
+        self.assertTrue(any(chunk.startswith("# Population") for chunk in chunks))
+        self.assertEqual(len(split_into_chunks("a" * 1200, chunk_size=500)), 3)
+
+    def test_scores_favor_matching_chunks(self):
+        chunks = ["nothing here", "the city population in 2020", "population"]
+        scores = score_chunks(chunks, "What was the population of the city?")
+        self.assertEqual(scores[0], 0.0)
+        self.assertGreater(scores[1], scores[0])
+
+    def test_select_keeps_relevant_sections_in_budget(self):
+        content, selected, total = select_relevant_content(PAGE, "city population census", max_chars=1500)
+        self.assertIn("1,234,567", content)
+        self.assertLessEqual(len(content), 1500)
+        self.assertLess(selected, total)
+
+    def test_small_pages_and_vague_goals(self):
+        self.assertEqual(select_relevant_content("short page", "anything", max_chars=100), ("short page", 1, 1))
+        content, _, _ = select_relevant_content(PAGE, "summarize", max_chars=2000)
+        self.assertTrue(content.startswith("# Section 0"))
+        self.assertNotIn(CHUNK_SEPARATOR, content)
+
+
+if __name__ == "__main__":
+    unittest.main()
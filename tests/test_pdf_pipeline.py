@@ -0,0 +1,78 @@
+import unittest
+import os
+import tempfile
+
+from pdfminer.high_level import extract_text
+
+from src.tools.markdown.pdf_pipeline import (parse_page_range, select_pages, count_pages, convert_pages,
+                                             iter_pdf_pages, pdf_to_markdown)
+
+
+def write_pdf(path: str, page_texts):
+    """A pdf whose pages show a text directly and a stamp text inside a form XObject."""
+    objects = ["<< /Type /Catalog /Pages 2 0 R >>", None,
+               "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    page_ids = []
+    for text in page_texts:
+        form_stream = f"BT /F1 10 Tf 10 10 Td (Stamp {text}) Tj ET"
+        objects.append(f"<< /Type /XObject /Subtype /Form /BBox [0 0 200 50] "
+                       f"/Resources << /Font << /F1 3 0 R >> >> /Length {len(form_stream)} >>\n"
+                       f"stream\n{form_stream}\nendstream")
+        form_id = len(objects)
+        content = f"BT /F1 12 Tf 72 720 Td (Body {text}) Tj ET q 1 0 0 1 72 600 cm /Fm1 Do Q"
+        objects.append(f"<< /Length {len(content)} >>\nstream\n{content}\nendstream")
+        content_id = len(objects)
+        objects.append(f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Contents {content_id} 0 R "
+                       f"/Resources << /Font << /F1 3 0 R >> /XObject << /Fm1 {form_id} 0 R >> >> >>")
+        page_ids.append(len(objects))
+    objects[1] = f"<< /Type /Pages /Kids [{' '.join(f'{i} 0 R' for i in page_ids)}] /Count {len(page_ids)} >>"
+
+    data, offsets = b"%PDF-1.4\n", []
+    for index, body in enumerate(objects, start=1):
+        offsets.append(len(data))
+        data += f"{index} 0 obj\n{body}\nendobj\n".encode("latin-1")
+    xref = len(data)
+    data += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode("latin-1")
+    data += "".join(f"{offset:010d} 00000 n \n" for offset in offsets).encode("latin-1")
+    data += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode("latin-1")
+    with open(path, "wb") as f:
+        f.write(data)
+
+
+class TestPdfPipeline(unittest.TestCase):
+
+    def test_parse_page_range(self):
+        self.assertEqual(parse_page_range("1-3,7,10-", 12), [1, 2, 3, 7, 10, 11, 12])
+        self.assertEqual(parse_page_range("-2, 2, 40", 5), [1, 2])
+        self.assertEqual(parse_page_range("", 5), [])
+
+    def test_select_pages(self):
+        self.assertEqual(select_pages(5), [1, 2, 3, 4, 5])
+        self.assertEqual(select_pages(500, max_pages=3), [1, 2, 3])
+        self.assertEqual(select_pages(500, pages="100-", max_pages=2), [100, 101])
+
+    def test_text_matches_pdfminer(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "stamped.pdf")
+            write_pdf(path, [f"page {number}" for number in range(1, 4)])
+
+            self.assertEqual(count_pages(path), 3)
+            self.assertEqual(pdf_to_markdown(path, detect_tables=False), extract_text(path))
+            self.assertIn("Stamp page 2", extract_text(path))
+
+            results = convert_pages(path, [3, 1], detect_tables=False)
+            self.assertEqual([result.page_number for result in results], [1, 3])
+            self.assertEqual(results[1].text, extract_text(path, page_numbers=[2]))
+
+    def test_chunks_cover_every_page(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "long.pdf")
+            write_pdf(path, [f"page {number}" for number in range(1, 11)])
+            results = sorted(iter_pdf_pages(path, list(range(1, 11)), detect_tables=False, max_workers=2),
+                             key=lambda result: result.page_number)
+            self.assertEqual([result.page_number for result in results], list(range(1, 11)))
+            self.assertEqual("".join(result.text for result in results), extract_text(path))
+
+
+if __name__ == '__main__':
+    unittest.main()
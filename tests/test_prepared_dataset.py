@@ -0,0 +1,83 @@
+import os
+import base64
+import tempfile
+import unittest
+
+from src.dataset.huggingface import HLEDataset, extract_image
+
+
+IMAGE = "data:image/png;base64," + base64.b64encode(b"png bytes").decode("ascii")
+
+
+class _Source(list):
+    """Rows of a `datasets.Dataset`, counting how often it is loaded."""
+    loads = 0
+
+    @property
+    def num_rows(self):
+        return len(self)
+
+
+class _HLEDataset(HLEDataset):
+    def load_source(self):
+        _Source.loads += 1
+        return _Source([
+            {"task_id": "a", "question": "q1", "true_answer": "1", "image": IMAGE,
+             "image_preview": {"bytes": b"preview bytes", "path": None}},
+            {"task_id": "b", "question": "q2", "true_answer": "2", "image": "", "image_preview": None},
+        ])
+
+
+class TestPreparedDataset(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = self.tmp.name
+        with open(os.path.join(self.root, "test.parquet"), "wb") as f:
+            f.write(b"source rows")
+        _Source.loads = 0
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_prepares_once_and_reads_the_cache(self):
+        dataset = _HLEDataset(self.root, None, "test")
+        records = list(dataset.iter_records())
+        self.assertEqual([record["task_id"] for record in records], ["a", "b"])
+        self.assertEqual(records[0]["file_name"], os.path.join(self.root, "images", "test", "a.png"))
+        self.assertEqual(records[0]["image"], IMAGE)
+        self.assertTrue(os.path.exists(dataset.prepared_path))
+
+        cached = _HLEDataset(self.root, None, "test")
+        self.assertEqual(len(cached), 2)
+        self.assertEqual(cached[1]["task_id"], "b")
+        self.assertEqual(cached[0]["image_preview"]["bytes"], b"preview bytes")
+        self.assertIsNone(cached[1]["image_preview"])
+        self.assertEqual(_Source.loads, 1)
+
+    def test_source_change_invalidates_the_cache(self):
+        first = _HLEDataset(self.root, None, "test")
+        with open(os.path.join(self.root, "test.parquet"), "wb") as f:
+            f.write(b"new source rows")
+        self.assertNotEqual(_HLEDataset(self.root, None, "test").prepared_path, first.prepared_path)
+        self.assertNotEqual(_HLEDataset(self.root, None, "validation").prepared_path, first.prepared_path)
+
+    def test_rows_are_streamed_before_the_dataset_is_prepared(self):
+        dataset = _HLEDataset(self.root, None, "test")
+        first = next(dataset.iter_records())
+        self.assertEqual(first["task_id"], "a")
+        self.assertFalse(os.path.exists(dataset.prepared_path))
+
+    def test_extract_image_is_idempotent(self):
+        save_dir = os.path.join(self.root, "images")
+        path = extract_image(IMAGE, "a", save_dir)
+        with open(path, "rb") as f:
+            self.assertEqual(f.read(), b"png bytes")
+        mtime = os.stat(path).st_mtime_ns
+        self.assertEqual(extract_image(IMAGE, "a", save_dir), path)
+        self.assertEqual(os.stat(path).st_mtime_ns, mtime)
+        self.assertEqual(extract_image("", "b", save_dir), "")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,70 @@
+import os
+import json
+import tempfile
+import unittest
+
+from src.utils.results_store import ResultsStore, DONE_STATUSES
+
+
+def exact_scorer(prediction, truth):
+    return prediction == truth
+
+
+class TestResultsStore(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "dra.jsonl")
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_append_and_statuses(self):
+        store = ResultsStore(self.path, scorer=exact_scorer)
+        store.append({"task_id": "a", "prediction": "1", "true_answer": "1"})
+        store.append({"task_id": "b", "prediction": "2", "true_answer": "3"})
+        store.append({"task_id": "c", "prediction": None, "true_answer": "3"})
+        store.append({"task_id": "d", "prediction": "x", "true_answer": "?"})
+
+        self.assertIn("a", store)
+        self.assertEqual(store.entry("b")["status"], "wrong")
+        self.assertEqual(store.entry("c")["status"], "failed")
+        self.assertEqual(store.task_ids(statuses=DONE_STATUSES), {"a", "d"})
+        self.assertEqual(store.get("b")["prediction"], "2")
+
+    def test_reopen_uses_index_and_latest_record_wins(self):
+        store = ResultsStore(self.path, scorer=exact_scorer)
+        store.append({"task_id": "a", "prediction": "2", "true_answer": "1"})
+        store.append({"task_id": "a", "prediction": "1", "true_answer": "1"})
+
+        reopened = ResultsStore(self.path, scorer=exact_scorer)
+        self.assertEqual(len(reopened), 1)
+        self.assertEqual(reopened.entry("a")["status"], "correct")
+
+    def test_unindexed_tail_and_truncated_line(self):
+        with open(self.path, "w", encoding="utf-8") as f:
+            f.write(json.dumps({"task_id": "a", "prediction": "1", "true_answer": "1"}) + "\n")
+            f.write('{"task_id": "b", "predic\n')
+
+        store = ResultsStore(self.path)
+        self.assertEqual(store.task_ids(), {"a"})
+        store.append({"task_id": "c", "prediction": "1", "true_answer": "1"})
+
+        reopened = ResultsStore(self.path)
+        self.assertEqual(reopened.task_ids(), {"a", "c"})
+        self.assertEqual(reopened.get("c")["task_id"], "c")
+
+    def test_compact(self):
+        store = ResultsStore(self.path)
+        store.append({"task_id": "a", "prediction": None})
+        store.append({"task_id": "a", "prediction": "1"})
+        size = os.path.getsize(self.path)
+
+        store.compact()
+
+        self.assertLess(os.path.getsize(self.path), size)
+        self.assertEqual(ResultsStore(self.path).get("a")["prediction"], "1")
+
+
+if __name__ == "__main__":
+    unittest.main()
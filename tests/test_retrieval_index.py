@@ -0,0 +1,85 @@
+import os
+import tempfile
+import unittest
+
+from src.tools.retrieval.index import RetrievalIndex, chunk_markdown
+
+
+DOCUMENT = """# Report
+
+The committee met in Geneva in March 2019.
+
+## Budget
+
+The total budget was 4.2 million francs, of which 1.1 million went to research.
+
+## Members
+
+Alice Martin chaired the committee. Bob Stone was the treasurer.
+"""
+
+
+class TestRetrievalIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "task", "index.json")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_chunks_at_headings_and_size(self):
+        passages = chunk_markdown(DOCUMENT, chunk_chars=200)
+        self.assertEqual(len(passages), 3)
+        self.assertTrue(passages[1].startswith("## Budget"))
+        for passage in chunk_markdown("word " * 500, chunk_chars=100):
+            self.assertLessEqual(len(passage), 100)
+
+    def test_search_ranks_relevant_passage_first(self):
+        index = RetrievalIndex(chunk_chars=200)
+        index.add_document("report.pdf", DOCUMENT, title="Report")
+        index.add_document("https://example.com", "Geneva is a city in Switzerland on Lake Geneva.")
+        passage, _ = index.search("treasurer of the committee", top_k=2)[0]
+        self.assertIn("Bob Stone", passage.text)
+        results = index.search("Geneva", top_k=5, source="https://example.com")
+        self.assertEqual({passage.source for passage, _ in results}, {"https://example.com"})
+        self.assertEqual(index.search("unrelated zebra"), [])
+
+    def test_incremental_updates_and_persistence(self):
+        index = RetrievalIndex(path=self.path, chunk_chars=200)
+        self.assertEqual(index.add_document("report.pdf", DOCUMENT), 3)
+        self.assertEqual(index.add_document("report.pdf", DOCUMENT), 0)
+        index.add_document("report.pdf", "The budget was revised to 5 million francs.")
+        self.assertEqual(len(index), 1)
+        index.flush()
+
+        reloaded = RetrievalIndex(path=self.path, chunk_chars=200)
+        self.assertEqual(reloaded.stats()["passages"], 1)
+        self.assertIn("revised", reloaded.search("budget")[0][0].text)
+        self.assertEqual(len(RetrievalIndex(path=self.path, chunk_chars=500)), 0)
+
+    def test_saves_are_debounced(self):
+        index = RetrievalIndex(path=self.path, chunk_chars=200, save_delay=60)
+        index.add_document("report.pdf", DOCUMENT)
+        index.add_document("https://example.com", "Geneva is a city in Switzerland.")
+        self.assertFalse(os.path.exists(self.path))
+        index.flush()
+        self.assertEqual(RetrievalIndex(path=self.path, chunk_chars=200).stats()["documents"], 2)
+
+    def test_oldest_documents_are_dropped(self):
+        index = RetrievalIndex(chunk_chars=200, max_documents=2)
+        for name in ["a", "b", "c"]:
+            index.add_document(name, f"Document {name} about Geneva.")
+        self.assertEqual(list(index.documents), ["b", "c"])
+        self.assertEqual({passage.source for passage in index.passages}, {"b", "c"})
+        self.assertNotIn("a", {passage.source for passage, _ in index.search("document a")})
+
+    def test_embeddings_match_inflections(self):
+        index = RetrievalIndex(chunk_chars=200, embedding_weight=0.5)
+        index.add_document("report.pdf", DOCUMENT)
+        passage, _ = index.search("researchers funding", top_k=1)[0]
+        self.assertIn("research", passage.text)
+
+
+if __name__ == '__main__':
+    unittest.main()
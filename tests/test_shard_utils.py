@@ -0,0 +1,75 @@
+import os
+import json
+import tempfile
+import unittest
+
+from src.utils.shard_utils import (get_shard_index,
+                                   shard_tasks,
+                                   get_shard_path,
+                                   list_shard_paths,
+                                   merge_shards)
+from src.utils.results_store import ResultsStore
+
+
+class TestShardUtils(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.save_path = os.path.join(self.tmpdir.name, "dra.jsonl")
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def _write(self, path, records):
+        with open(path, "w", encoding="utf-8") as f:
+            for record in records:
+                f.write(json.dumps(record) + "\n")
+
+    def test_shards_partition_tasks(self):
+        tasks = [{"task_id": f"task-{i}"} for i in range(100)]
+        shards = [shard_tasks(tasks, index, 4) for index in range(4)]
+        self.assertEqual(sum(len(shard) for shard in shards), len(tasks))
+        ids = [task["task_id"] for shard in shards for task in shard]
+        self.assertEqual(len(set(ids)), len(tasks))
+
+    def test_shard_index_is_stable(self):
+        self.assertEqual(get_shard_index("abc", 8), get_shard_index("abc", 8))
+        self.assertEqual(get_shard_index("abc", 1), 0)
+
+    def test_shard_path(self):
+        self.assertEqual(get_shard_path("/a/dra.jsonl", 1, 4), "/a/dra.shard-001-of-004.jsonl")
+
+    def test_merge_deduplicates(self):
+        self._write(self.save_path, [{"task_id": "a", "prediction": "1"}])
+        self._write(get_shard_path(self.save_path, 0, 2), [{"task_id": "a", "prediction": None},
+                                                           {"task_id": "b", "prediction": "2"}])
+        self._write(get_shard_path(self.save_path, 1, 2), [{"task_id": "c", "prediction": "3"},
+                                                           {"task_id": "b", "prediction": "4"}])
+
+        stats = merge_shards(self.save_path)
+
+        records = {record["task_id"]: record for record in ResultsStore(self.save_path).records()}
+        self.assertEqual(stats["merged_records"], 3)
+        self.assertEqual(stats["new_records"], 4)
+        self.assertEqual(stats["duplicates"], 2)
+        self.assertEqual(records["a"]["prediction"], "1")
+        self.assertEqual(records["b"]["prediction"], "4")
+        self.assertEqual(list_shard_paths(self.save_path), [])
+
+    def test_merge_keeps_the_best_status(self):
+        self._write(self.save_path, [{"task_id": "a", "prediction": "1", "true_answer": "1"}])
+        self._write(get_shard_path(self.save_path, 0, 2), [{"task_id": "a", "prediction": "2", "true_answer": "1"},
+                                                           {"task_id": "b", "prediction": "2", "true_answer": "2"}])
+        self._write(get_shard_path(self.save_path, 1, 2), [{"task_id": "b", "prediction": "3", "true_answer": "2"},
+                                                           {"task_id": "c", "prediction": "3", "true_answer": "4"}])
+
+        merge_shards(self.save_path, scorer=lambda prediction, truth: prediction == truth)
+
+        records = {record["task_id"]: record for record in ResultsStore(self.save_path).records()}
+        self.assertEqual(records["a"]["prediction"], "1")
+        self.assertEqual(records["b"]["prediction"], "2")
+        self.assertEqual(records["c"]["prediction"], "3")
+
+
+if __name__ == "__main__":
+    unittest.main()
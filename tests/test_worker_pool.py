@@ -0,0 +1,58 @@
+import asyncio
+import unittest
+
+from src.tools.executor.worker_pool import SandboxWorkerPool
+
+
+class TestSandboxWorkerPool(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.pool = SandboxWorkerPool(size=2, authorized_imports=["math"], timeout=5)
+        await self.pool.start()
+
+    async def asyncTearDown(self):
+        await self.pool.close()
+
+    async def test_session_state_persists(self):
+        await self.pool.run("x = 21", session_id="task-1")
+        response = await self.pool.run("print(x)\nx * 2", session_id="task-1")
+        self.assertIsNone(response["error"])
+        self.assertEqual(response["output"], "42")
+        self.assertEqual(response["logs"], "21\n")
+
+        response = await self.pool.run("x", session_id="task-2")
+        self.assertIn("not defined", response["error"])
+
+    async def test_calls_without_session_get_fresh_state(self):
+        await self.pool.run("y = 1")
+        response = await self.pool.run("y")
+        self.assertIn("not defined", response["error"])
+
+    async def test_concurrent_calls(self):
+        responses = await asyncio.gather(*[self.pool.run(f"{i} * {i}") for i in range(6)])
+        self.assertEqual([response["output"] for response in responses], [str(i * i) for i in range(6)])
+
+    async def test_timeout_restarts_worker(self):
+        self.pool.timeout = 1
+        response = await self.pool.run("while True:\n    pass", session_id="task-1")
+        self.assertIn("timed out", response["error"])
+
+        self.pool.timeout = 5
+        response = await self.pool.run("import math\nmath.sqrt(16)", session_id="task-1")
+        self.assertEqual(response["output"], "4.0")
+
+    async def test_cancelled_call_does_not_leak_its_result(self):
+        pool = SandboxWorkerPool(size=1, timeout=5)
+        await pool.start()
+        try:
+            with self.assertRaises(asyncio.TimeoutError):
+                await asyncio.wait_for(pool.run("sum(range(30000000))"), timeout=0.2)
+            response = await pool.run("1 + 1")
+            self.assertIsNone(response["error"])
+            self.assertEqual(response["output"], "2")
+        finally:
+            await pool.close()
+
+
+if __name__ == "__main__":
+    unittest.main()